@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import html
-from typing import TYPE_CHECKING, Literal, Any, Optional, IO
+import hashlib
+from typing import TYPE_CHECKING, Literal, Any, Optional, IO, Callable
 
 import FunPayAPI.common.enums
 from FunPayAPI.common.utils import parse_currency, RegularExpressions
+from FunPayAPI.common.rate_limiter import RateLimiter
+from FunPayAPI.common.response_cache import ResponseCache
+from FunPayAPI.common.proxy_pool import ProxyPool
+from FunPayAPI.common.message_parser import parse_message_html
+from FunPayAPI.common.request_metrics import RequestMetrics, TracingHTTPAdapter, current_trace
+from FunPayAPI.parsers import ParserBackend, ParsedPage, BS4Backend, get_backend
 from .types import PaymentMethod, CalcResult
 
 if TYPE_CHECKING:
     from .updater.runner import Runner
+    from .updater.replay import RunnerRecorder
 
 from requests_toolbelt import MultipartEncoder
 from bs4 import BeautifulSoup
@@ -19,10 +26,13 @@ import random
 import string
 import json
 import time
+import threading
 import re
 
-from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib3.util.retry import Retry
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 from . import types
 from .common import exceptions, utils, enums
 
@@ -48,21 +58,69 @@ class Account:
 
     :param locale: текущий язык аккаунта, опционально.
     :type locale: :obj:`Literal["ru", "en", "uk"]` or :obj:`None`
+
+    :param pool_size: максимальное кол-во одновременных keep-alive соединений с FunPay.
+    :type pool_size: :obj:`int`, опционально
+
+    :param rate_limits: ограничения частоты запросов {префикс пути: (запросов в секунду, запросов подряд)},
+        см. :class:`FunPayAPI.common.rate_limiter.RateLimiter`.
+    :type rate_limits: :obj:`dict` or :obj:`None`, опционально
+
+    :param cache_ttls: время жизни закэшированных страниц {префикс пути: секунды},
+        см. :class:`FunPayAPI.common.response_cache.ResponseCache`.
+    :type cache_ttls: :obj:`dict` or :obj:`None`, опционально
+
+    :param max_response_size: максимальный размер ответа FunPay в байтах (0 - без ограничения).
+    :type max_response_size: :obj:`int`, опционально
+
+    :param proxy_pool: пул прокси. Если передан, прокси для запросов берутся из пула (параметр proxy игнорируется),
+        а при таймауте / ошибке соединения запрос повторяется через другой прокси.
+    :type proxy_pool: :class:`FunPayAPI.common.proxy_pool.ProxyPool` or :obj:`None`, опционально
+
+    :param parser_backend: бэкенд разбора страниц (см. :mod:`FunPayAPI.parsers`). Если бэкенд не смог разобрать
+        страницу, она разбирается запасным бэкендом `bs4`. По умолчанию `bs4`: `lxml` включается явно
+        (совпадение результатов проверяет benchmarks/page_parsers.py --check).
+    :type parser_backend: :obj:`Literal["lxml", "bs4"]`, опционально
+
+    :param keep_html: сохранять ли исходный HTML в объектах :mod:`FunPayAPI.types` (атрибут `html`).
+    :type keep_html: :obj:`bool`, опционально
     """
 
     def __init__(self, golden_key: str, user_agent: str | None = None,
                  requests_timeout: int | float = 10, proxy: Optional[dict] = None,
-                 locale: Literal["ru", "en", "uk"] | None = None):
+                 locale: Literal["ru", "en", "uk"] | None = None, pool_size: int = 10,
+                 rate_limits: dict[str, tuple[float, int]] | None = None,
+                 cache_ttls: dict[str, float] | None = None, max_response_size: int = 16 * 1024 * 1024,
+                 proxy_pool: ProxyPool | None = None, parser_backend: Literal["lxml", "bs4"] = "bs4",
+                 keep_html: bool = False):
         self.golden_key: str = golden_key
         """Токен (golden_key) аккаунта."""
         self.user_agent: str | None = user_agent
         """User-agent браузера, с которого был произведен вход в аккаунт."""
         self.requests_timeout: int | float = requests_timeout
         """Тайм-аут ожидания ответа на запросы."""
-        self.proxy = proxy
+        self.proxy_pool: ProxyPool | None = proxy_pool
+        """Пул прокси."""
+        self.proxy = ProxyPool.to_requests(proxy_pool.get()) if proxy_pool else proxy
         """Прокси"""
+        self.pool_size: int = pool_size
+        """Максимальное кол-во одновременных keep-alive соединений с FunPay."""
+        self.rate_limiter: RateLimiter = RateLimiter(rate_limits)
+        """Ограничитель частоты запросов."""
+        self.response_cache: ResponseCache = ResponseCache(cache_ttls)
+        """Кэш ответов на GET-запросы страниц."""
+        self.max_response_size: int = max_response_size
+        """Максимальный размер ответа FunPay в байтах (0 - без ограничения)."""
+        self.request_metrics: RequestMetrics = RequestMetrics()
+        """Метрики запросов к FunPay по эндпоинтам."""
+        self.parser_backend: ParserBackend = get_backend(parser_backend)
+        """Бэкенд разбора страниц FunPay."""
+        self.fallback_parser_backend: ParserBackend | None = None if parser_backend == BS4Backend.name else BS4Backend()
+        """Запасной бэкенд разбора страниц (используется, если основной не смог разобрать страницу)."""
+        self.keep_html: bool = keep_html
+        """Сохранять ли исходный HTML в объектах FunPayAPI.types (иначе их атрибут html - None)."""
         self.html: str | None = None
-        """HTML основной страницы FunPay."""
+        """HTML основной страницы FunPay (None, если keep_html выключен)."""
         self.app_data: dict | None = None
         """Appdata."""
         self.id: int | None = None
@@ -113,11 +171,21 @@ class Account:
         self.__saved_chats: dict[int, types.ChatShortcut] = {}
         self.runner: Runner | None = None
         """Объект Runner'а."""
+        self.runner_recorder: RunnerRecorder | None = None
+        """Объект, записывающий ответы `runner/` (None - не записывать)."""
+        self.prefetched_orders_ttl: float = 60
+        """Сколько секунд результат предзагрузки заказа Runner'ом используется вместо нового запроса."""
+        self.__order_futures: OrderedDict[str, tuple[float, Future]] = OrderedDict()
+        """Предзагружаемые / предзагруженные заказы {ID заказа: (время начала, Future с результатом)}."""
+        self.__order_futures_lock = threading.Lock()
         self._logout_link: str | None = None
         """Ссылка для выхода с аккаунта"""
         self.__categories: list[types.Category] = []
         self.__sorted_categories: dict[int, types.Category] = {}
 
+        self.__sales_subcategories: dict[str | None, dict[str, types.SubCategory]] = {}
+        """Подкатегории страницы продаж {"игра, подкатегория": подкатегория} по языкам (см. Account.get_sales())."""
+
         self.__subcategories: list[types.SubCategory] = []
         self.__sorted_subcategories: dict[types.SubCategoryTypes, dict[int, types.SubCategory]] = {
             types.SubCategoryTypes.COMMON: {},
@@ -129,24 +197,32 @@ class Account:
         self.__old_bot_character = "⁤"
         """Старое значение self.__bot_character, для корректной маркировки отправки ботом старых сообщений"""
         self.session = requests.Session()
+        # при нескольких прокси повторы при ошибках соединения выполняются через другой прокси (см. Account.__send)
+        failover = proxy_pool is not None and len(proxy_pool) > 1
         retry_strategy = Retry(
             total=6,
-            connect=6,
-            read=6,
+            connect=0 if failover else 6,
+            read=0 if failover else 6,
             redirect=6,
             status=6,
             backoff_factor=1,
             status_forcelist=[500, 502, 503, 504],
             allowed_methods={"GET", "POST"}
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # все запросы идут на funpay.com, поэтому достаточно одного пула; он хранит до pool_size keep-alive
+        # соединений, а при его заполнении открываются временные соединения (без блокировки потоков)
+        adapter = TracingHTTPAdapter(max_retries=retry_strategy, pool_connections=1, pool_maxsize=pool_size,
+                                     pool_block=False)
         self.session.mount("https://", adapter)
 
     def method(self, request_method: Literal["post", "get"], api_method: str, headers: dict, payload: Any,
                exclude_phpsessid: bool = False, raise_not_200: bool = False,
-               locale: Literal["ru", "en", "uk"] | None = None) -> requests.Response:
+               locale: Literal["ru", "en", "uk"] | None = None, use_cache: bool = False) -> requests.Response:
         """
         Отправляет запрос к FunPay. Добавляет в заголовки запроса user_agent и куки.
+        GET-запросы к кэшируемым эндпоинтам (см. :class:`FunPayAPI.common.response_cache.ResponseCache`)
+        сохраняются в кэш, но ранее полученный ответ возвращается только при use_cache=True
+        (без него выполняется условный запрос, если FunPay передал ETag / Last-Modified).
 
         :param request_method: метод запроса ("get" / "post").
         :type request_method: :obj:`str` `post` or `get`
@@ -166,6 +242,9 @@ class Account:
         :param raise_not_200: возбуждать ли исключение, если статус код ответа != 200?
         :type raise_not_200: :obj:`bool`
 
+        :param use_cache: можно ли вернуть закэшированный (в т.ч. устаревший, обновляемый в фоне) ответ?
+        :type use_cache: :obj:`bool`
+
         :return: объект ответа.
         :rtype: :class:`requests.Response`
         """
@@ -190,6 +269,7 @@ class Account:
             if redirect_url.startswith(f"https://funpay.com"):
                 self.__locale = "ru"
 
+        args = (request_method, api_method, dict(headers), payload, exclude_phpsessid, raise_not_200, locale)
         headers["cookie"] = f"golden_key={self.golden_key}; cookie_prefs=1"
         headers["cookie"] += f"; PHPSESSID={self.phpsessid}" if self.phpsessid and not exclude_phpsessid else ""
         if self.user_agent:
@@ -201,28 +281,66 @@ class Account:
         locale = locale or self.__set_locale
         if request_method == "get" and locale and locale != self.locale:
             link += f'{"&" if "?" in link else "?"}setlocale={locale}'
+
+        cache_key = None
+        if request_method == "get" and self.response_cache.get_ttl(link):
+            cache_key = (link, self.locale)
+            entry, state = self.response_cache.lookup(cache_key) if use_cache else (None, None)
+            if state == "fresh":
+                return entry.response
+            elif state == "stale":
+                self.response_cache.revalidate(cache_key, lambda: self.method(*args, use_cache=False))
+                return entry.response
+            if (entry := entry or self.response_cache.get(cache_key)) is not None:
+                if entry.etag:
+                    headers["if-none-match"] = entry.etag
+                if entry.last_modified:
+                    headers["if-modified-since"] = entry.last_modified
         kwargs = {"method": request_method,
                   "headers": headers,
                   "timeout": self.requests_timeout,
-                  "proxies": self.proxy or {}}
-        i = 0
+                  "stream": True}
+        trace = self.request_metrics.start(link)
         response = None
-        while i < 10 or response.status_code == 429:
-            i += 1
-            response = self.session.request(url=link, data=payload, allow_redirects=False, **kwargs)
-            if response.status_code == 429:
-                self.last_429_err_time = time.time()
-                time.sleep(min(2 ** i, 30))
-                continue
-            elif not (300 <= response.status_code < 400) or 'Location' not in response.headers:
-                break
-            link = response.headers['Location']
-            if link.endswith("account/login"):
-                raise exceptions.UnauthorizedError(response)
-            update_locale(link)
+        try:
+            i = 0
+            while i < 10 or response.status_code == 429:
+                i += 1
+                self.rate_limiter.acquire(link)
+                response = self.__send(link, payload, False, kwargs)
+                if response.status_code == 429:
+                    utils.read_response(response, self.max_response_size)
+                    self.last_429_err_time = time.time()
+                    # пауза общая для всех потоков, отправляющих запросы к этому эндпоинту
+                    self.rate_limiter.penalize(link, min(2 ** i, 30))
+                    continue
+                self.rate_limiter.success(link)
+                if not (300 <= response.status_code < 400) or 'Location' not in response.headers:
+                    break
+                utils.read_response(response, self.max_response_size)
+                link = response.headers['Location']
+                if link.endswith("account/login"):
+                    raise exceptions.UnauthorizedError(response)
+                update_locale(link)
 
-        else:
-            response = self.session.request(url=link, data=payload, allow_redirects=True, **kwargs)
+            else:
+                self.rate_limiter.acquire(link)
+                response = self.__send(link, payload, True, kwargs)
+            # тело читается по частям с ограничением размера
+            utils.read_response(response, self.max_response_size)
+        except BaseException as e:
+            # ответ получен с stream=True: непрочитанное соединение нужно вернуть / закрыть
+            if response is not None:
+                response.close()
+            self.request_metrics.finish(trace, e)
+            raise
+        self.request_metrics.finish(trace)
+
+        if cache_key is not None:
+            if response.status_code == 304 and (entry := self.response_cache.not_modified(cache_key)) is not None:
+                return entry.response
+            elif response.status_code == 200:
+                self.response_cache.store(cache_key, cache_key[0], response)
 
         if response.status_code == 403:
             raise exceptions.UnauthorizedError(response)
@@ -230,6 +348,52 @@ class Account:
             raise exceptions.RequestFailedError(response)
         return response
 
+    def __send(self, url: str, payload: Any, allow_redirects: bool, kwargs: dict) -> requests.Response:
+        """
+        Отправляет запрос через текущий прокси. Если прокси из пула не ответил (таймаут / ошибка соединения),
+        один раз повторяет запрос через следующий по оценке прокси. POST-запросы повторяются, только если
+        соединение не было установлено (FunPay мог уже обработать запрос, ответ на который не был получен).
+        """
+        if (trace := current_trace()) is not None:
+            trace.hop_started()
+        if not self.proxy_pool:
+            response = self.session.request(url=url, data=payload, allow_redirects=allow_redirects,
+                                            proxies=self.proxy or {}, **kwargs)
+            if trace is not None:
+                trace.hop_finished(response)
+            return response
+        proxy = self.proxy_pool.get()
+        for attempt in range(2):
+            start = time.time()
+            try:
+                response = self.session.request(url=url, data=payload, allow_redirects=allow_redirects,
+                                                proxies=ProxyPool.to_requests(proxy), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                new_proxy = self.proxy_pool.report_failure(proxy)
+                if attempt or new_proxy == proxy or (kwargs["method"] != "get" and not self.__not_sent(e)):
+                    raise
+                logger.warning(f"Прокси {proxy.split('@')[-1]} не отвечает, "
+                               f"запрос повторяется через {new_proxy.split('@')[-1]}.")  # locale
+                logger.debug("TRACEBACK", exc_info=True)
+                proxy = new_proxy
+                continue
+            self.proxy_pool.report_success(proxy, time.time() - start)
+            if trace is not None:
+                trace.hop_finished(response)
+            if (proxies := ProxyPool.to_requests(proxy)) != self.proxy:
+                self.proxy = proxies
+            return response
+
+    @staticmethod
+    def __not_sent(error: requests.exceptions.RequestException) -> bool:
+        """
+        :return: True, если запрос точно не был отправлен (не удалось соединиться с FunPay / прокси).
+        """
+        if isinstance(error, (requests.exceptions.ConnectTimeout, requests.exceptions.ProxyError)):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
     def get(self, update_phpsessid: bool = True) -> Account:
         """
         Получает / обновляет данные об аккаунте. Необходимо вызывать каждые 40-60 минут, дабы обновить
@@ -246,8 +410,8 @@ class Account:
         response = self.method("get", "https://funpay.com/", {}, {}, update_phpsessid, raise_not_200=True)
         if not self.is_initiated:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
+        # страница разбирается из байтов ответа, без промежуточной строки
+        parser = BeautifulSoup(response.content, "lxml", from_encoding="utf-8")
         username = parser.find("div", {"class": "user-link-name"})
         if not username:
             raise exceptions.UnauthorizedError(response)
@@ -272,11 +436,13 @@ class Account:
         cookies = response.cookies.get_dict()
         if update_phpsessid or not self.phpsessid:
             self.phpsessid = cookies.get("PHPSESSID", self.phpsessid)
+            # закэшированные страницы содержат CSRF токен старой сессии
+            self.response_cache.invalidate()
         if not self.is_initiated:
-            self.__setup_categories(html_response)
+            self.__setup_categories(response.content)
 
         self.last_update = int(time.time())
-        self.html = html_response
+        self.html = response.content.decode() if self.keep_html else None
         self.__initiated = True
         return self
 
@@ -295,10 +461,13 @@ class Account:
             "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
             "x-requested-with": "XMLHttpRequest"
         }
+        objects, request = payload.get("objects", []), payload.get("request")
         payload["csrf_token"] = self.csrf_token
-        payload["objects"] = json.dumps(payload.get("objects", []))
-        payload["request"] = False if not payload.get("request") else json.dumps(payload["request"])
+        payload["objects"] = json.dumps(objects)
+        payload["request"] = False if not request else json.dumps(request)
         response = self.method("post", "runner/", headers, payload, raise_not_200=True)
+        if self.runner_recorder is not None:
+            self.runner_recorder.record(objects, request, response)
 
         return response
 
@@ -385,7 +554,8 @@ class Account:
             return self.runner_request(payload_data)
 
     def get_subcategory_public_lots(self, subcategory_type: enums.SubCategoryTypes, subcategory_id: int,
-                                    locale: Literal["ru", "en", "uk"] | None = None) -> list[types.LotShortcut]:
+                                    locale: Literal["ru", "en", "uk"] | None = None,
+                                    use_cache: bool = False) -> list[types.LotShortcut]:
         """
         Получает список всех опубликованных лотов переданной подкатегории.
 
@@ -395,6 +565,10 @@ class Account:
         :param subcategory_id: ID подкатегории.
         :type subcategory_id: :obj:`int`
 
+        :param use_cache: можно ли вернуть закэшированную (в т.ч. устаревшую, обновляемую в фоне) страницу
+            (см. :class:`FunPayAPI.common.response_cache.ResponseCache`). Не используйте перед изменением данных.
+        :type use_cache: :obj:`bool`, опционально
+
         :return: список всех опубликованных лотов переданной подкатегории.
         :rtype: :obj:`list` of :class:`FunPayAPI.types.LotShortcut`
         """
@@ -404,79 +578,13 @@ class Account:
         meth = f"lots/{subcategory_id}/" if subcategory_type is enums.SubCategoryTypes.COMMON else f"chips/{subcategory_id}/"
         if not locale:
             locale = self.__lots_parse_locale
-        response = self.method("get", meth, {"accept": "*/*"}, {}, raise_not_200=True, locale=locale)
+        response = self.method("get", meth, {"accept": "*/*"}, {}, raise_not_200=True, locale=locale,
+                               use_cache=use_cache)
         if locale:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
-
-        username = parser.find("div", {"class": "user-link-name"})
-        if not username:
-            raise exceptions.UnauthorizedError(response)
-
-        self.__update_csrf_token(parser)
-        offers = parser.find_all("a", {"class": "tc-item"})
-        if not offers:
-            return []
-
-        subcategory_obj = self.get_subcategory(subcategory_type, subcategory_id)
-        result = []
-        sellers = {}
-        currency = None
-        for offer in offers:
-            offer_id = offer["href"].split("id=")[1]
-            promo = 'offer-promo' in offer.get('class', [])
-            description = offer.find("div", {"class": "tc-desc-text"})
-            description = description.text if description else None
-            server = offer.find("div", class_="tc-server")
-            server = server.text if server else None
-            side = offer.find("div", class_="tc-side")
-            side = side.text if side else None
-            tc_price = offer.find("div", {"class": "tc-price"})
-            if subcategory_type is types.SubCategoryTypes.COMMON:
-                price = float(tc_price["data-s"])
-            else:
-                price = float(tc_price.find("div").text.rsplit(maxsplit=1)[0].replace(" ", ""))
-            if currency is None:
-                currency = parse_currency(tc_price.find("span", class_="unit").text)
-                if self.currency != currency:
-                    self.currency = currency
-            seller_soup = offer.find("div", class_="tc-user")
-            attributes = {k.replace("data-", "", 1): int(v) if v.isdigit() else v for k, v in offer.attrs.items()
-                          if k.startswith("data-")}
-
-            auto = attributes.get("auto") == 1
-            tc_amount = offer.find("div", class_="tc-amount")
-            amount = tc_amount.text.replace(" ", "") if tc_amount else None
-            amount = int(amount) if amount and amount.isdigit() else None
-            seller_key = str(seller_soup)
-            if seller_key not in sellers:
-                online = False
-                if attributes.get("online") == 1:
-                    online = True
-                seller_body = offer.find("div", class_="media-body")
-                username = seller_body.find("div", class_="media-user-name").text.strip()
-                rating_stars = seller_body.find("div", class_="rating-stars")
-                if rating_stars is not None:
-                    rating_stars = len(rating_stars.find_all("i", class_="fas"))
-                k_reviews = seller_body.find("div", class_="media-user-reviews")
-                if k_reviews:
-                    k_reviews = "".join([i for i in k_reviews.text if i.isdigit()])
-                k_reviews = int(k_reviews) if k_reviews else 0
-                user_id = int(seller_body.find("span", class_="pseudo-a")["data-href"].split("/")[-2])
-                seller = types.SellerShortcut(user_id, username, online, rating_stars, k_reviews, seller_key)
-                sellers[seller_key] = seller
-            else:
-                seller = sellers[seller_key]
-            for i in ("online", "auto"):
-                if i in attributes:
-                    del attributes[i]
-
-            lot_obj = types.LotShortcut(offer_id, server, side, description, amount, price, currency, subcategory_obj,
-                                        seller,
-                                        auto, promo, attributes, str(offer))
-            result.append(lot_obj)
-        return result
+        page = self.__parse("public_lots", response.content, subcategory_type, subcategory_id)
+        self.__apply_page(page, response)
+        return page.result
 
     def get_my_subcategory_lots(self, subcategory_id: int,
                                 locale: Literal["ru", "en", "uk"] | None = None) -> list[types.MyLotShortcut]:
@@ -495,52 +603,21 @@ class Account:
         response = self.method("get", meth, {"accept": "*/*"}, {}, raise_not_200=True, locale=locale)
         if locale:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
+        page = self.__parse("my_lots", response.content, subcategory_id)
+        self.__apply_page(page, response)
+        return page.result
 
-        username = parser.find("div", {"class": "user-link-name"})
-        if not username:
-            raise exceptions.UnauthorizedError(response)
-
-        self.__update_csrf_token(parser)
-        offers = parser.find_all("a", class_="tc-item")
-        if not offers:
-            return []
-
-        subcategory_obj = self.get_subcategory(enums.SubCategoryTypes.COMMON, subcategory_id)
-        result = []
-        currency = None
-        for offer in offers:
-            offer_id = offer["data-offer"]
-            description = offer.find("div", {"class": "tc-desc-text"})
-            description = description.text if description else None
-            server = offer.find("div", class_="tc-server")
-            server = server.text if server else None
-            side = offer.find("div", class_="tc-side")
-            side = side.text if side else None
-            tc_price = offer.find("div", class_="tc-price")
-            price = float(tc_price["data-s"])
-            if currency is None:
-                currency = parse_currency(tc_price.find("span", class_="unit").text)
-                if self.currency != currency:
-                    self.currency = currency
-            auto = bool(tc_price.find("i", class_="auto-dlv-icon"))
-            tc_amount = offer.find("div", class_="tc-amount")
-            amount = tc_amount.text.replace(" ", "") if tc_amount else None
-            amount = int(amount) if amount and amount.isdigit() else None
-            active = "warning" not in offer.get("class", [])
-            lot_obj = types.MyLotShortcut(offer_id, server, side, description, amount, price, currency, subcategory_obj,
-                                          auto, active, str(offer))
-            result.append(lot_obj)
-        return result
-
-    def get_lot_page(self, lot_id: int, locale: Literal["ru", "en", "uk"] | None = None):
+    def get_lot_page(self, lot_id: int, locale: Literal["ru", "en", "uk"] | None = None, use_cache: bool = False):
         """
         Возвращает страницу лота.
 
         :param lot_id: ID лота.
         :type lot_id: :obj:`int` or :obj:`str`
 
+        :param use_cache: можно ли вернуть закэшированную (в т.ч. устаревшую, обновляемую в фоне) страницу
+            (см. :class:`FunPayAPI.common.response_cache.ResponseCache`). Не используйте перед изменением данных.
+        :type use_cache: :obj:`bool`, опционально
+
         :return: объект страницы лота или :obj:`None`, если лот не найден.
         :rtype: :class:`FunPayAPI.types.lotPage` or :obj:`None`
         """
@@ -549,11 +626,11 @@ class Account:
         headers = {
             "accept": "*/*"
         }
-        response = self.method("get", f"lots/offer?id={lot_id}", headers, {}, raise_not_200=True, locale=locale)
+        response = self.method("get", f"lots/offer?id={lot_id}", headers, {}, raise_not_200=True, locale=locale,
+                               use_cache=use_cache)
         if locale:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
+        parser = BeautifulSoup(response.content, "lxml", from_encoding="utf-8")
         username = parser.find("div", {"class": "user-link-name"})
         if not username:
             raise exceptions.UnauthorizedError(response)
@@ -591,21 +668,25 @@ class Account:
         return types.LotPage(lot_id, self.get_subcategory(enums.SubCategoryTypes.COMMON, subcategory_id),
                              short_description, detailed_description, image_urls, seller_id, seller_username)
 
-    def get_balance(self, lot_id: int) -> types.Balance:
+    def get_balance(self, lot_id: int, use_cache: bool = False) -> types.Balance:
         """
         Получает информацию о балансе пользователя.
 
         :param lot_id: ID лота, на котором проверять баланс.
         :type lot_id: :obj:`int`, опционально
 
+        :param use_cache: можно ли вернуть закэшированную (в т.ч. устаревшую, обновляемую в фоне) страницу
+            (см. :class:`FunPayAPI.common.response_cache.ResponseCache`). Не используйте перед изменением данных.
+        :type use_cache: :obj:`bool`, опционально
+
         :return: информацию о балансе пользователя.
         :rtype: :class:`FunPayAPI.types.Balance`
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
-        response = self.method("get", f"lots/offer?id={lot_id}", {"accept": "*/*"}, {}, raise_not_200=True)
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
+        response = self.method("get", f"lots/offer?id={lot_id}", {"accept": "*/*"}, {}, raise_not_200=True,
+                               use_cache=use_cache)
+        parser = BeautifulSoup(response.content, "lxml", from_encoding="utf-8")
 
         username = parser.find("div", {"class": "user-link-name"})
         if not username:
@@ -884,7 +965,7 @@ class Account:
             </div>
             """
             message_obj = types.Message(0, message_text, chat_id, chat_name, interlocutor_id, self.username, self.id,
-                                        fake_html, None,
+                                        fake_html if self.keep_html else None, None,
                                         None)
         else:
             tag = obj["tag"]
@@ -910,7 +991,7 @@ class Account:
                 raise e
             message_obj = types.Message(int(mes["id"]), message_text, chat_id, chat_name, interlocutor_id,
                                         self.username, self.id,
-                                        mes["html"], image_link, image_name, tag=tag)
+                                        mes["html"] if self.keep_html else None, image_link, image_name, tag=tag)
         if self.runner and is_private_chat and isinstance(chat_id, int):
             if add_to_ignore_list and message_obj.id:
                 self.runner.mark_as_by_bot(chat_id, message_obj.id)
@@ -1192,6 +1273,7 @@ class Account:
         }
 
         response = self.method("post", "lots/raise", headers, payload, raise_not_200=True)
+        self.response_cache.invalidate(*[f"lots/{i.id}/" for i in subcats], f"users/{self.id}/")
         json_response = response.json()
         logger.debug(f"Ответ FunPay (поднятие категорий): {json_response}.")  # locale
         if not json_response.get("error") and not json_response.get("url"):
@@ -1205,13 +1287,18 @@ class Account:
         else:
             raise exceptions.RaiseError(response, category, json_response.get("msg"), None)
 
-    def get_user(self, user_id: int, locale: Literal["ru", "en", "uk"] | None = None) -> types.UserProfile:
+    def get_user(self, user_id: int, locale: Literal["ru", "en", "uk"] | None = None,
+                 use_cache: bool = False) -> types.UserProfile:
         """
         Парсит страницу пользователя.
 
         :param user_id: ID пользователя.
         :type user_id: :obj:`int`
 
+        :param use_cache: можно ли вернуть закэшированную (в т.ч. устаревшую, обновляемую в фоне) страницу
+            (см. :class:`FunPayAPI.common.response_cache.ResponseCache`). Не используйте перед изменением данных.
+        :type use_cache: :obj:`bool`, опционально
+
         :return: объект профиля пользователя.
         :rtype: :class:`FunPayAPI.types.UserProfile`
         """
@@ -1219,70 +1306,14 @@ class Account:
             raise exceptions.AccountNotInitiatedError()
         if not locale:
             locale = self.__profile_parse_locale
-        response = self.method("get", f"users/{user_id}/", {"accept": "*/*"}, {}, raise_not_200=True, locale=locale)
+        response = self.method("get", f"users/{user_id}/", {"accept": "*/*"}, {}, raise_not_200=True, locale=locale,
+                               use_cache=use_cache)
         if locale:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
-
-        username = parser.find("div", {"class": "user-link-name"})
-        if not username:
-            raise exceptions.UnauthorizedError(response)
-
-        self.__update_csrf_token(parser)
-
-        username = parser.find("span", {"class": "mr4"}).text
-        user_status = parser.find("span", {"class": "media-user-status"})
-        user_status = user_status.text if user_status else ""
-        avatar_link = parser.find("div", {"class": "avatar-photo"}).get("style").split("(")[1].split(")")[0]
-        avatar_link = avatar_link if avatar_link.startswith("https") else f"https://funpay.com{avatar_link}"
-        banned = bool(parser.find("span", {"class": "label label-danger"}))
-        user_obj = types.UserProfile(user_id, username, avatar_link, "Онлайн" in user_status or "Online" in user_status,
-                                     banned, html_response)
-
-        subcategories_divs = parser.find_all("div", {"class": "offer-list-title-container"})
-
-        if not subcategories_divs:
-            return user_obj
-
-        for i in subcategories_divs:
-            subcategory_link = i.find("h3").find("a").get("href")
-            subcategory_id = int(subcategory_link.split("/")[-2])
-            subcategory_type = types.SubCategoryTypes.CURRENCY if "chips" in subcategory_link else \
-                types.SubCategoryTypes.COMMON
-            subcategory_obj = self.get_subcategory(subcategory_type, subcategory_id)
-            if not subcategory_obj:
-                continue
-
-            offers = i.parent.find_all("a", {"class": "tc-item"})
-            currency = None
-            for j in offers:
-                offer_id = j["href"].split("id=")[1]
-                description = j.find("div", {"class": "tc-desc-text"})
-                description = description.text if description else None
-                server = j.find("div", class_="tc-server")
-                server = server.text if server else None
-                side = j.find("div", class_="tc-side")
-                side = side.text if side else None
-                auto = j.find("i", class_="auto-dlv-icon") is not None
-                tc_price = j.find("div", {"class": "tc-price"})
-                tc_amount = j.find("div", class_="tc-amount")
-                amount = tc_amount.text.replace(" ", "") if tc_amount else None
-                amount = int(amount) if amount and amount.isdigit() else None
-                if subcategory_obj.type is types.SubCategoryTypes.COMMON:
-                    price = float(tc_price["data-s"])
-                else:
-                    price = float(tc_price.find("div").text.rsplit(maxsplit=1)[0].replace(" ", ""))
-                if currency is None:
-                    currency = parse_currency(tc_price.find("span", class_="unit").text)
-                    if self.currency != currency:
-                        self.currency = currency
-                lot_obj = types.LotShortcut(offer_id, server, side, description, amount, price, currency,
-                                            subcategory_obj,
-                                            None, auto,
-                                            None, None, str(j))
-                user_obj.add_lot(lot_obj)
-        return user_obj
+        page = self.__parse("user_profile", response.content, user_id,
+                            response.content.decode() if self.keep_html else None)
+        self.__apply_page(page, response)
+        return page.result
 
     def get_chat(self, chat_id: int, with_history: bool = True,
                  locale: Literal["ru", "en", "uk"] | None = None) -> types.Chat:
@@ -1323,7 +1354,7 @@ class Account:
             history = self.get_chats_histories({chat_id: name}).get(chat_id, [])
         else:
             history = []
-        return types.Chat(chat_id, name, link, text, html_response, history)
+        return types.Chat(chat_id, name, link, text, html_response if self.keep_html else None, history)
 
     def get_order_shortcut(self, order_id: str) -> types.OrderShortcut:
         """
@@ -1340,18 +1371,63 @@ class Account:
             return self.get_sales(id=order_id)[1][0]
         return self.runner.saved_orders.get(order_id, self.get_sales(id=order_id)[1][0])
 
-    def get_order(self, order_id: str, locale: Literal["ru", "en", "uk"] | None = None) -> types.Order:
+    def share_order_future(self, order_id: str, future: Future):
+        """
+        Регистрирует предзагрузку заказа (см. :meth:`FunPayAPI.updater.runner.Runner.prefetch_order`):
+        в течение :py:obj:`.Account.prefetched_orders_ttl` секунд :meth:`FunPayAPI.account.Account.get_order`
+        возвращает ее результат (дожидаясь его при необходимости) вместо нового запроса.
+
+        :param order_id: ID заказа.
+        :type order_id: :obj:`str`
+
+        :param future: Future с полным объектом заказа (или None, если получить заказ не удалось).
+        :type future: :class:`concurrent.futures.Future`
+        """
+        with self.__order_futures_lock:
+            self.__order_futures[order_id] = (time.time(), future)
+            self.__order_futures.move_to_end(order_id)
+            while len(self.__order_futures) > 100:
+                self.__order_futures.popitem(last=False)
+
+    def forget_order(self, order_id: str):
+        """
+        Удаляет результат предзагрузки заказа (например, если изменился статус заказа).
+
+        :param order_id: ID заказа.
+        :type order_id: :obj:`str`
+        """
+        with self.__order_futures_lock:
+            self.__order_futures.pop(order_id, None)
+
+    def __get_prefetched_order(self, order_id: str) -> types.Order | None:
+        with self.__order_futures_lock:
+            if (entry := self.__order_futures.get(order_id)) is None:
+                return None
+            start_time, future = entry
+            if time.time() - start_time > self.prefetched_orders_ttl:
+                self.__order_futures.pop(order_id, None)
+                return None
+        return future.result()
+
+    def get_order(self, order_id: str, locale: Literal["ru", "en", "uk"] | None = None,
+                  use_prefetched: bool = True) -> types.Order:
         """
         Получает полную информацию о заказе.
 
         :param order_id: ID заказа.
         :type order_id: :obj:`str`
 
+        :param use_prefetched: можно ли вернуть заказ, недавно предзагруженный Runner'ом
+            (см. :meth:`FunPayAPI.account.Account.share_order_future`).
+        :type use_prefetched: :obj:`bool`, опционально
+
         :return: объекст заказа.
         :rtype: :class:`FunPayAPI.types.Order`
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
+        if use_prefetched and not locale and (order := self.__get_prefetched_order(order_id)) is not None:
+            return order
         headers = {
             "accept": "*/*"
         }
@@ -1360,120 +1436,10 @@ class Account:
         response = self.method("get", f"orders/{order_id}/", headers, {}, raise_not_200=True, locale=locale)
         if locale:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
-        username = parser.find("div", {"class": "user-link-name"})
-        if not username:
-            raise exceptions.UnauthorizedError(response)
-
-        self.__update_csrf_token(parser)
-
-        if (span := parser.find("span", {"class": "text-warning"})) and span.text in (
-                "Возврат", "Повернення", "Refund"):
-            status = types.OrderStatuses.REFUNDED
-        elif (span := parser.find("span", {"class": "text-success"})) and span.text in ("Закрыт", "Закрито", "Closed"):
-            status = types.OrderStatuses.CLOSED
-        else:
-            status = types.OrderStatuses.PAID
-
-        short_description = None
-        full_description = None
-        sum_ = None
-        currency = FunPayAPI.common.enums.Currency.UNKNOWN
-        subcategory = None
-        order_secrets = []
-        stop_params = False
-        lot_params = []
-        buyer_params = {}
-
-        amount = 1
-        for div in parser.find_all("div", {"class": "param-item"}):
-            if not (h := div.find("h5")):
-                continue
-            if not stop_params and div.find_previous("hr"):
-                stop_params = True
-
-            if h.text in ("Краткое описание", "Короткий опис", "Short description"):
-                stop_params = True
-                short_description = div.find("div").text
-            elif h.text in ("Подробное описание", "Докладний опис", "Detailed description"):
-                stop_params = True
-                full_description = div.find("div").text
-            elif h.text in ("Сумма", "Сума", "Total"):
-                sum_ = float(div.find("span").text.replace(" ", ""))
-                currency = parse_currency(div.find("strong").text)
-            elif h.text in ("Категория", "Категорія", "Category",
-                            "Валюта", "Currency"):
-                subcategory_link = div.find("a").get("href")
-                subcategory_split = subcategory_link.split("/")
-                subcategory_id = int(subcategory_split[-2])
-                subcategory_type = types.SubCategoryTypes.COMMON if "lots" in subcategory_link else \
-                    types.SubCategoryTypes.CURRENCY
-                subcategory = self.get_subcategory(subcategory_type, subcategory_id)
-            elif h.text in ("Оплаченный товар", "Оплаченные товары",
-                            "Оплачений товар", "Оплачені товари",
-                            "Paid product", "Paid products"):
-                secret_placeholders = div.find_all("span", class_="secret-placeholder")
-                order_secrets = [i.text for i in secret_placeholders]
-            elif h.text in ("Количество", "Amount", "Кількість"):
-                div2 = div.find("div", class_="text-bold")
-                if div2:
-                    match = RegularExpressions().PRODUCTS_AMOUNT_ORDER.fullmatch(div2.text)
-                    if match:
-                        amount = int(match.group(1).replace(" ", ""))
-            elif h.text in ("Відкрито", "Открыт", "Open"):
-                continue  # todo
-            elif h.text in ("Закрито", "Закрыт", "Closed"):
-                continue  # todo
-            elif not stop_params and h.text not in ("Игра", "Гра", "Game"):
-                div2 = div.find("div")
-                if div2:
-                    res = div2.text.strip()
-                    lot_params.append((h.text, res))
-            elif stop_params:
-                div2 = div.find("div", class_="text-bold")
-                if div2:
-                    buyer_params[h.text] = div2.text
-        if not stop_params:
-            lot_params = []
-
-        chat = parser.find("div", {"class": "chat-header"})
-        chat_link = chat.find("div", {"class": "media-user-name"}).find("a")
-        interlocutor_name = chat_link.text
-        interlocutor_id = int(chat_link.get("href").split("/")[-2])
-        nav_bar = parser.find("ul", {"class": "nav navbar-nav navbar-right logged"})
-        active_item = nav_bar.find("li", {"class": "active"})
-        if any(i in active_item.find("a").text.strip() for i in ("Продажи", "Продажі", "Sales")):
-            buyer_id, buyer_username = interlocutor_id, interlocutor_name
-            seller_id, seller_username = self.id, self.username
-        else:
-            buyer_id, buyer_username = self.id, self.username
-            seller_id, seller_username = interlocutor_id, interlocutor_name
-        id1, id2 = sorted([buyer_id, seller_id])
-        chat_id = f"users-{id1}-{id2}"
-        review_obj = parser.find("div", {"class": "order-review"})
-        if not (stars_obj := review_obj.find("div", {"class": "rating"})):
-            stars, text = None, None
-        else:
-            stars = int(stars_obj.find("div").get("class")[0].split("rating")[1])
-            text = review_obj.find("div", {"class": "review-item-text"}).text.strip()
-        hidden = review_obj.find("span", class_="text-warning") is not None
-        if not (reply_obj := review_obj.find("div", {"class": "review-item-answer review-compiled-reply"})):
-            reply = None
-        else:
-            reply = reply_obj.find("div").text.strip()
-
-        if all([not text, not reply]):
-            review = None
-        else:
-            review = types.Review(stars, text, reply, False, str(review_obj), hidden, order_id, buyer_username,
-                                  buyer_id, bool(text and text.endswith(self.bot_character)),
-                                  bool(reply and reply.endswith(self.bot_character)))
-        order = types.Order(order_id, status, subcategory, lot_params, buyer_params,
-                            short_description, full_description, amount,
-                            sum_, currency, buyer_id, buyer_username, seller_id, seller_username, chat_id,
-                            html_response, review, order_secrets)
-        return order
+        page = self.__parse("order", response.content, order_id,
+                            response.content.decode() if self.keep_html else None)
+        self.__apply_page(page, response)
+        return page.result
 
     def get_sales(self, start_from: str | None = None, include_paid: bool = True, include_closed: bool = True,
                   include_refunded: bool = True, exclude_ids: list[str] | None = None,
@@ -1481,7 +1447,8 @@ class Account:
                   state: Optional[Literal["closed", "paid", "refunded"]] = None, game: Optional[int] = None,
                   section: Optional[str] = None, server: Optional[int] = None,
                   side: Optional[int] = None, locale: Literal["ru", "en", "uk"] | None = None,
-                  subcategories: dict[str, tuple[types.SubCategoryTypes, int]] | None = None, **more_filters) -> \
+                  subcategories: dict[str, tuple[types.SubCategoryTypes, int]] | None = None,
+                  stop_at: Callable[[str, types.OrderStatuses], bool] | None = None, **more_filters) -> \
             tuple[str | None, list[types.OrderShortcut], Literal["ru", "en", "uk"],
             dict[str, types.SubCategory]]:
         """
@@ -1526,6 +1493,13 @@ class Account:
         :param side: ID стороны (платформы).
         :type side: :obj:`int`, опционально.
 
+        :param stop_at: функция, принимающая ID и статус заказа. Если она вернет `True`, разбор списка заказов
+            прекращается (сам заказ и все заказы ниже него в список не попадают, а остаток страницы может
+            не разбираться; ID след. заказа в этом случае может быть None). Если основной бэкенд не смог разобрать
+            страницу после вызова stop_at, разбор запасным бэкендом не повторяется и исключение пробрасывается.
+        :type stop_at: :obj:`Callable` [[:obj:`str`, :class:`FunPayAPI.common.enums.OrderStatuses`], :obj:`bool`],
+            опционально
+
         :param more_filters: доп. фильтры.
 
         :return: (ID след. заказа (для start_from), список заказов)
@@ -1554,82 +1528,29 @@ class Account:
         response = self.method("post" if start_from else "get", link, {}, filters, raise_not_200=True, locale=locale)
         if not start_from:
             self.locale = self.__default_locale
-        html_response = response.content.decode()
-
-        parser = BeautifulSoup(html_response, "lxml")
-
-        if not start_from:
-            username = parser.find("div", {"class": "user-link-name"})
-            if not username:
-                raise exceptions.UnauthorizedError(response)
-
-        next_order_id = parser.find("input", {"type": "hidden", "name": "continue"})
-        next_order_id = next_order_id.get("value") if next_order_id else None
-
-        order_divs = parser.find_all("a", {"class": "tc-item"})
-        if not start_from:
-            subcategories = dict()
-            app_data = json.loads(parser.find("body").get("data-app-data"))
-            locale = app_data.get("locale")
-            self.csrf_token = app_data.get("csrf-token") or self.csrf_token
-            games_options = parser.find("select", attrs={"name": "game"})
-            if games_options:
-                games_options = games_options.find_all(lambda x: x.name == "option" and x.get("value"))
-                for game_option in games_options:
-                    game_name = game_option.text
-                    sections_list = json.loads(game_option.get("data-data"))
-                    for key, section_name in sections_list:
-                        section_type, section_id = key.split("-")
-                        section_type = types.SubCategoryTypes.COMMON if section_type == "lot" else types.SubCategoryTypes.CURRENCY
-                        section_id = int(section_id)
-                        subcategories[f"{game_name}, {section_name}"] = self.get_subcategory(section_type, section_id)
-            else:
-                subcategories = None
-        if not order_divs:
-            return None, [], locale, subcategories
-
-        sales = []
-        for div in order_divs:
-            classname = div.get("class")
-            if "warning" in classname:
-                if not include_refunded:
-                    continue
-                order_status = types.OrderStatuses.REFUNDED
-            elif "info" in classname:
-                if not include_paid:
-                    continue
-                order_status = types.OrderStatuses.PAID
-            else:
-                if not include_closed:
-                    continue
-                order_status = types.OrderStatuses.CLOSED
-
-            order_id = div.find("div", {"class": "tc-order"}).text[1:]
-            if order_id in exclude_ids:
-                continue
-
-            description = div.find("div", {"class": "order-desc"}).find("div").text
-            tc_price = div.find("div", {"class": "tc-price"}).text
-            price, currency = tc_price.rsplit(maxsplit=1)
-            price = float(price.replace(" ", ""))
-            currency = parse_currency(currency)
-
-            buyer_div = div.find("div", {"class": "media-user-name"}).find("span")
-            buyer_username = buyer_div.text
-            buyer_id = int(buyer_div.get("data-href")[:-1].split("/users/")[1])
-            subcategory_name = div.find("div", {"class": "text-muted"}).text
-            subcategory = None
-            if subcategories:
-                subcategory = subcategories.get(subcategory_name)
-
-            order_date_text = div.find("div", {"class": "tc-date-time"}).text
-            order_date = utils.parse_funpay_datetime(order_date_text)
-            id1, id2 = sorted([buyer_id, self.id])
-            chat_id = f"users-{id1}-{id2}"
-            order_obj = types.OrderShortcut(order_id, description, price, currency, buyer_username, buyer_id, chat_id,
-                                            order_status, order_date, subcategory_name, subcategory, str(div))
-            sales.append(order_obj)
-
+        # список игр (data-data каждой игры) не разбирается заново, если его подкатегории уже известны
+        subcategories = subcategories or self.__sales_subcategories.get(self.locale)
+
+        stop_at_called = False
+
+        def tracked_stop_at(order_id: str, status: types.OrderStatuses) -> bool:
+            nonlocal stop_at_called
+            stop_at_called = True
+            return stop_at(order_id, status)
+
+        # stop_at может иметь побочные эффекты, поэтому после его вызова разбор запасным бэкендом не повторяется
+        # (исключение пробрасывается вызывающему коду)
+        page = self.__parse("sales", response.content, not start_from, subcategories,
+                            tracked_stop_at if stop_at is not None else None, exclude_ids,
+                            include_paid, include_closed, include_refunded, can_fallback=lambda: not stop_at_called)
+        if not page.authorized:
+            raise exceptions.UnauthorizedError(response)
+        if page.app_data is not None:
+            locale = page.app_data.get("locale")
+            self.csrf_token = page.app_data.get("csrf-token") or self.csrf_token
+        next_order_id, sales, subcategories = page.result
+        if subcategories:
+            self.__sales_subcategories[self.locale] = subcategories
         return next_order_id, sales, locale, subcategories
 
     def get_sells(self, start_from: str | None = None, include_paid: bool = True, include_closed: bool = True,
@@ -1673,33 +1594,7 @@ class Account:
         if not msgs:
             return []
 
-        parser = BeautifulSoup(msgs, "lxml")
-        chats = parser.find_all("a", {"class": "contact-item"})
-        chats_objs = []
-
-        for msg in chats:
-            chat_id = int(msg["data-id"])
-            last_msg_text = msg.find("div", {"class": "contact-item-message"}).text
-            unread = True if "unread" in msg.get("class") else False
-            chat_with = msg.find("div", {"class": "media-user-name"}).text
-            node_msg_id = int(msg.get('data-node-msg'))
-            user_msg_id = int(msg.get('data-user-msg'))
-            by_bot = False
-            by_vertex = False
-            is_image = last_msg_text in ("Изображение", "Зображення", "Image")
-            if last_msg_text.startswith(self.bot_character):
-                last_msg_text = last_msg_text[1:]
-                by_bot = True
-            elif last_msg_text.startswith(self.old_bot_character):
-                last_msg_text = last_msg_text[1:]
-                by_vertex = True
-            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread, str(msg))
-            if not is_image:
-                chat_obj.last_by_bot = by_bot
-                chat_obj.last_by_vertex = by_vertex
-
-            chats_objs.append(chat_obj)
-        return chats_objs
+        return self.__parse("chats", msgs).result
 
     def get_chats(self, update: bool = False) -> dict[int, types.ChatShortcut]:
         """
@@ -1806,53 +1701,33 @@ class Account:
         return CalcResult(subcategory_type, subcategory_id, methods, price, min_price, min_price_currency,
                           self.currency)
 
-    def get_lot_fields(self, lot_id: int) -> types.LotFields:
+    def get_lot_fields(self, lot_id: int, use_cache: bool = False) -> types.LotFields:
         """
         Получает все поля лота.
 
         :param lot_id: ID лота.
         :type lot_id: :obj:`int`
 
+        :param use_cache: можно ли вернуть закэшированную (в т.ч. устаревшую, обновляемую в фоне) страницу
+            (см. :class:`FunPayAPI.common.response_cache.ResponseCache`). Не используйте перед изменением данных.
+        :type use_cache: :obj:`bool`, опционально
+
         :return: объект с полями лота.
         :rtype: :class:`FunPayAPI.types.LotFields`
         """
         if not self.is_initiated:
             raise exceptions.AccountNotInitiatedError()
         headers = {}
-        response = self.method("get", f"lots/offerEdit?offer={lot_id}", headers, {}, raise_not_200=True)
+        response = self.method("get", f"lots/offerEdit?offer={lot_id}", headers, {}, raise_not_200=True,
+                               use_cache=use_cache)
 
-        html_response = response.content.decode()
-        bs = BeautifulSoup(html_response, "lxml")
-        error_message = bs.find("p", class_="lead")
-        if error_message:
-            raise exceptions.LotParsingError(response, error_message.text, lot_id)
-        bs = bs.find("form", class_="form-offer-editor")
-        result = {}
-        result.update(
-            {field["name"]: field.get("value") or "" for field in bs.find_all("input") if field["name"] != "query"})
-        result.update({field["name"]: field.text or "" for field in bs.find_all("textarea")})
-        result.update({
-            field["name"]: field.find("option", selected=True)["value"]
-            for field in bs.find_all("select") if
-            "hidden" not in field.find_parent(class_="form-group").get("class", [])
-        })
-        result.update({field["name"]: "on" for field in bs.find_all("input", {"type": "checkbox"}, checked=True)})
-        subcategory = self.get_subcategory(enums.SubCategoryTypes.COMMON, int(result.get("node_id", 0)))
-        self.csrf_token = result.get("csrf_token") or self.csrf_token
-        currency = utils.parse_currency(bs.find("span", class_="form-control-feedback").text)
-        if self.currency != currency:
-            self.currency = currency
-        bs_buyer_prices = bs.find("table", class_="table-buyers-prices").find_all("tr")
-        payment_methods = []
-        for i, pm in enumerate(bs_buyer_prices):
-            pm_price, pm_currency = pm.find("td").text.rsplit(maxsplit=1)
-            pm_price = float(pm_price.replace(" ", ""))
-            pm_currency = parse_currency(pm_currency)
-            payment_methods.append(PaymentMethod(pm.find("th").text, pm_price, pm_currency, i))
-        calc_result = CalcResult(types.SubCategoryTypes.COMMON, subcategory.id, payment_methods,
-                                 float(result["price"]), None, types.Currency.UNKNOWN, currency)
-        db_amount = json.loads(html.unescape(bs.get("data-offer"))).get("amount")
-        return types.LotFields(lot_id, result, subcategory, currency, calc_result, db_amount)
+        page = self.__parse("lot_fields", response.content, lot_id)
+        if page.error is not None:
+            raise exceptions.LotParsingError(response, page.error, lot_id)
+        self.csrf_token = page.result.csrf_token or self.csrf_token
+        if self.currency != page.currency:
+            self.currency = page.currency
+        return page.result
 
     def get_chip_fields(self, subcategory_id: int) -> types.ChipFields:
         if not self.is_initiated:
@@ -1860,8 +1735,7 @@ class Account:
         headers = {}
         response = self.method("get", f"chips/{subcategory_id}/trade", headers, {}, raise_not_200=True)
 
-        html_response = response.content.decode()
-        bs = BeautifulSoup(html_response, "lxml")
+        bs = BeautifulSoup(response.content, "lxml", from_encoding="utf-8")
         result = {field["name"]: field.get("value") or "" for field in bs.find_all("input") if field["name"] != "query"}
         result.update({field["name"]: "on" for field in bs.find_all("input", {"type": "checkbox"}, checked=True)})
         return types.ChipFields(self.id, subcategory_id, result)
@@ -1891,7 +1765,15 @@ class Account:
             id_ = offer_fields.subcategory_id
             api_method = "chips/saveOffers"
 
-        response = self.method("post", api_method, headers, fields, raise_not_200=True, locale=locale)
+        try:
+            response = self.method("post", api_method, headers, fields, raise_not_200=True, locale=locale)
+        finally:
+            if isinstance(offer_fields, types.LotFields):
+                self.response_cache.invalidate(f"offerEdit?offer={id_}", f"offer?id={id_}", f"users/{self.id}/",
+                                               *([f"lots/{offer_fields.subcategory.id}/"]
+                                                 if offer_fields.subcategory else []))
+            else:
+                self.response_cache.invalidate(f"chips/{id_}/", f"users/{self.id}/")
         json_response = response.json()
         errors_dict = {}
         if (errors := json_response.get("errors")) or json_response.get("error"):
@@ -1916,6 +1798,93 @@ class Account:
         """
         self.save_lot(types.LotFields(lot_id, {"csrf_token": self.csrf_token, "offer_id": lot_id, "deleted": "1"}))
 
+    def __run_batch(self, func: Callable, items: dict, workers: int) -> dict:
+        """
+        Выполняет func для каждого значения items в ограниченном пуле потоков (частота запросов ограничивается
+        :attr:`FunPayAPI.account.Account.rate_limiter`).
+
+        :return: результаты {ключ: результат или исключение}.
+        """
+        if not items:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as executor:
+            futures = {key: executor.submit(func, value) for key, value in items.items()}
+        return {key: future.exception() or future.result() for key, future in futures.items()}
+
+    def save_lots(self, lots: list[types.LotFields], workers: int = 4) -> dict[int, bool | Exception]:
+        """
+        Сохраняет несколько лотов параллельно.
+
+        :param lots: объекты с полями лотов.
+        :type lots: :obj:`list` of :class:`FunPayAPI.types.LotFields`
+
+        :param workers: максимальное кол-во одновременных запросов.
+        :type workers: :obj:`int`, опционально
+
+        :return: результаты {ID лота: True или исключение}.
+        :rtype: :obj:`dict` {:obj:`int`: :obj:`bool` or :obj:`Exception`}
+        """
+        def save(lot_fields: types.LotFields) -> bool:
+            self.save_lot(lot_fields)
+            return True
+
+        return self.__run_batch(save, {i.lot_id: i for i in lots}, workers)
+
+    def set_lots_active(self, lot_ids: list[int], active: bool, workers: int = 4,
+                        skip_auto_delivery: bool = True) -> dict[int, bool | None | Exception]:
+        """
+        Активирует / деактивирует несколько лотов параллельно. Лоты, которые уже находятся в нужном состоянии,
+        не сохраняются.
+
+        :param lot_ids: ID лотов.
+        :type lot_ids: :obj:`list` of :obj:`int`
+
+        :param active: активировать (True) или деактивировать (False) лоты.
+        :type active: :obj:`bool`
+
+        :param workers: максимальное кол-во одновременных запросов.
+        :type workers: :obj:`int`, опционально
+
+        :param skip_auto_delivery: не изменять лоты с включенной автовыдачей FunPay.
+        :type skip_auto_delivery: :obj:`bool`, опционально
+
+        :return: результаты {ID лота: True - состояние лота изменено, None - лот уже был в нужном состоянии,
+            False - лот пропущен (автовыдача FunPay), исключение - ошибка}.
+        :rtype: :obj:`dict` {:obj:`int`: :obj:`bool` or :obj:`None` or :obj:`Exception`}
+        """
+        def set_active(lot_id: int) -> bool | None:
+            # поля лота перед сохранением всегда запрашиваются заново (условным запросом, если страница в кэше):
+            # устаревшая страница может содержать прежнее состояние лота и старый CSRF токен
+            lot_fields = self.get_lot_fields(lot_id, use_cache=False)
+            if skip_auto_delivery and lot_fields.auto_delivery:
+                return False
+            if lot_fields.active == active:
+                return None
+            lot_fields.active = active
+            self.save_lot(lot_fields)
+            return True
+
+        return self.__run_batch(set_active, {i: i for i in lot_ids}, workers)
+
+    def delete_lots(self, lot_ids: list[int], workers: int = 4) -> dict[int, bool | Exception]:
+        """
+        Удаляет несколько лотов параллельно.
+
+        :param lot_ids: ID лотов.
+        :type lot_ids: :obj:`list` of :obj:`int`
+
+        :param workers: максимальное кол-во одновременных запросов.
+        :type workers: :obj:`int`, опционально
+
+        :return: результаты {ID лота: True или исключение}.
+        :rtype: :obj:`dict` {:obj:`int`: :obj:`bool` or :obj:`Exception`}
+        """
+        def delete(lot_id: int) -> bool:
+            self.delete_lot(lot_id)
+            return True
+
+        return self.__run_batch(delete, {i: i for i in lot_ids}, workers)
+
     def get_exchange_rate(self, currency: types.Currency) -> tuple[float, types.Currency]:
         """
         Получает курс обмена текущей валюты аккаунта на переданную, обновляет валюту аккаунта.
@@ -1973,7 +1942,7 @@ class Account:
     def get_wallets(self) -> list[types.Wallet]:
         """Получение сохраненных кошельков."""
         response = self.method("get", "account/wallets", {}, {}, raise_not_200=True)
-        bs = BeautifulSoup(response.content.decode(), "lxml")
+        bs = BeautifulSoup(response.content, "lxml", from_encoding="utf-8")
         bs = bs.find("form", class_="details-editor")
         result = []
         for el in bs.find_all("div", class_="form-group"):
@@ -2087,6 +2056,93 @@ class Account:
         """
         return self.__sorted_subcategories
 
+    @property
+    def session_key(self) -> str:
+        """
+        Идентификатор аккаунта для снимков сессии (часть хэша golden_key).
+        """
+        return hashlib.sha256(self.golden_key.encode()).hexdigest()[:16]
+
+    def dump_session(self) -> dict:
+        """
+        Возвращает снимок данных аккаунта (идентификация, PHPSESSID, CSRF токен, категории и подкатегории),
+        из которого аккаунт можно восстановить без запросов к FunPay с помощью
+        :meth:`FunPayAPI.account.Account.load_session`.
+
+        :return: снимок данных аккаунта.
+        :rtype: :obj:`dict`
+        """
+        if not self.is_initiated:
+            raise exceptions.AccountNotInitiatedError()
+        return {
+            "version": 1,
+            "session_key": self.session_key,
+            "last_update": self.last_update,
+            "id": self.id,
+            "username": self.username,
+            "locale": self.__locale,
+            "app_data": self.app_data,
+            "csrf_token": self.csrf_token,
+            "phpsessid": self.phpsessid,
+            "logout_link": self._logout_link,
+            "active_sales": self.active_sales,
+            "active_purchases": self.active_purchases,
+            "total_balance": self.total_balance,
+            "currency": self.currency.name,
+            "categories": [[i.id, i.name, i.position] for i in self.__categories],
+            "subcategories": [[i.id, i.name, i.type.name, i.category.id, i.position] for i in self.__subcategories]
+        }
+
+    def load_session(self, data: dict, max_age: float = 3600) -> bool:
+        """
+        Восстанавливает данные аккаунта из снимка, полученного с помощью :meth:`FunPayAPI.account.Account.dump_session`.
+        После восстановления аккаунт считается инициализированным, но данные стоит обновить с помощью
+        :meth:`FunPayAPI.account.Account.get` (например, в отдельном потоке).
+
+        :param data: снимок данных аккаунта.
+        :type data: :obj:`dict`
+
+        :param max_age: максимальный возраст снимка в секундах.
+        :type max_age: :obj:`float`, опционально
+
+        :return: True, если данные восстановлены, False, если снимок устарел или принадлежит другому аккаунту.
+        :rtype: :obj:`bool`
+        """
+        if data.get("version") != 1 or data.get("session_key") != self.session_key or \
+                time.time() - (data.get("last_update") or 0) > max_age:
+            return False
+
+        categories = {}
+        for id_, name, position in data["categories"]:
+            categories[id_] = types.Category(id_, name, position=position)
+        subcategories = []
+        for id_, name, type_, category_id, position in data["subcategories"]:
+            subcategory = types.SubCategory(id_, name, types.SubCategoryTypes[type_], categories[category_id], position)
+            categories[category_id].add_subcategory(subcategory)
+            subcategories.append(subcategory)
+
+        self.__categories = list(categories.values())
+        self.__sorted_categories = categories
+        self.__subcategories = subcategories
+        self.__sorted_subcategories = {types.SubCategoryTypes.COMMON: {}, types.SubCategoryTypes.CURRENCY: {}}
+        for i in subcategories:
+            self.__sorted_subcategories[i.type][i.id] = i
+
+        self.id = data["id"]
+        self.username = data["username"]
+        self.__locale = data["locale"]
+        self.app_data = data["app_data"]
+        self.csrf_token = data["csrf_token"]
+        self.phpsessid = data["phpsessid"]
+        self._logout_link = data["logout_link"]
+        self.active_sales = data["active_sales"]
+        self.active_purchases = data["active_purchases"]
+        self.total_balance = data["total_balance"]
+        self.currency = types.Currency[data["currency"]]
+        self.last_update = data["last_update"]
+        self.__initiated = True
+        return True
+
     def logout(self) -> None:
         """
         Выходит с аккаунта FunPay (сбрасывает golden_key).
@@ -2105,55 +2161,19 @@ class Account:
         """
         return self.__initiated
 
-    def __setup_categories(self, html: str):
+    def __setup_categories(self, content: bytes | str):
         """
         Парсит категории и подкатегории с основной страницы и добавляет их в свойства класса.
 
-        :param html: HTML страница.
-        """
-        parser = BeautifulSoup(html, "lxml")
-        games_table = parser.find_all("div", {"class": "promo-game-list"})
-        if not games_table:
-            return
-
-        games_table = games_table[1] if len(games_table) > 1 else games_table[0]
-        games_divs = games_table.find_all("div", {"class": "promo-game-item"})
-        if not games_divs:
-            return
-        game_position = 0
-        subcategory_position = 0
-        for i in games_divs:
-            gid = int(i.find("div", {"class": "game-title"}).get("data-id"))
-            gname = i.find("a").text
-            regional_games = {
-                gid: types.Category(gid, gname, position=game_position)
-            }
-            game_position += 1
-            if regional_divs := i.find("div", {"role": "group"}):
-                for btn in regional_divs.find_all("button"):
-                    regional_game_id = int(btn["data-id"])
-                    regional_games[regional_game_id] = types.Category(regional_game_id, f"{gname} ({btn.text})",
-                                                                      position=game_position)
-                    game_position += 1
-
-            subcategories_divs = i.find_all("ul", {"class": "list-inline"})
-            for j in subcategories_divs:
-                j_game_id = int(j["data-id"])
-                subcategories = j.find_all("li")
-                for k in subcategories:
-                    a = k.find("a")
-                    name, link = a.text, a["href"]
-                    stype = types.SubCategoryTypes.CURRENCY if "chips" in link else types.SubCategoryTypes.COMMON
-                    sid = int(link.split("/")[-2])
-                    sobj = types.SubCategory(sid, name, stype, regional_games[j_game_id], subcategory_position)
-                    subcategory_position += 1
-                    regional_games[j_game_id].add_subcategory(sobj)
-                    self.__subcategories.append(sobj)
-                    self.__sorted_subcategories[stype][sid] = sobj
-
-            for gid in regional_games:
-                self.__categories.append(regional_games[gid])
-                self.__sorted_categories[gid] = regional_games[gid]
+        :param content: HTML страница (тело ответа или строка).
+        """
+        categories, subcategories = self.__parse("categories", content).result
+        for sobj in subcategories:
+            self.__subcategories.append(sobj)
+            self.__sorted_subcategories[sobj.type][sobj.id] = sobj
+        for cobj in categories:
+            self.__categories.append(cobj)
+            self.__sorted_categories[cobj.id] = cobj
 
     def __parse_messages(self, json_messages: dict, chat_id: int | str,
                          interlocutor_id: Optional[int] = None, interlocutor_username: Optional[str] = None,
@@ -2166,20 +2186,19 @@ class Account:
         if None not in (interlocutor_id, interlocutor_username):
             ids[interlocutor_id] = interlocutor_username
 
+        parsed = []  # данные из HTML сообщений (HTML каждого сообщения разбирается один раз)
         for i in json_messages:
             if i["id"] < from_id:
                 continue
             author_id = i["author"]
-            parser = BeautifulSoup(i["html"].replace("<br>", "\n"), "lxml")
+            data = parse_message_html(i["html"])
 
             # Если ник или бейдж написавшего неизвестен, но есть блок с данными об авторе сообщения
-            if None in [ids.get(author_id), badges.get(author_id)] and (
-                    author_div := parser.find("div", {"class": "media-user-name"})):
+            if None in [ids.get(author_id), badges.get(author_id)] and data.author_block:
                 if badges.get(author_id) is None:
-                    badge = author_div.find("span", {"class": "chat-msg-author-label label label-success"})
-                    badges[author_id] = badge.text if badge else 0
+                    badges[author_id] = data.badge if data.badge is not None else 0
                 if ids.get(author_id) is None:
-                    author = author_div.find("a").text.strip()
+                    author = data.author
                     ids[author_id] = author
                     if mb_chat_is_private:
                         if author_id == interlocutor_id and not interlocutor_username:
@@ -2190,10 +2209,9 @@ class Account:
             by_bot = False
             by_vertex = False
             image_name = None
-            if mb_chat_is_private and (image_tag := parser.find("a", {"class": "chat-img-link"})):
-                image_name = image_tag.find("img")
-                image_name = image_name.get('alt') if image_name else None
-                image_link = image_tag.get("href")
+            if mb_chat_is_private and data.image_block:
+                image_name = data.image_name
+                image_link = data.image_link
                 message_text = None
                 # "Отправлено_с_помощью_бота_FunPay_funpayautobot.png", "funpay_funpayautobot_image.png"
                 if isinstance(image_name, str) and "funpay_funpayautobot" in image_name.lower():
@@ -2204,9 +2222,9 @@ class Account:
             else:
                 image_link = None
                 if author_id == 0:
-                    message_text = parser.find("div", role="alert").text.strip()
+                    message_text = data.alert.strip()
                 else:
-                    message_text = parser.find("div", {"class": "chat-msg-text"}).text
+                    message_text = data.text
 
                 if message_text.startswith(self.__bot_character) or \
                         message_text.startswith(self.__old_bot_character) and author_id == self.id:
@@ -2217,7 +2235,7 @@ class Account:
                 #     by_vertex = True
 
             message_obj = types.Message(i["id"], message_text, chat_id, interlocutor_username, interlocutor_id,
-                                        None, author_id, i["html"], image_link, image_name,
+                                        None, author_id, i["html"] if self.keep_html else None, image_link, image_name,
                                         determine_msg_type=False,
                                         tag=tag)
             message_obj.by_bot = by_bot
@@ -2225,13 +2243,13 @@ class Account:
             message_obj.type = types.MessageTypes.NON_SYSTEM if author_id != 0 else message_obj.get_message_type()
 
             messages.append(message_obj)
+            parsed.append(data)
 
-        for i in messages:
+        for i, data in zip(messages, parsed):
             i.author = ids.get(i.author_id)
             i.chat_name = interlocutor_username
             i.interlocutor_id = interlocutor_id
             i.badge = badges.get(i.author_id) if badges.get(i.author_id) != 0 else None
-            parser = BeautifulSoup(i.html, "lxml")
             if i.badge:
                 i.is_employee = True
                 if i.badge in ("поддержка", "підтримка", "support"):
@@ -2240,18 +2258,16 @@ class Account:
                     i.is_moderation = True
                 elif i.badge in ("арбитраж", "арбітраж", "arbitration"):
                     i.is_arbitration = True
-            default_label = parser.find("div", {"class": "media-user-name"})
-            default_label = default_label.find("span", {
-                "class": "chat-msg-author-label label label-default"}) if default_label else None
-            if default_label:
-                if default_label.text in ("автовідповідь", "автоответ", "auto-reply"):
+            default_label = data.default_label
+            if default_label is not None:
+                if default_label in ("автовідповідь", "автоответ", "auto-reply"):
                     i.is_autoreply = True
-            i.badge = default_label.text if (i.badge is None and default_label is not None) else i.badge
+            i.badge = default_label if (i.badge is None and default_label is not None) else i.badge
             if i.type != types.MessageTypes.NON_SYSTEM:
-                users = parser.find_all('a', href=lambda href: href and '/users/' in href)
+                users = data.users
                 if users:
-                    i.initiator_username = users[0].text
-                    i.initiator_id = int(users[0]["href"].split("/")[-2])
+                    i.initiator_username = users[0][0]
+                    i.initiator_id = int(users[0][1].split("/")[-2])
                     if i.type in (types.MessageTypes.ORDER_PURCHASED, types.MessageTypes.ORDER_CONFIRMED,
                                   types.MessageTypes.NEW_FEEDBACK,
                                   types.MessageTypes.FEEDBACK_CHANGED,
@@ -2271,7 +2287,7 @@ class Account:
                             i.i_am_seller = False
                             i.i_am_buyer = True
                     elif len(users) > 1:
-                        last_user_id = int(users[-1]["href"].split("/")[-2])
+                        last_user_id = int(users[-1][1].split("/")[-2])
                         if i.type == types.MessageTypes.ORDER_CONFIRMED_BY_ADMIN:
                             if last_user_id == self.id:
                                 i.i_am_seller = True
@@ -2289,6 +2305,42 @@ class Account:
 
         return messages
 
+    def __parse(self, method: str, *args, can_fallback: Callable[[], bool] | None = None) -> ParsedPage:
+        """
+        Разбирает страницу бэкендом :py:obj:`.Account.parser_backend`. Если он не смог разобрать страницу
+        (например, FunPay изменил разметку), повторяет разбор запасным бэкендом (BeautifulSoup).
+
+        :param method: метод бэкенда (см. :class:`FunPayAPI.parsers.base.ParserBackend`).
+
+        :param can_fallback: функция, возвращающая False, если повторять разбор нельзя (например, уже вызывались
+            функции с побочными эффектами из аргументов); в этом случае исключение основного бэкенда пробрасывается.
+
+        :return: результат разбора страницы.
+        :rtype: :class:`FunPayAPI.parsers.base.ParsedPage`
+        """
+        try:
+            return getattr(self.parser_backend, method)(self, *args)
+        except:
+            if self.fallback_parser_backend is None or (can_fallback is not None and not can_fallback()):
+                raise
+            logger.warning(f"Не удалось разобрать страницу ({method}) бэкендом {self.parser_backend.name}. "
+                           f"Используется {self.fallback_parser_backend.name}.")
+            logger.debug("TRACEBACK", exc_info=True)
+        return getattr(self.fallback_parser_backend, method)(self, *args)
+
+    def __apply_page(self, page: ParsedPage, response: requests.Response):
+        """
+        Применяет данные разобранной страницы к аккаунту: проверяет авторизацию, обновляет CSRF токен и валюту.
+        """
+        if not page.authorized:
+            raise exceptions.UnauthorizedError(response)
+        if page.app_data is not None:
+            self.csrf_token = page.app_data.get("csrf-token") or self.csrf_token
+        else:
+            logger.warning("Произошла ошибка при обновлении csrf.")
+        if page.currency is not None and self.currency != page.currency:
+            self.currency = page.currency
+
     def __update_csrf_token(self, parser: BeautifulSoup):
         try:
             app_data = json.loads(parser.find("body").get("data-app-data"))
@@ -0,0 +1,136 @@
+"""
+В данном модуле описана асинхронная обертка над :class:`FunPayAPI.account.Account`.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable
+
+from .account import Account
+
+
+class AsyncAccount:
+    """
+    Асинхронная обертка над аккаунтом.
+
+    Любой публичный метод аккаунта доступен как корутина с той же сигнатурой и тем же типом результата:
+    `await async_account.get_order("ABCDEFGH")`. Запросы выполняются общим ограниченным пулом потоков поверх
+    keep-alive пула соединений аккаунта, поэтому куки, язык, редиректы и обработка 429 остаются прежними,
+    а одновременно выполняется не больше `concurrency` запросов.
+
+    Для синхронного кода (плагины, хэндлеры) есть :meth:`FunPayAPI.async_account.AsyncAccount.map`
+    и :meth:`FunPayAPI.async_account.AsyncAccount.run`.
+
+    :param account: экземпляр аккаунта.
+    :type account: :class:`FunPayAPI.account.Account`
+
+    :param concurrency: максимальное кол-во одновременных запросов (по умолчанию - размер пула соединений аккаунта).
+    :type concurrency: :obj:`int` or :obj:`None`, опционально
+    """
+
+    def __init__(self, account: Account, concurrency: int | None = None):
+        self.account: Account = account
+        """Экземпляр аккаунта."""
+        self.concurrency: int = max(concurrency or account.pool_size, 1)
+        """Максимальное кол-во одновременных запросов."""
+        self.__executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="FunPayAPI-pool")
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__loop_lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.account, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.call(attr, *args, **kwargs)
+
+        return wrapper
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Выполняет блокирующую функцию в пуле запросов.
+
+        :param func: функция (как правило, метод аккаунта).
+        :type func: :obj:`Callable`
+
+        :return: результат выполнения функции.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(func, *args, **kwargs))
+
+    def submit(self, func: Callable, *args, **kwargs):
+        """
+        Добавляет вызов блокирующей функции в пул запросов, не дожидаясь результата.
+
+        :param func: функция (как правило, метод аккаунта).
+        :type func: :obj:`Callable`
+
+        :return: объект Future.
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        return self.__executor.submit(func, *args, **kwargs)
+
+    def map(self, method: str | Callable, args_list: Iterable, return_exceptions: bool = False) -> list:
+        """
+        Синхронно вызывает метод аккаунта для каждого набора аргументов через пул запросов
+        (например, получает сразу несколько заказов) и возвращает результаты в том же порядке.
+
+        :param method: название метода аккаунта или функция.
+        :type method: :obj:`str` or :obj:`Callable`
+
+        :param args_list: аргументы вызовов (кортеж аргументов или один аргумент на вызов).
+        :type args_list: :obj:`Iterable`
+
+        :param return_exceptions: возвращать ли исключения в списке результатов вместо их возбуждения.
+        :type return_exceptions: :obj:`bool`, опционально
+
+        :return: список результатов.
+        :rtype: :obj:`list`
+        """
+        func = getattr(self.account, method) if isinstance(method, str) else method
+        futures = [self.__executor.submit(func, *(args if isinstance(args, tuple) else (args,)))
+                   for args in args_list]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def run(self, coro: Awaitable, timeout: float | None = None) -> Any:
+        """
+        Синхронно выполняет корутину в фоновом цикле событий обертки (из любого потока).
+
+        :param coro: корутина.
+
+        :param timeout: максимальное время ожидания результата (в секундах).
+        :type timeout: :obj:`float` or :obj:`None`, опционально
+
+        :return: результат корутины.
+        """
+        with self.__loop_lock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                threading.Thread(target=self.__loop.run_forever, daemon=True, name="FunPayAPI-loop").start()
+        return asyncio.run_coroutine_threadsafe(coro, self.__loop).result(timeout)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Останавливает пул запросов и фоновый цикл событий.
+
+        :param wait: дожидаться ли выполнения уже добавленных запросов.
+        :type wait: :obj:`bool`, опционально
+        """
+        self.__executor.shutdown(wait=wait)
+        with self.__loop_lock:
+            if self.__loop is not None:
+                self.__loop.call_soon_threadsafe(self.__loop.stop)
+                self.__loop = None
@@ -107,6 +107,20 @@ class SubCategoryTypes(Enum):
     """Подкатегория с лотами игровой валюты (их нельзя поднимать)."""
 
 
+class RunnerLanes(Enum):
+    """
+    В данном классе перечислены приоритеты (полосы) очереди полезных нагрузок Runner'а.
+    Чем меньше значение, тем раньше полезная нагрузка попадет в запрос
+    (долго ожидающие полезные нагрузки повышаются в приоритете, см. :class:`FunPayAPI.updater.runner.Runner`).
+    """
+    DELIVERY = 0
+    """Отправка сообщений (выдача товара) и запросы истории чатов, ответа на которые ждут."""
+    LISTENER = 1
+    """Объекты для получения событий (chat_bookmarks, orders_counters)."""
+    PREFETCH = 2
+    """Необязательные запросы (например, "Покупатель смотрит", предзагрузка истории чатов)."""
+
+
 class Currency(Enum):
     """
     В данном классе перечислены все типы валют баланса FunPay.
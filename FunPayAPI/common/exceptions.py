@@ -195,3 +195,22 @@ class RefundError(RequestFailedError):
     def short_str(self):
         return f"Не удалось вернуть средства по заказу {self.order_id}" \
                f"{f': {self.error_message}' if self.error_message else '.'}"
+
+
+class ResponseTooLargeError(RequestFailedError):
+    """
+    Исключение, которое возбуждается, если размер ответа FunPay превышает допустимый
+    (см. :attr:`FunPayAPI.account.Account.max_response_size`).
+    """
+
+    def __init__(self, response: requests.Response, size: int, max_size: int):
+        super(ResponseTooLargeError, self).__init__(response)
+        self.size = size
+        self.max_size = max_size
+
+    def short_str(self):
+        return f"Ответ на запрос к {self.url} слишком большой ({self.size} байт, допустимо {self.max_size} байт)."
+
+    def __str__(self):
+        # тело ответа прочитано не полностью, поэтому не выводится
+        return self.short_str()
@@ -0,0 +1,113 @@
+"""
+В данном модуле описан однопроходный разбор HTML сообщений чата FunPay (lxml + заранее скомпилированные XPath).
+"""
+from __future__ import annotations
+
+import threading
+
+from lxml import etree
+
+
+def _has_class(name: str) -> str:
+    """
+    :return: условие XPath "у элемента есть класс name" (аналог BeautifulSoup `{"class": name}`).
+    """
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+XPATHS = {
+    "author_div": f'(//div[{_has_class("media-user-name")}])[1]',
+    "author_link": "(.//a)[1]",
+    # класс сравнивается целиком, как BeautifulSoup сравнивает значение с пробелами
+    "badge": '(.//span[normalize-space(@class)="chat-msg-author-label label label-success"])[1]',
+    "default_label": '(.//span[normalize-space(@class)="chat-msg-author-label label label-default"])[1]',
+    "image_link": f'(//a[{_has_class("chat-img-link")}])[1]',
+    "image": "(.//img)[1]",
+    "alert": '(//div[@role="alert"])[1]',
+    "text": f'(//div[{_has_class("chat-msg-text")}])[1]',
+    "users": '//a[contains(@href, "/users/")]',
+    "string": "string()"
+}
+"""XPath выражения для разбора сообщения."""
+
+_local = threading.local()
+
+
+def _xpaths() -> dict[str, etree.XPath]:
+    # скомпилированные XPath не используются одновременно из разных потоков
+    if (xpaths := getattr(_local, "xpaths", None)) is None:
+        # smart_strings=False - результаты XPath не хранят ссылки на дерево
+        xpaths = _local.xpaths = {name: etree.XPath(expr, smart_strings=False) for name, expr in XPATHS.items()}
+    return xpaths
+
+
+class MessageHTML:
+    """
+    Данные, извлеченные из HTML сообщения.
+    """
+    __slots__ = ("text", "alert", "author_block", "author", "badge", "default_label", "image_block", "image_link",
+                 "image_name", "users")
+
+    def __init__(self):
+        self.text: str | None = None
+        """Текст блока `chat-msg-text` (`<br>` заменены на переносы строк)."""
+        self.alert: str | None = None
+        """Текст блока `role="alert"` (системные сообщения)."""
+        self.author_block: bool = False
+        """Есть ли в сообщении блок с данными об авторе (`media-user-name`)."""
+        self.author: str | None = None
+        """Никнейм автора из блока `media-user-name`."""
+        self.badge: str | None = None
+        """Бейдж автора (поддержка, арбитраж и т.д.)."""
+        self.default_label: str | None = None
+        """Метка автора (например, автоответ)."""
+        self.image_block: bool = False
+        """Есть ли в сообщении изображение (`chat-img-link`)."""
+        self.image_link: str | None = None
+        """Ссылка на изображение."""
+        self.image_name: str | None = None
+        """Название изображения (alt)."""
+        self.users: list[tuple[str, str]] = []
+        """Ссылки на пользователей [(текст ссылки, ссылка)] в порядке следования."""
+
+
+def parse_message_html(html: str) -> MessageHTML:
+    """
+    Разбирает HTML сообщения за один проход: текст, блок автора, бейджи, изображение и ссылки на пользователей.
+
+    :param html: HTML сообщения.
+    :type html: :obj:`str`
+
+    :return: данные сообщения.
+    :rtype: :class:`FunPayAPI.common.message_parser.MessageHTML`
+    """
+    result = MessageHTML()
+    root = etree.HTML(html.replace("<br>", "\n")) if html else None
+    if root is None:
+        return result
+    xpaths = _xpaths()
+    string = xpaths["string"]
+
+    if author_div := xpaths["author_div"](root):
+        author_div = author_div[0]
+        result.author_block = True
+        if author_link := xpaths["author_link"](author_div):
+            result.author = string(author_link[0]).strip()
+        if badge := xpaths["badge"](author_div):
+            result.badge = string(badge[0])
+        if default_label := xpaths["default_label"](author_div):
+            result.default_label = string(default_label[0])
+
+    if image_link := xpaths["image_link"](root):
+        image_link = image_link[0]
+        result.image_block = True
+        result.image_link = image_link.get("href")
+        if image := xpaths["image"](image_link):
+            result.image_name = image[0].get("alt")
+
+    if alert := xpaths["alert"](root):
+        result.alert = string(alert[0])
+    if text := xpaths["text"](root):
+        result.text = string(text[0])
+    result.users = [(string(i), i.get("href")) for i in xpaths["users"](root)]
+    return result
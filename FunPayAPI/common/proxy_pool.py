@@ -0,0 +1,170 @@
+"""
+В данном модуле описан пул прокси с оценкой их состояния (задержка, доля ошибок) и переключением на другой прокси
+при таймаутах / ошибках соединения.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Literal
+
+
+class ProxyStats:
+    """
+    Состояние одного прокси.
+
+    :param proxy: прокси в формате login:password@ip:port или ip:port.
+    :type proxy: :obj:`str`
+    """
+
+    ALPHA = 0.2
+    """Вес нового замера в скользящих средних."""
+
+    def __init__(self, proxy: str):
+        self.proxy: str = proxy
+        self.latency: float | None = None
+        """Скользящее среднее времени ответа (в секундах)."""
+        self.error_rate: float = 0.0
+        """Скользящее среднее доли ошибок."""
+        self.requests: int = 0
+        self.errors: int = 0
+        self.failures_in_row: int = 0
+        self.cooldown_until: float = 0
+        """Время, до которого прокси не используется после ошибок."""
+
+    def success(self, latency: float):
+        self.requests += 1
+        self.failures_in_row = 0
+        self.latency = latency if self.latency is None else self.latency + self.ALPHA * (latency - self.latency)
+        self.error_rate -= self.ALPHA * self.error_rate
+
+    def failure(self):
+        self.requests += 1
+        self.errors += 1
+        self.failures_in_row += 1
+        self.error_rate += self.ALPHA * (1 - self.error_rate)
+        # чем больше ошибок подряд, тем дольше прокси не используется (до 10 минут)
+        self.cooldown_until = time.time() + min(15 * 2 ** (self.failures_in_row - 1), 600)
+
+    @property
+    def available(self) -> bool:
+        return time.time() >= self.cooldown_until
+
+    @property
+    def score(self) -> float:
+        """Оценка прокси (меньше - лучше): задержка с учетом доли ошибок."""
+        latency = self.latency if self.latency is not None else 1.0
+        return latency * (1 + 10 * self.error_rate)
+
+    def to_dict(self) -> dict:
+        return {"latency": round(self.latency, 3) if self.latency is not None else None,
+                "error_rate": round(self.error_rate, 3), "requests": self.requests, "errors": self.errors,
+                "available": self.available, "score": round(self.score, 3)}
+
+
+class ProxyPool:
+    """
+    Пул прокси.
+
+    :param proxies: прокси в формате login:password@ip:port или ip:port.
+    :type proxies: :obj:`list` of :obj:`str`
+
+    :param policy: политика выбора прокси:\n
+        sticky - использовать текущий прокси, пока он работает (сессия FunPay не меняет IP без необходимости);\n
+        best - переходить на прокси с лучшей оценкой, если он заметно лучше текущего,
+        но не чаще чем раз в switch_interval секунд.
+    :type policy: :obj:`str`, опционально
+
+    :param current: прокси, который используется первым.
+    :type current: :obj:`str` or :obj:`None`, опционально
+
+    :param switch_interval: минимальный интервал между переключениями для политики best (в секундах).
+    :type switch_interval: :obj:`float`, опционально
+    """
+
+    def __init__(self, proxies: list[str], policy: Literal["sticky", "best"] = "sticky",
+                 current: str | None = None, switch_interval: float = 600):
+        self.stats: dict[str, ProxyStats] = {i: ProxyStats(i) for i in dict.fromkeys(proxies)}
+        self.policy = policy
+        self.switch_interval = switch_interval
+        self.current: str | None = current if current in self.stats else next(iter(self.stats), None)
+        """Текущий прокси."""
+        self.switches: int = 0
+        """Кол-во переключений прокси."""
+        self.__last_switch = time.time()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def to_requests(proxy: str | None) -> dict:
+        """
+        :param proxy: прокси в формате login:password@ip:port или ip:port.
+
+        :return: словарь прокси для requests.
+        """
+        if not proxy:
+            return {}
+        return {"http": f"http://{proxy}", "https": f"http://{proxy}"}
+
+    def __best(self, exclude: str | None = None) -> str | None:
+        candidates = [i for i in self.stats.values() if i.proxy != exclude and i.available]
+        if not candidates:
+            # все прокси на паузе - берем тот, чья пауза закончится раньше
+            candidates = sorted((i for i in self.stats.values() if i.proxy != exclude),
+                                key=lambda x: x.cooldown_until)[:1]
+        return min(candidates, key=lambda x: x.score).proxy if candidates else None
+
+    def __switch(self, proxy: str | None):
+        if proxy and proxy != self.current:
+            self.current = proxy
+            self.switches += 1
+            self.__last_switch = time.time()
+
+    def get(self) -> str | None:
+        """
+        :return: прокси для следующего запроса.
+        """
+        with self.__lock:
+            if self.current is None:
+                return None
+            if self.policy == "best" and time.time() - self.__last_switch > self.switch_interval:
+                best = self.__best()
+                if best and self.stats[best].score * 1.5 < self.stats[self.current].score:
+                    self.__switch(best)
+            return self.current
+
+    def report_success(self, proxy: str, latency: float):
+        """
+        Сохраняет успешный запрос через прокси.
+
+        :param proxy: прокси.
+        :param latency: время ответа (в секундах).
+        """
+        with self.__lock:
+            if proxy in self.stats:
+                self.stats[proxy].success(latency)
+
+    def report_failure(self, proxy: str) -> str | None:
+        """
+        Сохраняет ошибку соединения / таймаут прокси и при необходимости переключается на другой прокси.
+
+        :param proxy: прокси.
+
+        :return: прокси для повторного запроса.
+        """
+        with self.__lock:
+            if proxy in self.stats:
+                self.stats[proxy].failure()
+            if proxy == self.current:
+                self.__switch(self.__best(exclude=proxy) or proxy)
+            return self.current
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        :return: состояние прокси {прокси без логина и пароля: состояние}.
+        """
+        with self.__lock:
+            return {i.proxy.split("@")[-1]: {**i.to_dict(), "current": i.proxy == self.current}
+                    for i in self.stats.values()}
+
+    def __len__(self) -> int:
+        return len(self.stats)
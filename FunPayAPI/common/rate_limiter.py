@@ -0,0 +1,207 @@
+"""
+В данном модуле описан ограничитель частоты запросов к FunPay (token bucket) с отдельными корзинами для эндпоинтов.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Корзина токенов. Каждый запрос забирает один токен; токены восстанавливаются со скоростью rate в секунду,
+    но не больше capacity. Если токенов нет, запрос ждет, а не отправляется.
+
+    После ответа 429 скорость корзины снижается вдвое и затем плавно восстанавливается после успешных запросов.
+
+    :param name: название корзины.
+    :type name: :obj:`str`
+
+    :param rate: кол-во запросов в секунду.
+    :type rate: :obj:`float`
+
+    :param capacity: максимальное кол-во запросов подряд без ожидания.
+    :type capacity: :obj:`int`
+    """
+
+    def __init__(self, name: str, rate: float, capacity: int):
+        self.name: str = name
+        self.base_rate: float = rate
+        """Скорость восстановления токенов без учета штрафов (в секунду)."""
+        self.rate: float = rate
+        """Текущая скорость восстановления токенов (в секунду)."""
+        self.capacity: int = max(capacity, 1)
+        self.__tokens: float = float(self.capacity)
+        self.__updated: float = time.monotonic()
+        self.__blocked_until: float = 0
+        self.__lock = threading.Lock()
+
+        self.requests: int = 0
+        """Кол-во пропущенных запросов."""
+        self.waits: int = 0
+        """Кол-во запросов, которые ждали токен."""
+        self.total_wait: float = 0
+        """Суммарное время ожидания (в секундах)."""
+        self.max_wait: float = 0
+        """Максимальное время ожидания (в секундах)."""
+        self.throttled: int = 0
+        """Кол-во ответов 429."""
+
+    def __refill(self, now: float):
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+        self.__updated = now
+
+    def acquire(self) -> float:
+        """
+        Забирает токен, при необходимости дожидаясь его.
+
+        :return: время ожидания (в секундах).
+        :rtype: :obj:`float`
+        """
+        waited = 0.0
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__refill(now)
+                if now >= self.__blocked_until and self.__tokens >= 1:
+                    self.__tokens -= 1
+                    self.requests += 1
+                    if waited:
+                        self.waits += 1
+                        self.total_wait += waited
+                        self.max_wait = max(self.max_wait, waited)
+                    return waited
+                wait = max(self.__blocked_until - now, (1 - self.__tokens) / self.rate)
+            time.sleep(wait)
+            waited += wait
+
+    def success(self):
+        """
+        Отмечает успешный ответ: скорость, сниженная после 429, понемногу восстанавливается.
+        """
+        if self.rate < self.base_rate:
+            with self.__lock:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+    def penalize(self, delay: float):
+        """
+        Отмечает ответ 429: корзина опустошается, запросы ждут delay секунд, скорость снижается вдвое.
+
+        :param delay: время (в секундах), в течение которого запросы не отправляются.
+        :type delay: :obj:`float`
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__refill(now)
+            self.__tokens = 0
+            self.__blocked_until = max(self.__blocked_until, now + delay)
+            self.rate = max(self.rate / 2, self.base_rate / 16)
+            self.throttled += 1
+
+    @property
+    def tokens(self) -> float:
+        """Текущее кол-во токенов."""
+        with self.__lock:
+            self.__refill(time.monotonic())
+            return self.__tokens
+
+    def get_stats(self) -> dict:
+        """
+        :return: метрики корзины.
+        :rtype: :obj:`dict`
+        """
+        return {"tokens": round(self.tokens, 2), "rate": round(self.rate, 3), "base_rate": self.base_rate,
+                "capacity": self.capacity, "requests": self.requests, "waits": self.waits,
+                "total_wait": round(self.total_wait, 3), "max_wait": round(self.max_wait, 3),
+                "blocked_for": round(max(self.__blocked_until - time.monotonic(), 0), 3),
+                "throttled": self.throttled}
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов к FunPay.
+    Запрос попадает в корзину с самым длинным совпадающим префиксом пути (например, `lots/offerSave`),
+    остальные запросы - в корзину `default`.
+
+    :param limits: ограничения {префикс пути: (кол-во запросов в секунду, макс. кол-во запросов подряд)}.
+        Переданные значения дополняют / переопределяют :attr:`FunPayAPI.common.rate_limiter.RateLimiter.DEFAULT_LIMITS`.
+    :type limits: :obj:`dict` {:obj:`str`: :obj:`tuple` (:obj:`float`, :obj:`int`)} or :obj:`None`, опционально
+    """
+
+    DEFAULT_LIMITS: dict[str, tuple[float, int]] = {
+        "default": (4, 8),
+        "runner/": (2, 4),
+        "orders/": (2, 5),
+        "lots/offerSave": (1, 3),
+        "lots/offerEdit": (2, 4),
+        "lots/raise": (1, 2),
+        "users/": (2, 5),
+        "chat/": (2, 4)
+    }
+    """Ограничения по умолчанию."""
+
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None):
+        limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self.buckets: dict[str, TokenBucket] = {name: TokenBucket(name, float(rate), int(capacity))
+                                                for name, (rate, capacity) in limits.items()}
+        self.__prefixes = sorted((i for i in self.buckets if i != "default"), key=len, reverse=True)
+
+    @staticmethod
+    def get_path(url: str) -> str:
+        """
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :return: путь запроса без домена и языка (например, `orders/trade`).
+        :rtype: :obj:`str`
+        """
+        return re.sub(r"^(https://funpay\.com)?/?((en|uk)/)?", "", url, count=1)
+
+    def get_bucket(self, url: str) -> TokenBucket:
+        """
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :return: корзина, в которую попадает запрос.
+        :rtype: :class:`FunPayAPI.common.rate_limiter.TokenBucket`
+        """
+        path = self.get_path(url)
+        for prefix in self.__prefixes:
+            if path.startswith(prefix):
+                return self.buckets[prefix]
+        return self.buckets["default"]
+
+    def acquire(self, url: str) -> float:
+        """
+        Дожидается возможности отправить запрос.
+
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :return: время ожидания (в секундах).
+        :rtype: :obj:`float`
+        """
+        return self.get_bucket(url).acquire()
+
+    def success(self, url: str):
+        self.get_bucket(url).success()
+
+    def penalize(self, url: str, delay: float):
+        """
+        Отмечает ответ 429 на запрос: все запросы этой корзины ждут delay секунд.
+
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :param delay: время (в секундах), в течение которого запросы не отправляются.
+        :type delay: :obj:`float`
+        """
+        self.get_bucket(url).penalize(delay)
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        :return: метрики корзин {префикс пути: метрики}.
+        :rtype: :obj:`dict`
+        """
+        return {name: bucket.get_stats() for name, bucket in self.buckets.items()}
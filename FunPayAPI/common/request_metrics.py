@@ -0,0 +1,336 @@
+"""
+В данном модуле описан сбор метрик запросов к FunPay по эндпоинтам: кол-во запросов, объем трафика,
+время соединения (DNS + TCP) / TLS / первого байта, переходы по редиректам, ответы 429, повторы urllib3 и доля
+переиспользованных keep-alive соединений.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .rate_limiter import RateLimiter
+from .utils import LimitedResponse
+
+_local = threading.local()
+
+TIMINGS = ("connect", "tls", "ttfb", "total")
+"""Замеряемые этапы запроса."""
+
+
+def current_trace() -> RequestTrace | None:
+    """
+    :return: трассировка запроса, выполняемого в текущем потоке, или None.
+    """
+    return getattr(_local, "trace", None)
+
+
+class RequestTrace:
+    """
+    Трассировка одного вызова :meth:`FunPayAPI.account.Account.method` (включая редиректы и повторы).
+
+    :param endpoint: эндпоинт (путь запроса без ID и параметров).
+    :type endpoint: :obj:`str`
+    """
+    __slots__ = ("endpoint", "start", "connect", "tls", "ttfb", "new_connections", "attempts",
+                 "attempt_start", "hop_start", "retries", "retry_time", "bytes_out", "responses")
+
+    def __init__(self, endpoint: str):
+        self.endpoint: str = endpoint
+        self.start: float = time.perf_counter()
+        self.connect: float = 0
+        """Время установки новых соединений (вместе с разрешением имени)."""
+        self.tls: float = 0
+        """Время TLS-рукопожатия (при работе через прокси - вместе с установкой туннеля)."""
+        self.ttfb: float = 0
+        """Время от отправки запроса до получения заголовков ответа (суммарно по всем переходам)."""
+        self.new_connections: int = 0
+        self.attempts: int = 0
+        """Кол-во отправленных HTTP-запросов (переходы по редиректам и повторы urllib3)."""
+        self.attempt_start: float = 0
+        self.hop_start: float = 0
+        self.retries: int = 0
+        """Кол-во повторов urllib3 (Retry)."""
+        self.retry_time: float = 0
+        """Время, добавленное повторами urllib3 (неудачные попытки и паузы между ними)."""
+        self.bytes_out: int = 0
+        self.responses: list[requests.Response] = []
+
+    def hop_started(self):
+        """
+        Отмечает начало отправки запроса (очередного перехода).
+        """
+        self.hop_start = time.perf_counter()
+
+    def hop_finished(self, response: requests.Response):
+        """
+        Отмечает получение заголовков ответа.
+
+        :param response: ответ (тело еще может быть не прочитано).
+        :type response: :class:`requests.Response`
+        """
+        now = time.perf_counter()
+        self.ttfb += now - max(self.attempt_start, self.hop_start)
+        retries = getattr(getattr(response.raw, "retries", None), "history", None)
+        if retries:
+            self.retries += len(retries)
+            self.retry_time += max(self.attempt_start - self.hop_start, 0)
+        request = response.request
+        body = request.body
+        self.bytes_out += len(request.method) + len(request.url) + \
+            sum(len(k) + len(v) + 4 for k, v in request.headers.items()) + \
+            (len(body) if body is not None and hasattr(body, "__len__") else getattr(body, "len", 0))
+        self.responses.append(response)
+
+
+class EndpointMetrics:
+    """
+    Метрики одного эндпоинта.
+
+    :param samples_limit: кол-во последних замеров, по которым считаются перцентили.
+    :type samples_limit: :obj:`int`, опционально
+    """
+
+    def __init__(self, samples_limit: int = 500):
+        self.requests: int = 0
+        self.errors: int = 0
+        self.last_error: str | None = None
+        self.statuses: dict[int, int] = {}
+        self.bytes_out: int = 0
+        self.bytes_in: int = 0
+        self.redirects: int = 0
+        self.throttled: int = 0
+        """Кол-во ответов 429."""
+        self.retries: int = 0
+        self.retry_time: float = 0
+        self.attempts: int = 0
+        self.new_connections: int = 0
+        self.timings: dict[str, float] = {i: 0.0 for i in TIMINGS}
+        self.max_timings: dict[str, float] = {i: 0.0 for i in TIMINGS}
+        self.samples: deque[float] = deque(maxlen=samples_limit)
+
+    def record(self, trace: RequestTrace, duration: float, error: BaseException | None):
+        self.requests += 1
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"[:200]
+        for response in trace.responses:
+            self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+            if response.status_code == 429:
+                self.throttled += 1
+            content = response.__dict__.get("_content")
+            self.bytes_in += (len(content) if isinstance(content, bytes) else 0) + \
+                sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+        self.redirects += sum(1 for i in trace.responses if 300 <= i.status_code < 400)
+        self.bytes_out += trace.bytes_out
+        self.retries += trace.retries
+        self.retry_time += trace.retry_time
+        self.attempts += trace.attempts
+        self.new_connections += trace.new_connections
+        values = {"connect": trace.connect, "tls": trace.tls, "ttfb": trace.ttfb,
+                  "total": duration}
+        for name, value in values.items():
+            self.timings[name] += value
+            self.max_timings[name] = max(self.max_timings[name], value)
+        self.samples.append(duration)
+
+    def percentile(self, q: float) -> float:
+        """
+        :param q: перцентиль (от 0 до 1).
+
+        :return: время выполнения запроса (в секундах), не превышаемое в q последних запросов.
+        """
+        samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[round(q * (len(samples) - 1))]
+
+    def to_dict(self) -> dict:
+        requests_count = self.requests or 1
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "redirects": self.redirects,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "retry_time": round(self.retry_time, 4),
+            "new_connections": self.new_connections,
+            "reuse_ratio": round(1 - self.new_connections / self.attempts, 3) if self.attempts else 0.0,
+            "avg": {name: round(value / requests_count, 4) for name, value in self.timings.items()},
+            "max": {name: round(value, 4) for name, value in self.max_timings.items()},
+            "p50": round(self.percentile(0.5), 4),
+            "p99": round(self.percentile(0.99), 4)
+        }
+
+
+class RequestMetrics:
+    """
+    Сборщик метрик запросов к FunPay по эндпоинтам.
+    """
+
+    ORDER_ID_RE = re.compile(r"^orders/[A-Z0-9]{8}/")
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.start_time: float = time.time()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def get_endpoint(cls, url: str) -> str:
+        """
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :return: эндпоинт - путь запроса без языка, параметров и ID (например, `users/{id}/`).
+        :rtype: :obj:`str`
+        """
+        path = RateLimiter.get_path(url).split("?", 1)[0]
+        path = cls.ORDER_ID_RE.sub("orders/{id}/", path)
+        return re.sub(r"\d+", "{id}", path) or "/"
+
+    def start(self, url: str) -> RequestTrace:
+        """
+        Начинает трассировку запроса в текущем потоке.
+
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :return: трассировка запроса.
+        :rtype: :class:`FunPayAPI.common.request_metrics.RequestTrace`
+        """
+        trace = RequestTrace(self.get_endpoint(url))
+        _local.trace = trace
+        return trace
+
+    def finish(self, trace: RequestTrace, error: BaseException | None = None):
+        """
+        Завершает трассировку запроса и добавляет ее в метрики эндпоинта.
+
+        :param trace: трассировка запроса.
+        :type trace: :class:`FunPayAPI.common.request_metrics.RequestTrace`
+
+        :param error: исключение, если запрос завершился ошибкой.
+        :type error: :obj:`Exception` or :obj:`None`, опционально
+        """
+        duration = time.perf_counter() - trace.start
+        if current_trace() is trace:
+            _local.trace = None
+        with self.__lock:
+            if trace.endpoint not in self.endpoints:
+                self.endpoints[trace.endpoint] = EndpointMetrics()
+            self.endpoints[trace.endpoint].record(trace, duration, error)
+
+    def to_dict(self) -> dict[str, dict]:
+        """
+        :return: метрики эндпоинтов {эндпоинт: метрики}, эндпоинты с наибольшим суммарным временем сверху.
+        :rtype: :obj:`dict`
+        """
+        with self.__lock:
+            endpoints = sorted(self.endpoints.items(), key=lambda x: x[1].timings["total"], reverse=True)
+            return {name: metrics.to_dict() for name, metrics in endpoints}
+
+    def get_stats(self) -> dict:
+        """
+        :return: общие метрики (по всем эндпоинтам).
+        :rtype: :obj:`dict`
+        """
+        with self.__lock:
+            endpoints = list(self.endpoints.values())
+            attempts = sum(i.attempts for i in endpoints)
+            new_connections = sum(i.new_connections for i in endpoints)
+            return {"uptime": round(time.time() - self.start_time),
+                    "requests": sum(i.requests for i in endpoints),
+                    "errors": sum(i.errors for i in endpoints),
+                    "bytes_out": sum(i.bytes_out for i in endpoints),
+                    "bytes_in": sum(i.bytes_in for i in endpoints),
+                    "redirects": sum(i.redirects for i in endpoints),
+                    "throttled": sum(i.throttled for i in endpoints),
+                    "retries": sum(i.retries for i in endpoints),
+                    "new_connections": new_connections,
+                    "reuse_ratio": round(1 - new_connections / attempts, 3) if attempts else 0.0}
+
+
+class _TracingConnectionMixin:
+    """
+    Замеряет время установки (DNS + TCP) и TLS-рукопожатия новых соединений и отмечает отправку запросов
+    для трассировки текущего потока.
+    """
+
+    def _new_conn(self):
+        trace = current_trace()
+        if trace is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            trace.connect += time.perf_counter() - start
+
+    def connect(self):
+        trace = current_trace()
+        if trace is None:
+            return super().connect()
+        start = time.perf_counter()
+        before = trace.connect
+        super().connect()
+        trace.new_connections += 1
+        trace.tls += time.perf_counter() - start - (trace.connect - before)
+
+    def putrequest(self, *args, **kwargs):
+        if (trace := current_trace()) is not None:
+            trace.attempts += 1
+            trace.attempt_start = time.perf_counter()
+        return super().putrequest(*args, **kwargs)
+
+
+class TracingHTTPConnection(_TracingConnectionMixin, HTTPConnection):
+    pass
+
+
+class TracingHTTPSConnection(_TracingConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TracingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TracingHTTPConnection
+
+
+class TracingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TracingHTTPSConnection
+
+
+class TracingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, соединения которого записывают время соединения / TLS и отправки запросов
+    в трассировку текущего потока (см. :meth:`FunPayAPI.common.request_metrics.RequestMetrics.start`).
+    Возвращает ответы :class:`FunPayAPI.common.utils.LimitedResponse`.
+    """
+
+    POOL_CLASSES = {"http": TracingHTTPConnectionPool, "https": TracingHTTPSConnectionPool}
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # у SOCKS-прокси собственные классы соединений
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = self.POOL_CLASSES
+        return manager
+
+    def build_response(self, req, resp):
+        response = super().build_response(req, resp)
+        # тот же объект ответа, но с ограничением размера тела при чтении
+        response.__class__ = LimitedResponse
+        return response
@@ -0,0 +1,210 @@
+"""
+В данном модуле описан кэш ответов FunPay на GET-запросы страниц (профили, лоты, списки лотов).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Literal
+
+import requests
+
+from .rate_limiter import RateLimiter
+
+import logging
+
+logger = logging.getLogger("FunPayAPI.response_cache")
+
+
+class CacheEntry:
+    """
+    Закэшированный ответ.
+    """
+    __slots__ = ("response", "time", "ttl", "etag", "last_modified")
+
+    def __init__(self, response: requests.Response, ttl: float):
+        self.response: requests.Response = response
+        self.time: float = time.time()
+        """Время получения / последней проверки ответа."""
+        self.ttl: float = ttl
+        self.etag: str | None = response.headers.get("ETag")
+        self.last_modified: str | None = response.headers.get("Last-Modified")
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.time
+
+
+class ResponseCache:
+    """
+    Кэш ответов на GET-запросы с TTL для каждого эндпоинта (по префиксу пути), условными запросами
+    (ETag / Last-Modified) и режимом stale-while-revalidate: устаревший не более чем на stale_ttl секунд ответ
+    отдается сразу, а обновляется в фоне.
+    Закэшированные ответы возвращаются только запросам с use_cache=True
+    (см. :meth:`FunPayAPI.account.Account.method`), остальные запросы лишь обновляют кэш.
+
+    :param ttls: время жизни ответов {префикс пути: секунды}. Переданные значения дополняют / переопределяют
+        :attr:`FunPayAPI.common.response_cache.ResponseCache.DEFAULT_TTLS`. Запросы без подходящего префикса
+        не кэшируются.
+    :type ttls: :obj:`dict` {:obj:`str`: :obj:`float`} or :obj:`None`, опционально
+
+    :param stale_ttl: сколько секунд после истечения TTL ответ можно отдавать, обновляя его в фоне.
+    :type stale_ttl: :obj:`float`, опционально
+
+    :param max_entries: максимальное кол-во ответов в кэше.
+    :type max_entries: :obj:`int`, опционально
+    """
+
+    DEFAULT_TTLS: dict[str, float] = {
+        "users/": 60,
+        "lots/offerEdit": 60,
+        "lots/offer?": 60,
+        "lots/": 30,
+        "chips/": 30
+    }
+    """Время жизни ответов по умолчанию."""
+
+    def __init__(self, ttls: dict[str, float] | None = None, stale_ttl: float = 60, max_entries: int = 256):
+        self.ttls: dict[str, float] = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.stale_ttl: float = stale_ttl
+        self.max_entries: int = max_entries
+        self.entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self.stats: dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0, "not_modified": 0,
+                                      "invalidated": 0}
+        self.__prefixes = sorted(self.ttls, key=len, reverse=True)
+        self.__revalidating: set[tuple] = set()
+        self.__lock = threading.Lock()
+
+    def get_ttl(self, url: str) -> float:
+        """
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :return: время жизни ответа (0 - ответ не кэшируется).
+        :rtype: :obj:`float`
+        """
+        path = RateLimiter.get_path(url)
+        for prefix in self.__prefixes:
+            if path.startswith(prefix):
+                return self.ttls[prefix]
+        return 0
+
+    def lookup(self, key: tuple) -> tuple[CacheEntry | None, Literal["fresh", "stale", "expired"] | None]:
+        """
+        Ищет ответ в кэше.
+
+        :param key: ключ (ссылка, язык).
+
+        :return: запись и ее состояние: fresh - можно использовать, stale - можно использовать, но нужно обновить,
+            expired - нужно перезапросить (запись содержит ETag / Last-Modified для условного запроса).
+        """
+        with self.__lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, None
+            self.entries.move_to_end(key)
+            age = entry.age
+            if age <= entry.ttl:
+                self.stats["hits"] += 1
+                return entry, "fresh"
+            if age <= entry.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                return entry, "stale"
+            self.stats["misses"] += 1
+            return entry, "expired"
+
+    def get(self, key: tuple) -> CacheEntry | None:
+        """
+        :param key: ключ (ссылка, язык).
+
+        :return: запись (без учета ее состояния и без изменения счетчиков) или None.
+        """
+        with self.__lock:
+            return self.entries.get(key)
+
+    def store(self, key: tuple, url: str, response: requests.Response):
+        """
+        Сохраняет ответ (если эндпоинт кэшируется).
+
+        :param key: ключ (ссылка, язык).
+
+        :param url: ссылка / метод API.
+        :type url: :obj:`str`
+
+        :param response: ответ FunPay.
+        :type response: :class:`requests.Response`
+        """
+        if not (ttl := self.get_ttl(url)):
+            return
+        with self.__lock:
+            self.entries[key] = CacheEntry(response, ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def not_modified(self, key: tuple) -> CacheEntry | None:
+        """
+        Отмечает, что FunPay ответил 304 на условный запрос: запись снова становится свежей.
+
+        :param key: ключ (ссылка, язык).
+
+        :return: запись или None, если ее уже нет в кэше.
+        """
+        with self.__lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.time = time.time()
+                self.stats["not_modified"] += 1
+            return entry
+
+    def revalidate(self, key: tuple, func: Callable):
+        """
+        Запускает фоновое обновление записи (не более одного одновременного обновления на ключ).
+
+        :param key: ключ (ссылка, язык).
+
+        :param func: функция, выполняющая запрос и сохраняющая новый ответ.
+        """
+        with self.__lock:
+            if key in self.__revalidating:
+                return
+            self.__revalidating.add(key)
+
+        def run():
+            try:
+                func()
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+            finally:
+                with self.__lock:
+                    self.__revalidating.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self, *parts: str):
+        """
+        Удаляет из кэша ответы, ссылки которых содержат хотя бы одну из переданных подстрок.
+        Если подстроки не переданы, очищает весь кэш.
+
+        :param parts: подстроки ссылок (например, `offerEdit?offer=12345`).
+        :type parts: :obj:`str`
+        """
+        with self.__lock:
+            keys = [k for k in self.entries if not parts or any(p in k[0] for p in parts)]
+            for key in keys:
+                del self.entries[key]
+            self.stats["invalidated"] += len(keys)
+
+    def get_stats(self) -> dict[str, int | float]:
+        """
+        :return: кол-во записей, попаданий (в т.ч. устаревших), промахов, ответов 304, удаленных записей
+            и доля попаданий.
+        :rtype: :obj:`dict`
+        """
+        with self.__lock:
+            requests_count = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+            return {"entries": len(self.entries), **self.stats,
+                    "hit_rate": round((self.stats["hits"] + self.stats["stale_hits"]) / requests_count, 3)
+                    if requests_count else 0.0}
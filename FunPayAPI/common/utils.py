@@ -7,7 +7,9 @@ import random
 import re
 from datetime import datetime, timedelta, timezone
 
-from .enums import Currency
+import requests
+
+from .enums import Currency, MessageTypes
 
 MONTHS = {
     "января": 1,
@@ -77,6 +79,65 @@ def parse_wait_time(response: str) -> int:
         return 10
 
 
+class LimitedResponse(requests.Response):
+    """
+    Ответ, тело которого при чтении (:meth:`iter_content`, а значит и response.content / response.json())
+    ограничено :attr:`max_size` байтами. Создается :class:`FunPayAPI.common.request_metrics.TracingHTTPAdapter`.
+    """
+
+    max_size: int = 0
+    """Максимальный размер тела ответа в байтах (0 - без ограничения)."""
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        from .exceptions import ResponseTooLargeError
+
+        size = 0
+        for chunk in super().iter_content(chunk_size, decode_unicode):
+            size += len(chunk)
+            if self.max_size and size > self.max_size:
+                self.close()
+                raise ResponseTooLargeError(self, size, self.max_size)
+            yield chunk
+
+
+def read_response(response, max_size: int) -> bytes:
+    """
+    Читает тело ответа, полученного с stream=True, не превышая max_size байт
+    (для :class:`FunPayAPI.common.utils.LimitedResponse` размер проверяется при чтении по частям).
+    После чтения response.content / response.json() работают как обычно.
+
+    :param response: объект ответа (:class:`requests.Response`).
+
+    :param max_size: максимальный размер тела ответа в байтах (0 - без ограничения).
+
+    :return: тело ответа.
+    """
+    from .exceptions import ResponseTooLargeError
+
+    length = response.headers.get("Content-Length", "")
+    if max_size and length.isdigit() and int(length) > max_size:
+        response.close()
+        raise ResponseTooLargeError(response, int(length), max_size)
+    if isinstance(response, LimitedResponse):
+        response.max_size = max_size
+    return response.content
+
+
+def parse_html(content: bytes):
+    """
+    Строит lxml-дерево HTML страницы прямо из байтов ответа (без создания промежуточной строки).
+
+    :param content: тело ответа (UTF-8).
+
+    :return: корневой элемент страницы (:class:`lxml.html.HtmlElement`).
+    """
+    from lxml import html as lxml_html
+
+    parser = lxml_html.HTMLParser(encoding="utf-8")
+    parser.feed(content)
+    return parser.close()
+
+
 def parse_currency(s: str) -> Currency:
     return {"₽": Currency.RUB,
             "€": Currency.EUR,
@@ -251,3 +312,86 @@ class RegularExpressions(object):
         """
         Скомпилированное регулярное выражение, описывающее фразу о смене валюты.
         """
+
+
+class MessageTypeClassifier(object):
+    """
+    Определяет тип сообщения по его тексту с помощью регулярных выражений из RegularExpressions.
+
+    Выражение типа проверяется, только если в тексте есть одна из его фраз (без них выражение совпасть не может),
+    поэтому для обычных сообщений не выполняется ни одного поиска, а для системных - как правило, один.
+    Порядок проверки типов совпадает с прежней последовательной проверкой выражений.
+    Класс является singleton'ом.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "instance"):
+            instance = super(MessageTypeClassifier, cls).__new__(cls)
+            instance.__setup()
+            setattr(cls, "instance", instance)
+        return getattr(cls, "instance")
+
+    def __setup(self):
+        res = RegularExpressions()
+        # (тип, фразы, выражение) в порядке от самых часто-используемых к самым редко-используемым
+        self.__order_rules: tuple[tuple[MessageTypes, tuple[str, ...], re.Pattern], ...] = (
+            (MessageTypes.ORDER_CONFIRMED, ("подтвердил успешное выполнение заказа", "has confirmed that order"),
+             res.ORDER_CONFIRMED),
+            (MessageTypes.NEW_FEEDBACK, ("написал отзыв к заказу", "has given feedback to the order"),
+             res.NEW_FEEDBACK),
+            (MessageTypes.NEW_FEEDBACK_ANSWER, ("ответил на отзыв к заказу",
+                                                "has replied to their feedback to the order"),
+             res.NEW_FEEDBACK_ANSWER),
+            (MessageTypes.FEEDBACK_CHANGED, ("изменил отзыв к заказу", "has edited their feedback to the order"),
+             res.FEEDBACK_CHANGED),
+            (MessageTypes.FEEDBACK_DELETED, ("удалил отзыв к заказу", "has deleted their feedback to the order"),
+             res.FEEDBACK_DELETED),
+            (MessageTypes.REFUND, ("вернул деньги покупателю", "has refunded the buyer"), res.REFUND),
+            (MessageTypes.FEEDBACK_ANSWER_CHANGED, ("изменил ответ на отзыв к заказу",
+                                                    "has edited a reply to their feedback to the order"),
+             res.FEEDBACK_ANSWER_CHANGED),
+            (MessageTypes.FEEDBACK_ANSWER_DELETED, ("удалил ответ на отзыв к заказу",
+                                                    "has deleted a reply to their feedback to the order"),
+             res.FEEDBACK_ANSWER_DELETED),
+            (MessageTypes.ORDER_CONFIRMED_BY_ADMIN, ("подтвердил успешное выполнение заказа",
+                                                     "has confirmed that order"),
+             res.ORDER_CONFIRMED_BY_ADMIN),
+            (MessageTypes.PARTIAL_REFUND, ("Часть средств по заказу", "A part of the funds pertaining to the order"),
+             res.PARTIAL_REFUND),
+            (MessageTypes.ORDER_REOPENED, ("открыт повторно", "has been reopened"), res.ORDER_REOPENED),
+            (MessageTypes.REFUND_BY_ADMIN, ("вернул деньги покупателю", "has refunded the buyer"),
+             res.REFUND_BY_ADMIN)
+        )
+        self.__res = res
+
+    def classify(self, text: str | None) -> MessageTypes:
+        """
+        Определяет тип сообщения.
+
+        :param text: текст сообщения.
+        :type text: :obj:`str` or :obj:`None`
+
+        :return: тип сообщения.
+        :rtype: :class:`FunPayAPI.common.enums.MessageTypes`
+        """
+        if not text:
+            return MessageTypes.NON_SYSTEM
+
+        res = self.__res
+        if " Discord. " in text and res.DISCORD.search(text):
+            return MessageTypes.DISCORD
+        if ("Уважаемые продавцы, " in text or "Dear vendors, " in text) and res.DEAR_VENDORS.search(text):
+            return MessageTypes.DEAR_VENDORS
+
+        # все остальные выражения содержат ID заказа
+        if "#" not in text:
+            return MessageTypes.NON_SYSTEM
+
+        if ("оплатил заказ #" in text or "has paid for order #" in text) and res.ORDER_PURCHASED.search(text) \
+                and res.ORDER_PURCHASED2.search(text):
+            return MessageTypes.ORDER_PURCHASED
+
+        for message_type, (phrase, phrase_en), regex in self.__order_rules:
+            if (phrase in text or phrase_en in text) and regex.search(text):
+                return message_type
+        return MessageTypes.NON_SYSTEM
@@ -0,0 +1,28 @@
+"""
+Бэкенды разбора HTML страниц FunPay.
+
+    lxml - lxml + XPath (по умолчанию);
+    bs4  - BeautifulSoup (запасной: используется, если основной бэкенд не смог разобрать страницу).
+"""
+from .base import ParserBackend, ParsedPage
+from .bs4_backend import BS4Backend
+from .lxml_backend import LxmlBackend
+
+BACKENDS: dict[str, type[ParserBackend]] = {
+    LxmlBackend.name: LxmlBackend,
+    BS4Backend.name: BS4Backend
+}
+"""Доступные бэкенды {название: класс}."""
+
+
+def get_backend(name: str) -> ParserBackend:
+    """
+    :param name: название бэкенда (см. :obj:`FunPayAPI.parsers.BACKENDS`).
+    :type name: :obj:`str`
+
+    :return: экземпляр бэкенда.
+    :rtype: :class:`FunPayAPI.parsers.base.ParserBackend`
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд разбора страниц: {name}. Доступные: {', '.join(BACKENDS)}.")
+    return BACKENDS[name]()
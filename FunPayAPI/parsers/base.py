@@ -0,0 +1,125 @@
+"""
+В данном модуле описан базовый класс бэкенда разбора страниц FunPay.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Any
+
+from ..common.enums import Currency, OrderStatuses, SubCategoryTypes
+
+if TYPE_CHECKING:
+    from ..account import Account
+
+
+class ParsedPage:
+    """
+    Результат разбора страницы.
+
+    :param result: объект(ы), полученные со страницы (см. методы :class:`FunPayAPI.parsers.base.ParserBackend`).
+    :param authorized: есть ли на странице блок авторизованного пользователя.
+    :param app_data: данные `data-app-data` страницы (None, если их нет / не удалось разобрать).
+    :param currency: валюта аккаунта, найденная на странице.
+    :param error: текст ошибки FunPay на странице.
+    """
+    __slots__ = ("result", "authorized", "app_data", "currency", "error")
+
+    def __init__(self, result: Any = None, authorized: bool = True, app_data: dict | None = None,
+                 currency: Currency | None = None, error: str | None = None):
+        self.result: Any = result
+        self.authorized: bool = authorized
+        self.app_data: dict | None = app_data
+        self.currency: Currency | None = currency
+        self.error: str | None = error
+
+
+class ParserBackend:
+    """
+    Бэкенд разбора страниц FunPay. Каждый метод принимает тело ответа (байты или строку) и возвращает
+    :class:`FunPayAPI.parsers.base.ParsedPage` с объектами :mod:`FunPayAPI.types`.
+
+    Бэкенды не изменяют аккаунт: обновление CSRF токена и валюты выполняет :class:`FunPayAPI.account.Account`.
+    От аккаунта используются только ID, никнейм, символы бота и поиск подкатегорий.
+    """
+
+    name: str = ""
+    """Название бэкенда."""
+
+    def public_lots(self, account: Account, content: bytes | str, subcategory_type: SubCategoryTypes,
+                    subcategory_id: int) -> ParsedPage:
+        """
+        Страница лотов подкатегории (`lots/<ID>/`, `chips/<ID>/`).
+
+        :return: result - :obj:`list` of :class:`FunPayAPI.types.LotShortcut`.
+        """
+        raise NotImplementedError
+
+    def my_lots(self, account: Account, content: bytes | str, subcategory_id: int) -> ParsedPage:
+        """
+        Страница своих лотов подкатегории (`lots/<ID>/trade`).
+
+        :return: result - :obj:`list` of :class:`FunPayAPI.types.MyLotShortcut`.
+        """
+        raise NotImplementedError
+
+    def user_profile(self, account: Account, content: bytes | str, user_id: int, html: str) -> ParsedPage:
+        """
+        Страница пользователя (`users/<ID>/`).
+
+        :param html: HTML страницы (сохраняется в профиле).
+
+        :return: result - :class:`FunPayAPI.types.UserProfile`.
+        """
+        raise NotImplementedError
+
+    def order(self, account: Account, content: bytes | str, order_id: str, html: str) -> ParsedPage:
+        """
+        Страница заказа (`orders/<ID>/`).
+
+        :param html: HTML страницы (сохраняется в заказе).
+
+        :return: result - :class:`FunPayAPI.types.Order`.
+        """
+        raise NotImplementedError
+
+    def sales(self, account: Account, content: bytes | str, first_page: bool,
+              subcategories: dict[str, Any] | None, stop_at: Callable[[str, OrderStatuses], bool] | None,
+              exclude_ids: list[str], include_paid: bool, include_closed: bool,
+              include_refunded: bool) -> ParsedPage:
+        """
+        Страница продаж (`orders/trade`).
+
+        :param first_page: первая ли это страница (на ней есть данные аккаунта и список подкатегорий).
+        :param subcategories: подкатегории {"игра, подкатегория": подкатегория} (для последующих страниц или
+            ранее полученные). Если None, строятся из списка игр на странице; если в них нет подкатегории
+            какого-либо заказа, список игр перечитывается (один раз за вызов).
+        :param stop_at: условие остановки; строки ниже сработавшей могут не разбираться вовсе.
+
+        :return: result - (ID след. заказа (может быть None, если разбор остановлен по stop_at),
+            :obj:`list` of :class:`FunPayAPI.types.OrderShortcut`, подкатегории).
+        """
+        raise NotImplementedError
+
+    def lot_fields(self, account: Account, content: bytes | str, lot_id: int) -> ParsedPage:
+        """
+        Страница редактирования лота (`lots/offerEdit`).
+
+        :return: result - :class:`FunPayAPI.types.LotFields` (или error, если FunPay вернул ошибку).
+        """
+        raise NotImplementedError
+
+    def categories(self, account: Account, content: bytes | str) -> ParsedPage:
+        """
+        Основная страница FunPay.
+
+        :return: result - (:obj:`list` of :class:`FunPayAPI.types.Category`,
+            :obj:`list` of :class:`FunPayAPI.types.SubCategory`) в порядке следования на странице.
+        """
+        raise NotImplementedError
+
+    def chats(self, account: Account, content: bytes | str) -> ParsedPage:
+        """
+        HTML списка чатов (`chat_bookmarks`).
+
+        :return: result - :obj:`list` of :class:`FunPayAPI.types.ChatShortcut`.
+        """
+        raise NotImplementedError
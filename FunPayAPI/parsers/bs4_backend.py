@@ -0,0 +1,519 @@
+"""
+В данном модуле описан бэкенд разбора страниц FunPay на BeautifulSoup (запасной режим: медленнее, но менее
+чувствителен к изменениям разметки).
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+import html as html_module
+import json
+import logging
+
+from bs4 import BeautifulSoup
+
+from .base import ParserBackend, ParsedPage
+from .. import types
+from ..common import utils
+from ..common.enums import SubCategoryTypes, OrderStatuses
+from ..common.utils import parse_currency, RegularExpressions
+
+if TYPE_CHECKING:
+    from ..account import Account
+
+logger = logging.getLogger("FunPayAPI.parsers")
+
+
+class BS4Backend(ParserBackend):
+    """
+    Бэкенд разбора страниц на BeautifulSoup.
+    """
+
+    name = "bs4"
+
+    @staticmethod
+    def parse(content: bytes | str) -> BeautifulSoup:
+        if isinstance(content, bytes):
+            return BeautifulSoup(content, "lxml", from_encoding="utf-8")
+        return BeautifulSoup(content, "lxml")
+
+    @staticmethod
+    def authorized(parser: BeautifulSoup) -> bool:
+        return parser.find("div", {"class": "user-link-name"}) is not None
+
+    @staticmethod
+    def app_data(parser: BeautifulSoup) -> dict | None:
+        try:
+            return json.loads(parser.find("body").get("data-app-data"))
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+            return None
+
+    def public_lots(self, account: Account, content: bytes | str, subcategory_type: SubCategoryTypes,
+                    subcategory_id: int) -> ParsedPage:
+        parser = self.parse(content)
+        if not self.authorized(parser):
+            return ParsedPage(authorized=False)
+        page = ParsedPage([], app_data=self.app_data(parser))
+        offers = parser.find_all("a", {"class": "tc-item"})
+        if not offers:
+            return page
+
+        subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
+        sellers = {}
+        currency = None
+        for offer in offers:
+            offer_id = offer["href"].split("id=")[1]
+            promo = 'offer-promo' in offer.get('class', [])
+            description = offer.find("div", {"class": "tc-desc-text"})
+            description = description.text if description else None
+            server = offer.find("div", class_="tc-server")
+            server = server.text if server else None
+            side = offer.find("div", class_="tc-side")
+            side = side.text if side else None
+            tc_price = offer.find("div", {"class": "tc-price"})
+            if subcategory_type is types.SubCategoryTypes.COMMON:
+                price = float(tc_price["data-s"])
+            else:
+                price = float(tc_price.find("div").text.rsplit(maxsplit=1)[0].replace(" ", ""))
+            if currency is None:
+                currency = page.currency = parse_currency(tc_price.find("span", class_="unit").text)
+            seller_soup = offer.find("div", class_="tc-user")
+            attributes = {k.replace("data-", "", 1): int(v) if v.isdigit() else v for k, v in offer.attrs.items()
+                          if k.startswith("data-")}
+
+            auto = attributes.get("auto") == 1
+            tc_amount = offer.find("div", class_="tc-amount")
+            amount = tc_amount.text.replace(" ", "") if tc_amount else None
+            amount = int(amount) if amount and amount.isdigit() else None
+            seller_key = str(seller_soup)
+            if seller_key not in sellers:
+                online = False
+                if attributes.get("online") == 1:
+                    online = True
+                seller_body = offer.find("div", class_="media-body")
+                username = seller_body.find("div", class_="media-user-name").text.strip()
+                rating_stars = seller_body.find("div", class_="rating-stars")
+                if rating_stars is not None:
+                    rating_stars = len(rating_stars.find_all("i", class_="fas"))
+                k_reviews = seller_body.find("div", class_="media-user-reviews")
+                if k_reviews:
+                    k_reviews = "".join([i for i in k_reviews.text if i.isdigit()])
+                k_reviews = int(k_reviews) if k_reviews else 0
+                user_id = int(seller_body.find("span", class_="pseudo-a")["data-href"].split("/")[-2])
+                seller = types.SellerShortcut(user_id, username, online, rating_stars, k_reviews,
+                                              seller_key if account.keep_html else None)
+                sellers[seller_key] = seller
+            else:
+                seller = sellers[seller_key]
+            for i in ("online", "auto"):
+                if i in attributes:
+                    del attributes[i]
+
+            lot_obj = types.LotShortcut(offer_id, server, side, description, amount, price, currency, subcategory_obj,
+                                        seller, auto, promo, attributes,
+                                        str(offer) if account.keep_html else None)
+            page.result.append(lot_obj)
+        return page
+
+    def my_lots(self, account: Account, content: bytes | str, subcategory_id: int) -> ParsedPage:
+        parser = self.parse(content)
+        if not self.authorized(parser):
+            return ParsedPage(authorized=False)
+        page = ParsedPage([], app_data=self.app_data(parser))
+        offers = parser.find_all("a", class_="tc-item")
+        if not offers:
+            return page
+
+        subcategory_obj = account.get_subcategory(SubCategoryTypes.COMMON, subcategory_id)
+        currency = None
+        for offer in offers:
+            offer_id = offer["data-offer"]
+            description = offer.find("div", {"class": "tc-desc-text"})
+            description = description.text if description else None
+            server = offer.find("div", class_="tc-server")
+            server = server.text if server else None
+            side = offer.find("div", class_="tc-side")
+            side = side.text if side else None
+            tc_price = offer.find("div", class_="tc-price")
+            price = float(tc_price["data-s"])
+            if currency is None:
+                currency = page.currency = parse_currency(tc_price.find("span", class_="unit").text)
+            auto = bool(tc_price.find("i", class_="auto-dlv-icon"))
+            tc_amount = offer.find("div", class_="tc-amount")
+            amount = tc_amount.text.replace(" ", "") if tc_amount else None
+            amount = int(amount) if amount and amount.isdigit() else None
+            active = "warning" not in offer.get("class", [])
+            lot_obj = types.MyLotShortcut(offer_id, server, side, description, amount, price, currency, subcategory_obj,
+                                          auto, active, str(offer) if account.keep_html else None)
+            page.result.append(lot_obj)
+        return page
+
+    def user_profile(self, account: Account, content: bytes | str, user_id: int, html: str) -> ParsedPage:
+        parser = self.parse(content)
+        if not self.authorized(parser):
+            return ParsedPage(authorized=False)
+        page = ParsedPage(app_data=self.app_data(parser))
+
+        username = parser.find("span", {"class": "mr4"}).text
+        user_status = parser.find("span", {"class": "media-user-status"})
+        user_status = user_status.text if user_status else ""
+        avatar_link = parser.find("div", {"class": "avatar-photo"}).get("style").split("(")[1].split(")")[0]
+        avatar_link = avatar_link if avatar_link.startswith("https") else f"https://funpay.com{avatar_link}"
+        banned = bool(parser.find("span", {"class": "label label-danger"}))
+        user_obj = page.result = types.UserProfile(user_id, username, avatar_link,
+                                                   "Онлайн" in user_status or "Online" in user_status, banned, html)
+
+        subcategories_divs = parser.find_all("div", {"class": "offer-list-title-container"})
+
+        if not subcategories_divs:
+            return page
+
+        for i in subcategories_divs:
+            subcategory_link = i.find("h3").find("a").get("href")
+            subcategory_id = int(subcategory_link.split("/")[-2])
+            subcategory_type = types.SubCategoryTypes.CURRENCY if "chips" in subcategory_link else \
+                types.SubCategoryTypes.COMMON
+            subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
+            if not subcategory_obj:
+                continue
+
+            offers = i.parent.find_all("a", {"class": "tc-item"})
+            currency = None
+            for j in offers:
+                offer_id = j["href"].split("id=")[1]
+                description = j.find("div", {"class": "tc-desc-text"})
+                description = description.text if description else None
+                server = j.find("div", class_="tc-server")
+                server = server.text if server else None
+                side = j.find("div", class_="tc-side")
+                side = side.text if side else None
+                auto = j.find("i", class_="auto-dlv-icon") is not None
+                tc_price = j.find("div", {"class": "tc-price"})
+                tc_amount = j.find("div", class_="tc-amount")
+                amount = tc_amount.text.replace(" ", "") if tc_amount else None
+                amount = int(amount) if amount and amount.isdigit() else None
+                if subcategory_obj.type is types.SubCategoryTypes.COMMON:
+                    price = float(tc_price["data-s"])
+                else:
+                    price = float(tc_price.find("div").text.rsplit(maxsplit=1)[0].replace(" ", ""))
+                if currency is None:
+                    currency = page.currency = parse_currency(tc_price.find("span", class_="unit").text)
+                lot_obj = types.LotShortcut(offer_id, server, side, description, amount, price, currency,
+                                            subcategory_obj,
+                                            None, auto,
+                                            None, None, str(j) if account.keep_html else None)
+                user_obj.add_lot(lot_obj)
+        return page
+
+    def order(self, account: Account, content: bytes | str, order_id: str, html: str) -> ParsedPage:
+        parser = self.parse(content)
+        if not self.authorized(parser):
+            return ParsedPage(authorized=False)
+        page = ParsedPage(app_data=self.app_data(parser))
+
+        if (span := parser.find("span", {"class": "text-warning"})) and span.text in (
+                "Возврат", "Повернення", "Refund"):
+            status = types.OrderStatuses.REFUNDED
+        elif (span := parser.find("span", {"class": "text-success"})) and span.text in ("Закрыт", "Закрито", "Closed"):
+            status = types.OrderStatuses.CLOSED
+        else:
+            status = types.OrderStatuses.PAID
+
+        short_description = None
+        full_description = None
+        sum_ = None
+        currency = types.Currency.UNKNOWN
+        subcategory = None
+        order_secrets = []
+        stop_params = False
+        lot_params = []
+        buyer_params = {}
+
+        amount = 1
+        for div in parser.find_all("div", {"class": "param-item"}):
+            if not (h := div.find("h5")):
+                continue
+            if not stop_params and div.find_previous("hr"):
+                stop_params = True
+
+            if h.text in ("Краткое описание", "Короткий опис", "Short description"):
+                stop_params = True
+                short_description = div.find("div").text
+            elif h.text in ("Подробное описание", "Докладний опис", "Detailed description"):
+                stop_params = True
+                full_description = div.find("div").text
+            elif h.text in ("Сумма", "Сума", "Total"):
+                sum_ = float(div.find("span").text.replace(" ", ""))
+                currency = parse_currency(div.find("strong").text)
+            elif h.text in ("Категория", "Категорія", "Category",
+                            "Валюта", "Currency"):
+                subcategory_link = div.find("a").get("href")
+                subcategory_split = subcategory_link.split("/")
+                subcategory_id = int(subcategory_split[-2])
+                subcategory_type = types.SubCategoryTypes.COMMON if "lots" in subcategory_link else \
+                    types.SubCategoryTypes.CURRENCY
+                subcategory = account.get_subcategory(subcategory_type, subcategory_id)
+            elif h.text in ("Оплаченный товар", "Оплаченные товары",
+                            "Оплачений товар", "Оплачені товари",
+                            "Paid product", "Paid products"):
+                secret_placeholders = div.find_all("span", class_="secret-placeholder")
+                order_secrets = [i.text for i in secret_placeholders]
+            elif h.text in ("Количество", "Amount", "Кількість"):
+                div2 = div.find("div", class_="text-bold")
+                if div2:
+                    match = RegularExpressions().PRODUCTS_AMOUNT_ORDER.fullmatch(div2.text)
+                    if match:
+                        amount = int(match.group(1).replace(" ", ""))
+            elif h.text in ("Відкрито", "Открыт", "Open"):
+                continue  # todo
+            elif h.text in ("Закрито", "Закрыт", "Closed"):
+                continue  # todo
+            elif not stop_params and h.text not in ("Игра", "Гра", "Game"):
+                div2 = div.find("div")
+                if div2:
+                    res = div2.text.strip()
+                    lot_params.append((h.text, res))
+            elif stop_params:
+                div2 = div.find("div", class_="text-bold")
+                if div2:
+                    buyer_params[h.text] = div2.text
+        if not stop_params:
+            lot_params = []
+
+        chat = parser.find("div", {"class": "chat-header"})
+        chat_link = chat.find("div", {"class": "media-user-name"}).find("a")
+        interlocutor_name = chat_link.text
+        interlocutor_id = int(chat_link.get("href").split("/")[-2])
+        nav_bar = parser.find("ul", {"class": "nav navbar-nav navbar-right logged"})
+        active_item = nav_bar.find("li", {"class": "active"})
+        if any(i in active_item.find("a").text.strip() for i in ("Продажи", "Продажі", "Sales")):
+            buyer_id, buyer_username = interlocutor_id, interlocutor_name
+            seller_id, seller_username = account.id, account.username
+        else:
+            buyer_id, buyer_username = account.id, account.username
+            seller_id, seller_username = interlocutor_id, interlocutor_name
+        id1, id2 = sorted([buyer_id, seller_id])
+        chat_id = f"users-{id1}-{id2}"
+        review_obj = parser.find("div", {"class": "order-review"})
+        if not (stars_obj := review_obj.find("div", {"class": "rating"})):
+            stars, text = None, None
+        else:
+            stars = int(stars_obj.find("div").get("class")[0].split("rating")[1])
+            text = review_obj.find("div", {"class": "review-item-text"}).text.strip()
+        hidden = review_obj.find("span", class_="text-warning") is not None
+        if not (reply_obj := review_obj.find("div", {"class": "review-item-answer review-compiled-reply"})):
+            reply = None
+        else:
+            reply = reply_obj.find("div").text.strip()
+
+        if all([not text, not reply]):
+            review = None
+        else:
+            review = types.Review(stars, text, reply, False, str(review_obj) if account.keep_html else None, hidden,
+                                  order_id, buyer_username, buyer_id,
+                                  bool(text and text.endswith(account.bot_character)),
+                                  bool(reply and reply.endswith(account.bot_character)))
+        page.result = types.Order(order_id, status, subcategory, lot_params, buyer_params,
+                                  short_description, full_description, amount,
+                                  sum_, currency, buyer_id, buyer_username, seller_id, seller_username, chat_id,
+                                  html, review, order_secrets)
+        return page
+
+    @staticmethod
+    def __sales_subcategories(account: Account, parser: BeautifulSoup) -> dict[str, types.SubCategory] | None:
+        """
+        :return: подкатегории {"игра, подкатегория": подкатегория} из списка игр страницы продаж
+            или None, если списка на странице нет.
+        """
+        games_options = parser.find("select", attrs={"name": "game"})
+        if not games_options:
+            return None
+        subcategories = dict()
+        games_options = games_options.find_all(lambda x: x.name == "option" and x.get("value"))
+        for game_option in games_options:
+            game_name = game_option.text
+            sections_list = json.loads(game_option.get("data-data"))
+            for key, section_name in sections_list:
+                section_type, section_id = key.split("-")
+                section_type = types.SubCategoryTypes.COMMON if section_type == "lot" else types.SubCategoryTypes.CURRENCY
+                section_id = int(section_id)
+                subcategories[f"{game_name}, {section_name}"] = account.get_subcategory(section_type, section_id)
+        return subcategories
+
+    def sales(self, account: Account, content: bytes | str, first_page: bool,
+              subcategories: dict[str, types.SubCategory] | None,
+              stop_at: Callable[[str, OrderStatuses], bool] | None, exclude_ids: list[str], include_paid: bool,
+              include_closed: bool, include_refunded: bool) -> ParsedPage:
+        parser = self.parse(content)
+        page = ParsedPage()
+        if first_page and not self.authorized(parser):
+            page.authorized = False
+            return page
+
+        next_order_id = parser.find("input", {"type": "hidden", "name": "continue"})
+        next_order_id = next_order_id.get("value") if next_order_id else None
+
+        order_divs = parser.find_all("a", {"class": "tc-item"})
+        rebuilt = False
+        if first_page:
+            page.app_data = json.loads(parser.find("body").get("data-app-data"))
+            if subcategories is None:
+                subcategories, rebuilt = self.__sales_subcategories(account, parser), True
+        if not order_divs:
+            page.result = (None, [], subcategories)
+            return page
+
+        sales = []
+        for div in order_divs:
+            classname = div.get("class")
+            if "warning" in classname:
+                order_status = types.OrderStatuses.REFUNDED
+            elif "info" in classname:
+                order_status = types.OrderStatuses.PAID
+            else:
+                order_status = types.OrderStatuses.CLOSED
+
+            order_id = div.find("div", {"class": "tc-order"}).text[1:]
+            if stop_at is not None and stop_at(order_id, order_status):
+                break
+            if order_id in exclude_ids or \
+                    (order_status == types.OrderStatuses.REFUNDED and not include_refunded) or \
+                    (order_status == types.OrderStatuses.PAID and not include_paid) or \
+                    (order_status == types.OrderStatuses.CLOSED and not include_closed):
+                continue
+
+            description = div.find("div", {"class": "order-desc"}).find("div").text
+            tc_price = div.find("div", {"class": "tc-price"}).text
+            price, currency = tc_price.rsplit(maxsplit=1)
+            price = float(price.replace(" ", ""))
+            currency = parse_currency(currency)
+
+            buyer_div = div.find("div", {"class": "media-user-name"}).find("span")
+            buyer_username = buyer_div.text
+            buyer_id = int(buyer_div.get("data-href")[:-1].split("/users/")[1])
+            subcategory_name = div.find("div", {"class": "text-muted"}).text
+            if not rebuilt and (subcategories is None or subcategory_name not in subcategories):
+                # в переданных подкатегориях нет подкатегории заказа - список игр перечитывается один раз
+                rebuilt = True
+                subcategories = self.__sales_subcategories(account, parser) or subcategories
+            subcategory = None
+            if subcategories:
+                subcategory = subcategories.get(subcategory_name)
+
+            order_date_text = div.find("div", {"class": "tc-date-time"}).text
+            order_date = utils.parse_funpay_datetime(order_date_text)
+            id1, id2 = sorted([buyer_id, account.id])
+            chat_id = f"users-{id1}-{id2}"
+            order_obj = types.OrderShortcut(order_id, description, price, currency, buyer_username, buyer_id, chat_id,
+                                            order_status, order_date, subcategory_name, subcategory,
+                                            str(div) if account.keep_html else None)
+            sales.append(order_obj)
+
+        page.result = (next_order_id, sales, subcategories)
+        return page
+
+    def lot_fields(self, account: Account, content: bytes | str, lot_id: int) -> ParsedPage:
+        bs = self.parse(content)
+        error_message = bs.find("p", class_="lead")
+        if error_message:
+            return ParsedPage(error=error_message.text)
+        bs = bs.find("form", class_="form-offer-editor")
+        result = {}
+        result.update(
+            {field["name"]: field.get("value") or "" for field in bs.find_all("input") if field["name"] != "query"})
+        result.update({field["name"]: field.text or "" for field in bs.find_all("textarea")})
+        result.update({
+            field["name"]: field.find("option", selected=True)["value"]
+            for field in bs.find_all("select") if
+            "hidden" not in field.find_parent(class_="form-group").get("class", [])
+        })
+        result.update({field["name"]: "on" for field in bs.find_all("input", {"type": "checkbox"}, checked=True)})
+        subcategory = account.get_subcategory(SubCategoryTypes.COMMON, int(result.get("node_id", 0)))
+        currency = parse_currency(bs.find("span", class_="form-control-feedback").text)
+        bs_buyer_prices = bs.find("table", class_="table-buyers-prices").find_all("tr")
+        payment_methods = []
+        for i, pm in enumerate(bs_buyer_prices):
+            pm_price, pm_currency = pm.find("td").text.rsplit(maxsplit=1)
+            pm_price = float(pm_price.replace(" ", ""))
+            pm_currency = parse_currency(pm_currency)
+            payment_methods.append(types.PaymentMethod(pm.find("th").text, pm_price, pm_currency, i))
+        calc_result = types.CalcResult(types.SubCategoryTypes.COMMON, subcategory.id, payment_methods,
+                                       float(result["price"]), None, types.Currency.UNKNOWN, currency)
+        db_amount = json.loads(html_module.unescape(bs.get("data-offer"))).get("amount")
+        return ParsedPage(types.LotFields(lot_id, result, subcategory, currency, calc_result, db_amount),
+                          currency=currency)
+
+    def categories(self, account: Account, content: bytes | str) -> ParsedPage:
+        parser = self.parse(content)
+        categories, all_subcategories = [], []
+        page = ParsedPage((categories, all_subcategories))
+        games_table = parser.find_all("div", {"class": "promo-game-list"})
+        if not games_table:
+            return page
+
+        games_table = games_table[1] if len(games_table) > 1 else games_table[0]
+        games_divs = games_table.find_all("div", {"class": "promo-game-item"})
+        if not games_divs:
+            return page
+        game_position = 0
+        subcategory_position = 0
+        for i in games_divs:
+            gid = int(i.find("div", {"class": "game-title"}).get("data-id"))
+            gname = i.find("a").text
+            regional_games = {
+                gid: types.Category(gid, gname, position=game_position)
+            }
+            game_position += 1
+            if regional_divs := i.find("div", {"role": "group"}):
+                for btn in regional_divs.find_all("button"):
+                    regional_game_id = int(btn["data-id"])
+                    regional_games[regional_game_id] = types.Category(regional_game_id, f"{gname} ({btn.text})",
+                                                                      position=game_position)
+                    game_position += 1
+
+            subcategories_divs = i.find_all("ul", {"class": "list-inline"})
+            for j in subcategories_divs:
+                j_game_id = int(j["data-id"])
+                subcategories = j.find_all("li")
+                for k in subcategories:
+                    a = k.find("a")
+                    name, link = a.text, a["href"]
+                    stype = types.SubCategoryTypes.CURRENCY if "chips" in link else types.SubCategoryTypes.COMMON
+                    sid = int(link.split("/")[-2])
+                    sobj = types.SubCategory(sid, name, stype, regional_games[j_game_id], subcategory_position)
+                    subcategory_position += 1
+                    regional_games[j_game_id].add_subcategory(sobj)
+                    all_subcategories.append(sobj)
+
+            categories.extend(regional_games.values())
+        return page
+
+    def chats(self, account: Account, content: bytes | str) -> ParsedPage:
+        parser = self.parse(content)
+        chats = parser.find_all("a", {"class": "contact-item"})
+        chats_objs = []
+
+        for msg in chats:
+            chat_id = int(msg["data-id"])
+            last_msg_text = msg.find("div", {"class": "contact-item-message"}).text
+            unread = True if "unread" in msg.get("class") else False
+            chat_with = msg.find("div", {"class": "media-user-name"}).text
+            node_msg_id = int(msg.get('data-node-msg'))
+            user_msg_id = int(msg.get('data-user-msg'))
+            by_bot = False
+            by_vertex = False
+            is_image = last_msg_text in ("Изображение", "Зображення", "Image")
+            if last_msg_text.startswith(account.bot_character):
+                last_msg_text = last_msg_text[1:]
+                by_bot = True
+            elif last_msg_text.startswith(account.old_bot_character):
+                last_msg_text = last_msg_text[1:]
+                by_vertex = True
+            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread,
+                                          str(msg) if account.keep_html else None)
+            if not is_image:
+                chat_obj.last_by_bot = by_bot
+                chat_obj.last_by_vertex = by_vertex
+
+            chats_objs.append(chat_obj)
+        return ParsedPage(chats_objs)
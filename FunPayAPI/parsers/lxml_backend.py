@@ -0,0 +1,594 @@
+"""
+В данном модуле описан бэкенд разбора страниц FunPay на lxml (XPath выражения компилируются один раз на поток).
+
+Выражения повторяют поиск BeautifulSoup из :mod:`FunPayAPI.parsers.bs4_backend`:
+`find(tag, {"class": name})` - первый потомок с классом name, `find_all` - все потомки в порядке следования.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+import html as html_module
+import json
+import logging
+import threading
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from .base import ParserBackend, ParsedPage
+from .. import types
+from ..common import utils
+from ..common.enums import SubCategoryTypes, OrderStatuses
+from ..common.message_parser import _has_class
+from ..common.utils import parse_currency, RegularExpressions
+
+if TYPE_CHECKING:
+    from ..account import Account
+
+logger = logging.getLogger("FunPayAPI.parsers")
+
+_local = threading.local()
+
+
+def _xpath(expr: str) -> etree.XPath:
+    # скомпилированные XPath не используются одновременно из разных потоков
+    if (xpaths := getattr(_local, "xpaths", None)) is None:
+        xpaths = _local.xpaths = {}
+    if (xpath := xpaths.get(expr)) is None:
+        # smart_strings=False - результаты XPath не хранят ссылки на дерево
+        xpath = xpaths[expr] = etree.XPath(expr, smart_strings=False)
+    return xpath
+
+
+def _all(el, expr: str) -> list:
+    return _xpath(expr)(el)
+
+
+def _find(el, expr: str):
+    """
+    :return: первый найденный элемент или None (аналог BeautifulSoup `find`).
+    """
+    result = _xpath(expr)(el)
+    return result[0] if result else None
+
+
+def _text(el) -> str:
+    """
+    :return: текст элемента вместе с потомками (аналог BeautifulSoup `.text`).
+    """
+    return _xpath("string()")(el)
+
+
+def _text_or_none(el, expr: str) -> str | None:
+    found = _find(el, expr)
+    return _text(found) if found is not None else None
+
+
+def _html(el) -> str:
+    """
+    :return: HTML элемента (аналог `str(tag)` BeautifulSoup).
+    """
+    return etree.tostring(el, method="html", encoding="unicode", with_tail=False)
+
+
+def _classes(el) -> list[str]:
+    return el.get("class", "").split()
+
+
+def _first(tag: str, class_: str | None = None, axis: str = ".//") -> str:
+    """
+    :return: XPath "первый потомок tag с классом class_".
+    """
+    return f"({axis}{tag}[{_has_class(class_)}])[1]" if class_ else f"({axis}{tag})[1]"
+
+
+def _every(tag: str, class_: str, axis: str = ".//") -> str:
+    """
+    :return: XPath "все потомки tag с классом class_".
+    """
+    return f"{axis}{tag}[{_has_class(class_)}]"
+
+
+USER_LINK_NAME = _first("div", "user-link-name", "//")
+BODY = "(//body)[1]"
+OFFERS = _every("a", "tc-item", "//")
+DESC_TEXT = _first("div", "tc-desc-text")
+SERVER = _first("div", "tc-server")
+SIDE = _first("div", "tc-side")
+PRICE = _first("div", "tc-price")
+AMOUNT = _first("div", "tc-amount")
+UNIT = _first("span", "unit")
+FIRST_DIV = _first("div")
+FIRST_SPAN = _first("span")
+FIRST_A = _first("a")
+
+SALES_CHUNK_SIZE = 16 * 1024
+"""Размер части страницы продаж, передаваемой потоковому парсеру (в байтах)."""
+
+
+class LxmlBackend(ParserBackend):
+    """
+    Бэкенд разбора страниц на lxml + XPath.
+    """
+
+    name = "lxml"
+
+    @staticmethod
+    def parse(content: bytes | str):
+        if isinstance(content, bytes):
+            return utils.parse_html(content)
+        return lxml_html.document_fromstring(content)
+
+    @staticmethod
+    def authorized(root) -> bool:
+        return _find(root, USER_LINK_NAME) is not None
+
+    @staticmethod
+    def app_data(root) -> dict | None:
+        try:
+            return json.loads(_find(root, BODY).get("data-app-data"))
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+            return None
+
+    @staticmethod
+    def __amount(offer) -> int | None:
+        tc_amount = _find(offer, AMOUNT)
+        amount = _text(tc_amount).replace(" ", "") if tc_amount is not None else None
+        return int(amount) if amount and amount.isdigit() else None
+
+    @staticmethod
+    def __price(tc_price, subcategory_type: SubCategoryTypes) -> float:
+        if subcategory_type is SubCategoryTypes.COMMON:
+            return float(tc_price.attrib["data-s"])
+        return float(_text(_find(tc_price, FIRST_DIV)).rsplit(maxsplit=1)[0].replace(" ", ""))
+
+    def public_lots(self, account: Account, content: bytes | str, subcategory_type: SubCategoryTypes,
+                    subcategory_id: int) -> ParsedPage:
+        root = self.parse(content)
+        if not self.authorized(root):
+            return ParsedPage(authorized=False)
+        page = ParsedPage([], app_data=self.app_data(root))
+        offers = _all(root, OFFERS)
+        if not offers:
+            return page
+
+        subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
+        sellers = {}
+        currency = None
+        for offer in offers:
+            offer_id = offer.attrib["href"].split("id=")[1]
+            promo = "offer-promo" in _classes(offer)
+            description = _text_or_none(offer, DESC_TEXT)
+            server = _text_or_none(offer, SERVER)
+            side = _text_or_none(offer, SIDE)
+            tc_price = _find(offer, PRICE)
+            price = self.__price(tc_price, subcategory_type)
+            if currency is None:
+                currency = page.currency = parse_currency(_text(_find(tc_price, UNIT)))
+            seller_key = _html(_find(offer, _first("div", "tc-user")))
+            attributes = {k.replace("data-", "", 1): int(v) if v.isdigit() else v for k, v in offer.attrib.items()
+                          if k.startswith("data-")}
+
+            auto = attributes.get("auto") == 1
+            amount = self.__amount(offer)
+            if seller_key not in sellers:
+                online = attributes.get("online") == 1
+                seller_body = _find(offer, _first("div", "media-body"))
+                username = _text(_find(seller_body, _first("div", "media-user-name"))).strip()
+                rating_stars = _find(seller_body, _first("div", "rating-stars"))
+                if rating_stars is not None:
+                    rating_stars = len(_all(rating_stars, _every("i", "fas")))
+                k_reviews = _text_or_none(seller_body, _first("div", "media-user-reviews"))
+                if k_reviews is not None:
+                    k_reviews = "".join([i for i in k_reviews if i.isdigit()])
+                k_reviews = int(k_reviews) if k_reviews else 0
+                user_id = int(_find(seller_body, _first("span", "pseudo-a")).attrib["data-href"].split("/")[-2])
+                seller = sellers[seller_key] = types.SellerShortcut(
+                    user_id, username, online, rating_stars, k_reviews, seller_key if account.keep_html else None)
+            else:
+                seller = sellers[seller_key]
+            for i in ("online", "auto"):
+                if i in attributes:
+                    del attributes[i]
+
+            page.result.append(types.LotShortcut(offer_id, server, side, description, amount, price, currency,
+                                                 subcategory_obj, seller, auto, promo, attributes,
+                                                 _html(offer) if account.keep_html else None))
+        return page
+
+    def my_lots(self, account: Account, content: bytes | str, subcategory_id: int) -> ParsedPage:
+        root = self.parse(content)
+        if not self.authorized(root):
+            return ParsedPage(authorized=False)
+        page = ParsedPage([], app_data=self.app_data(root))
+        offers = _all(root, OFFERS)
+        if not offers:
+            return page
+
+        subcategory_obj = account.get_subcategory(SubCategoryTypes.COMMON, subcategory_id)
+        currency = None
+        for offer in offers:
+            offer_id = offer.attrib["data-offer"]
+            description = _text_or_none(offer, DESC_TEXT)
+            server = _text_or_none(offer, SERVER)
+            side = _text_or_none(offer, SIDE)
+            tc_price = _find(offer, PRICE)
+            price = float(tc_price.attrib["data-s"])
+            if currency is None:
+                currency = page.currency = parse_currency(_text(_find(tc_price, UNIT)))
+            auto = _find(tc_price, _first("i", "auto-dlv-icon")) is not None
+            amount = self.__amount(offer)
+            active = "warning" not in _classes(offer)
+            page.result.append(types.MyLotShortcut(offer_id, server, side, description, amount, price, currency,
+                                                   subcategory_obj, auto, active,
+                                                   _html(offer) if account.keep_html else None))
+        return page
+
+    def user_profile(self, account: Account, content: bytes | str, user_id: int, html: str) -> ParsedPage:
+        root = self.parse(content)
+        if not self.authorized(root):
+            return ParsedPage(authorized=False)
+        page = ParsedPage(app_data=self.app_data(root))
+
+        username = _text(_find(root, _first("span", "mr4", "//")))
+        user_status = _text_or_none(root, _first("span", "media-user-status", "//")) or ""
+        avatar_link = _find(root, _first("div", "avatar-photo", "//")).get("style").split("(")[1].split(")")[0]
+        avatar_link = avatar_link if avatar_link.startswith("https") else f"https://funpay.com{avatar_link}"
+        banned = _find(root, '(//span[normalize-space(@class)="label label-danger"])[1]') is not None
+        user_obj = page.result = types.UserProfile(user_id, username, avatar_link,
+                                                   "Онлайн" in user_status or "Online" in user_status, banned, html)
+
+        for i in _all(root, _every("div", "offer-list-title-container", "//")):
+            subcategory_link = _find(_find(i, _first("h3")), FIRST_A).get("href")
+            subcategory_id = int(subcategory_link.split("/")[-2])
+            subcategory_type = SubCategoryTypes.CURRENCY if "chips" in subcategory_link else SubCategoryTypes.COMMON
+            subcategory_obj = account.get_subcategory(subcategory_type, subcategory_id)
+            if not subcategory_obj:
+                continue
+
+            currency = None
+            for j in _all(i.getparent(), _every("a", "tc-item")):
+                offer_id = j.attrib["href"].split("id=")[1]
+                description = _text_or_none(j, DESC_TEXT)
+                server = _text_or_none(j, SERVER)
+                side = _text_or_none(j, SIDE)
+                auto = _find(j, _first("i", "auto-dlv-icon")) is not None
+                tc_price = _find(j, PRICE)
+                amount = self.__amount(j)
+                price = self.__price(tc_price, subcategory_obj.type)
+                if currency is None:
+                    currency = page.currency = parse_currency(_text(_find(tc_price, UNIT)))
+                user_obj.add_lot(types.LotShortcut(offer_id, server, side, description, amount, price, currency,
+                                                   subcategory_obj, None, auto, None, None,
+                                                   _html(j) if account.keep_html else None))
+        return page
+
+    def order(self, account: Account, content: bytes | str, order_id: str, html: str) -> ParsedPage:
+        root = self.parse(content)
+        if not self.authorized(root):
+            return ParsedPage(authorized=False)
+        page = ParsedPage(app_data=self.app_data(root))
+
+        if _text_or_none(root, _first("span", "text-warning", "//")) in ("Возврат", "Повернення", "Refund"):
+            status = types.OrderStatuses.REFUNDED
+        elif _text_or_none(root, _first("span", "text-success", "//")) in ("Закрыт", "Закрито", "Closed"):
+            status = types.OrderStatuses.CLOSED
+        else:
+            status = types.OrderStatuses.PAID
+
+        short_description = None
+        full_description = None
+        sum_ = None
+        currency = types.Currency.UNKNOWN
+        subcategory = None
+        order_secrets = []
+        stop_params = False
+        lot_params = []
+        buyer_params = {}
+
+        amount = 1
+        for div in _all(root, _every("div", "param-item", "//")):
+            if (h := _text_or_none(div, _first("h5"))) is None:
+                continue
+            if not stop_params and _find(div, "(preceding::hr)[1]") is not None:
+                stop_params = True
+
+            if h in ("Краткое описание", "Короткий опис", "Short description"):
+                stop_params = True
+                short_description = _text(_find(div, FIRST_DIV))
+            elif h in ("Подробное описание", "Докладний опис", "Detailed description"):
+                stop_params = True
+                full_description = _text(_find(div, FIRST_DIV))
+            elif h in ("Сумма", "Сума", "Total"):
+                sum_ = float(_text(_find(div, FIRST_SPAN)).replace(" ", ""))
+                currency = parse_currency(_text(_find(div, _first("strong"))))
+            elif h in ("Категория", "Категорія", "Category",
+                       "Валюта", "Currency"):
+                subcategory_link = _find(div, FIRST_A).get("href")
+                subcategory_id = int(subcategory_link.split("/")[-2])
+                subcategory_type = SubCategoryTypes.COMMON if "lots" in subcategory_link else \
+                    SubCategoryTypes.CURRENCY
+                subcategory = account.get_subcategory(subcategory_type, subcategory_id)
+            elif h in ("Оплаченный товар", "Оплаченные товары",
+                       "Оплачений товар", "Оплачені товари",
+                       "Paid product", "Paid products"):
+                order_secrets = [_text(i) for i in _all(div, _every("span", "secret-placeholder"))]
+            elif h in ("Количество", "Amount", "Кількість"):
+                if (text := _text_or_none(div, _first("div", "text-bold"))) is not None:
+                    match = RegularExpressions().PRODUCTS_AMOUNT_ORDER.fullmatch(text)
+                    if match:
+                        amount = int(match.group(1).replace(" ", ""))
+            elif h in ("Відкрито", "Открыт", "Open"):
+                continue  # todo
+            elif h in ("Закрито", "Закрыт", "Closed"):
+                continue  # todo
+            elif not stop_params and h not in ("Игра", "Гра", "Game"):
+                if (text := _text_or_none(div, FIRST_DIV)) is not None:
+                    lot_params.append((h, text.strip()))
+            elif stop_params:
+                if (text := _text_or_none(div, _first("div", "text-bold"))) is not None:
+                    buyer_params[h] = text
+        if not stop_params:
+            lot_params = []
+
+        chat = _find(root, _first("div", "chat-header", "//"))
+        chat_link = _find(_find(chat, _first("div", "media-user-name")), FIRST_A)
+        interlocutor_name = _text(chat_link)
+        interlocutor_id = int(chat_link.get("href").split("/")[-2])
+        nav_bar = _find(root, '(//ul[normalize-space(@class)="nav navbar-nav navbar-right logged"])[1]')
+        active_item = _find(nav_bar, _first("li", "active"))
+        if any(i in _text(_find(active_item, FIRST_A)).strip() for i in ("Продажи", "Продажі", "Sales")):
+            buyer_id, buyer_username = interlocutor_id, interlocutor_name
+            seller_id, seller_username = account.id, account.username
+        else:
+            buyer_id, buyer_username = account.id, account.username
+            seller_id, seller_username = interlocutor_id, interlocutor_name
+        id1, id2 = sorted([buyer_id, seller_id])
+        chat_id = f"users-{id1}-{id2}"
+        review_obj = _find(root, _first("div", "order-review", "//"))
+        if (stars_obj := _find(review_obj, _first("div", "rating"))) is None:
+            stars, text = None, None
+        else:
+            stars = int(_classes(_find(stars_obj, FIRST_DIV))[0].split("rating")[1])
+            text = _text(_find(review_obj, _first("div", "review-item-text"))).strip()
+        hidden = _find(review_obj, _first("span", "text-warning")) is not None
+        reply_obj = _find(review_obj, '(.//div[normalize-space(@class)="review-item-answer review-compiled-reply"])[1]')
+        reply = _text(_find(reply_obj, FIRST_DIV)).strip() if reply_obj is not None else None
+
+        if all([not text, not reply]):
+            review = None
+        else:
+            review = types.Review(stars, text, reply, False, _html(review_obj) if account.keep_html else None, hidden,
+                                  order_id, buyer_username, buyer_id,
+                                  bool(text and text.endswith(account.bot_character)),
+                                  bool(reply and reply.endswith(account.bot_character)))
+        page.result = types.Order(order_id, status, subcategory, lot_params, buyer_params,
+                                  short_description, full_description, amount,
+                                  sum_, currency, buyer_id, buyer_username, seller_id, seller_username, chat_id,
+                                  html, review, order_secrets)
+        return page
+
+    @staticmethod
+    def __sales_subcategories(account: Account, root) -> dict[str, types.SubCategory] | None:
+        """
+        :return: подкатегории {"игра, подкатегория": подкатегория} из списка игр страницы продаж
+            или None, если списка на странице нет.
+        """
+        games_options = _find(root, '(//select[@name="game"])[1]')
+        if games_options is None:
+            return None
+        subcategories = dict()
+        for game_option in _all(games_options, './/option[@value != ""]'):
+            game_name = _text(game_option)
+            for key, section_name in json.loads(game_option.get("data-data")):
+                section_type, section_id = key.split("-")
+                section_type = SubCategoryTypes.COMMON if section_type == "lot" else SubCategoryTypes.CURRENCY
+                subcategories[f"{game_name}, {section_name}"] = account.get_subcategory(section_type,
+                                                                                        int(section_id))
+        return subcategories
+
+    def sales(self, account: Account, content: bytes | str, first_page: bool,
+              subcategories: dict[str, types.SubCategory] | None,
+              stop_at: Callable[[str, OrderStatuses], bool] | None, exclude_ids: list[str], include_paid: bool,
+              include_closed: bool, include_refunded: bool) -> ParsedPage:
+        # строки заказов разбираются по мере чтения страницы: при срабатывании stop_at остаток страницы
+        # не разбирается, а уже разобранные строки очищаются
+        page = ParsedPage()
+        parser = etree.HTMLPullParser(events=("end",), tag="a", encoding="utf-8")
+        view = memoryview(content if isinstance(content, bytes) else content.encode())
+        root = None
+        rebuilt = False
+        stopped = False
+        sales = []
+        for i in range(0, len(view), SALES_CHUNK_SIZE):
+            parser.feed(view[i:i + SALES_CHUNK_SIZE].tobytes())
+            for _, div in parser.read_events():
+                if "tc-item" not in _classes(div):
+                    continue
+                if root is None:
+                    # шапка страницы (данные аккаунта, список игр) уже прочитана
+                    root = div.getroottree().getroot()
+                    if first_page:
+                        if not self.authorized(root):
+                            page.authorized = False
+                            return page
+                        page.app_data = json.loads(_find(root, BODY).get("data-app-data"))
+                        if subcategories is None:
+                            subcategories, rebuilt = self.__sales_subcategories(account, root), True
+
+                result = self.__sale(account, div, subcategories, stop_at, exclude_ids, include_paid,
+                                     include_closed, include_refunded)
+                if result is None:
+                    stopped = True
+                    break
+                elif result is not False:
+                    if not rebuilt and (subcategories is None or result.subcategory_name not in subcategories):
+                        # в переданных подкатегориях нет подкатегории заказа - список игр перечитывается один раз
+                        rebuilt = True
+                        subcategories = self.__sales_subcategories(account, root) or subcategories
+                        result.subcategory = subcategories.get(result.subcategory_name) if subcategories else None
+                    sales.append(result)
+                div.clear()
+            if stopped:
+                break
+        if root is None:
+            # на странице нет заказов
+            root = parser.close()
+            if first_page:
+                if not self.authorized(root):
+                    page.authorized = False
+                    return page
+                page.app_data = json.loads(_find(root, BODY).get("data-app-data"))
+                if subcategories is None:
+                    subcategories = self.__sales_subcategories(account, root)
+            page.result = (None, [], subcategories)
+            return page
+        parser.close()
+
+        # при остановке по stop_at поле "continue" может быть еще не прочитано
+        next_order_id = _find(root, '(//input[@type="hidden" and @name="continue"])[1]')
+        next_order_id = next_order_id.get("value") if next_order_id is not None else None
+        page.result = (next_order_id, sales, subcategories)
+        return page
+
+    @staticmethod
+    def __sale(account: Account, div, subcategories: dict[str, types.SubCategory] | None,
+               stop_at: Callable[[str, OrderStatuses], bool] | None, exclude_ids: list[str], include_paid: bool,
+               include_closed: bool, include_refunded: bool) -> types.OrderShortcut | bool | None:
+        """
+        Разбирает строку заказа страницы продаж.
+
+        :return: заказ, False - если заказ отфильтрован, None - если сработал stop_at.
+        """
+        classname = _classes(div)
+        if "warning" in classname:
+            order_status = types.OrderStatuses.REFUNDED
+        elif "info" in classname:
+            order_status = types.OrderStatuses.PAID
+        else:
+            order_status = types.OrderStatuses.CLOSED
+
+        order_id = _text(_find(div, _first("div", "tc-order")))[1:]
+        if stop_at is not None and stop_at(order_id, order_status):
+            return None
+        if order_id in exclude_ids or \
+                (order_status == types.OrderStatuses.REFUNDED and not include_refunded) or \
+                (order_status == types.OrderStatuses.PAID and not include_paid) or \
+                (order_status == types.OrderStatuses.CLOSED and not include_closed):
+            return False
+
+        description = _text(_find(_find(div, _first("div", "order-desc")), FIRST_DIV))
+        price, currency = _text(_find(div, PRICE)).rsplit(maxsplit=1)
+        price = float(price.replace(" ", ""))
+        currency = parse_currency(currency)
+
+        buyer_div = _find(_find(div, _first("div", "media-user-name")), FIRST_SPAN)
+        buyer_username = _text(buyer_div)
+        buyer_id = int(buyer_div.get("data-href")[:-1].split("/users/")[1])
+        subcategory_name = _text(_find(div, _first("div", "text-muted")))
+        subcategory = subcategories.get(subcategory_name) if subcategories else None
+
+        order_date = utils.parse_funpay_datetime(_text(_find(div, _first("div", "tc-date-time"))))
+        id1, id2 = sorted([buyer_id, account.id])
+        chat_id = f"users-{id1}-{id2}"
+        return types.OrderShortcut(order_id, description, price, currency, buyer_username, buyer_id,
+                                   chat_id, order_status, order_date, subcategory_name, subcategory,
+                                   _html(div) if account.keep_html else None)
+
+    def lot_fields(self, account: Account, content: bytes | str, lot_id: int) -> ParsedPage:
+        root = self.parse(content)
+        if (error_message := _text_or_none(root, _first("p", "lead", "//"))) is not None:
+            return ParsedPage(error=error_message)
+        form = _find(root, _first("form", "form-offer-editor", "//"))
+        result = {}
+        result.update({field.attrib["name"]: field.get("value") or "" for field in _all(form, ".//input")
+                       if field.attrib["name"] != "query"})
+        result.update({field.attrib["name"]: _text(field) or "" for field in _all(form, ".//textarea")})
+        result.update({
+            field.attrib["name"]: _find(field, "(.//option[@selected])[1]").attrib["value"]
+            for field in _all(form, ".//select")
+            if "hidden" not in _classes(_find(field, f"ancestor::*[{_has_class('form-group')}][1]"))
+        })
+        result.update({field.attrib["name"]: "on"
+                       for field in _all(form, './/input[@type="checkbox" and @checked]')})
+        subcategory = account.get_subcategory(SubCategoryTypes.COMMON, int(result.get("node_id", 0)))
+        currency = parse_currency(_text(_find(form, _first("span", "form-control-feedback"))))
+        payment_methods = []
+        for i, pm in enumerate(_all(_find(form, _first("table", "table-buyers-prices")), ".//tr")):
+            pm_price, pm_currency = _text(_find(pm, "(.//td)[1]")).rsplit(maxsplit=1)
+            pm_price = float(pm_price.replace(" ", ""))
+            pm_currency = parse_currency(pm_currency)
+            payment_methods.append(types.PaymentMethod(_text(_find(pm, "(.//th)[1]")), pm_price, pm_currency, i))
+        calc_result = types.CalcResult(types.SubCategoryTypes.COMMON, subcategory.id, payment_methods,
+                                       float(result["price"]), None, types.Currency.UNKNOWN, currency)
+        db_amount = json.loads(html_module.unescape(form.get("data-offer"))).get("amount")
+        return ParsedPage(types.LotFields(lot_id, result, subcategory, currency, calc_result, db_amount),
+                          currency=currency)
+
+    def categories(self, account: Account, content: bytes | str) -> ParsedPage:
+        root = self.parse(content)
+        categories, all_subcategories = [], []
+        page = ParsedPage((categories, all_subcategories))
+        games_table = _all(root, _every("div", "promo-game-list", "//"))
+        if not games_table:
+            return page
+
+        games_table = games_table[1] if len(games_table) > 1 else games_table[0]
+        game_position = 0
+        subcategory_position = 0
+        for i in _all(games_table, _every("div", "promo-game-item")):
+            gid = int(_find(i, _first("div", "game-title")).get("data-id"))
+            gname = _text(_find(i, FIRST_A))
+            regional_games = {
+                gid: types.Category(gid, gname, position=game_position)
+            }
+            game_position += 1
+            if (regional_divs := _find(i, '(.//div[@role="group"])[1]')) is not None:
+                for btn in _all(regional_divs, ".//button"):
+                    regional_game_id = int(btn.attrib["data-id"])
+                    regional_games[regional_game_id] = types.Category(regional_game_id, f"{gname} ({_text(btn)})",
+                                                                      position=game_position)
+                    game_position += 1
+
+            for j in _all(i, _every("ul", "list-inline")):
+                j_game_id = int(j.attrib["data-id"])
+                for k in _all(j, ".//li"):
+                    a = _find(k, FIRST_A)
+                    name, link = _text(a), a.attrib["href"]
+                    stype = SubCategoryTypes.CURRENCY if "chips" in link else SubCategoryTypes.COMMON
+                    sid = int(link.split("/")[-2])
+                    sobj = types.SubCategory(sid, name, stype, regional_games[j_game_id], subcategory_position)
+                    subcategory_position += 1
+                    regional_games[j_game_id].add_subcategory(sobj)
+                    all_subcategories.append(sobj)
+
+            categories.extend(regional_games.values())
+        return page
+
+    def chats(self, account: Account, content: bytes | str) -> ParsedPage:
+        root = self.parse(content)
+        chats_objs = []
+        for msg in _all(root, _every("a", "contact-item", "//")):
+            chat_id = int(msg.attrib["data-id"])
+            last_msg_text = _text(_find(msg, _first("div", "contact-item-message")))
+            unread = "unread" in _classes(msg)
+            chat_with = _text(_find(msg, _first("div", "media-user-name")))
+            node_msg_id = int(msg.get("data-node-msg"))
+            user_msg_id = int(msg.get("data-user-msg"))
+            by_bot = False
+            by_vertex = False
+            is_image = last_msg_text in ("Изображение", "Зображення", "Image")
+            if last_msg_text.startswith(account.bot_character):
+                last_msg_text = last_msg_text[1:]
+                by_bot = True
+            elif last_msg_text.startswith(account.old_bot_character):
+                last_msg_text = last_msg_text[1:]
+                by_vertex = True
+            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread,
+                                          _html(msg) if account.keep_html else None)
+            if not is_image:
+                chat_obj.last_by_bot = by_bot
+                chat_obj.last_by_vertex = by_vertex
+            chats_objs.append(chat_obj)
+        return ParsedPage(chats_objs)
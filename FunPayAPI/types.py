@@ -4,10 +4,12 @@
 from __future__ import annotations
 
 import re
+import threading
+from concurrent.futures import Future
 from typing import Literal, overload, Optional
 
 import FunPayAPI.common.enums
-from .common.utils import RegularExpressions
+from .common.utils import RegularExpressions, MessageTypeClassifier
 from .common.enums import MessageTypes, OrderStatuses, SubCategoryTypes, Currency
 import datetime
 
@@ -16,6 +18,7 @@ class BaseOrderInfo:
     """
     Класс, представляющий информацию о заказе.
     """
+    _order_lock = threading.Lock()
 
     def __init__(self):
         self._order: Order | None = None
@@ -24,6 +27,33 @@ class BaseOrderInfo:
         """Пытались ли уже получить заказ?"""
         self._order_attempt_error: bool = False
         """Возникла ли ошибка при получении заказа?"""
+        self._order_future: Future | None = None
+        """Future с результатом получения заказа (None, если получение еще не начиналось)."""
+
+    def _start_order_attempt(self) -> bool:
+        """
+        Помечает начало получения заказа.
+
+        :return: `True`, если получение начато текущим вызовом, `False`, если заказ уже получается / получен.
+        :rtype: :obj:`bool`
+        """
+        with BaseOrderInfo._order_lock:
+            if self._order_future is not None:
+                return False
+            self._order_future = Future()
+            self._order_attempt_made = True
+            return True
+
+    def _finish_order_attempt(self, order: Order | None):
+        """
+        Сохраняет результат получения заказа и будит всех, кто его ожидает.
+
+        :param order: объект заказа или None, если получить заказ не удалось.
+        :type order: :class:`FunPayAPI.types.Order` or :obj:`None`
+        """
+        self._order = order
+        self._order_attempt_error = order is None
+        self._order_future.set_result(order)
 
 
 class ChatShortcut(BaseOrderInfo):
@@ -43,14 +73,14 @@ class ChatShortcut(BaseOrderInfo):
     :type unread: :obj:`bool`
 
     :param html: HTML код виджета чата.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
 
     :param determine_msg_type: определять ли тип последнего сообщения?
     :type determine_msg_type: :obj:`bool`, опционально
     """
 
     def __init__(self, id_: int, name: str, last_message_text: str, node_msg_id: int, user_msg_id: int,
-                 unread: bool, html: str, determine_msg_type: bool = True):
+                 unread: bool, html: str | None, determine_msg_type: bool = True):
         self.id: int = id_
         """ID чата."""
         self.name: str | None = name if name else None
@@ -69,13 +99,14 @@ class ChatShortcut(BaseOrderInfo):
         """ID последнего прочитанного сообщения."""
         self.last_message_type: MessageTypes | None = None if not determine_msg_type else self.get_last_message_type()
         """Тип последнего сообщения."""
-        self.html: str = html
-        """HTML код виджета чата."""
+        self.html: str | None = html
+        """HTML код виджета чата (None, если HTML не сохраняется, см. Account.keep_html)."""
         BaseOrderInfo.__init__(self)
 
     def get_last_message_type(self) -> MessageTypes:
         """
-        Определяет тип последнего сообщения в чате на основе регулярных выражений из MessageTypesRes.
+        Определяет тип последнего сообщения в чате на основе регулярных выражений из RegularExpressions
+        (см. :class:`FunPayAPI.common.utils.MessageTypeClassifier`).
 
         !Внимание! Результат определения типа сообщения данным методом не является правильным в 100% случаев, т.к. он
         основан на сравнении с регулярными выражениями.
@@ -85,40 +116,7 @@ class ChatShortcut(BaseOrderInfo):
         :return: тип последнего сообщения.
         :rtype: :class:`FunPayAPI.common.enums.MessageTypes`
         """
-        res = RegularExpressions()
-        if res.DISCORD.search(self.last_message_text):
-            return MessageTypes.DISCORD
-
-        if res.DEAR_VENDORS.search(self.last_message_text):
-            return MessageTypes.DEAR_VENDORS
-
-        if res.ORDER_PURCHASED.findall(self.last_message_text) and res.ORDER_PURCHASED2.findall(self.last_message_text):
-            return MessageTypes.ORDER_PURCHASED
-
-        if res.ORDER_ID.search(self.last_message_text) is None:
-            return MessageTypes.NON_SYSTEM
-
-        # Регулярные выражения выставлены в порядке от самых часто-используемых к самым редко-используемым
-        sys_msg_types = {
-            MessageTypes.ORDER_CONFIRMED: res.ORDER_CONFIRMED,
-            MessageTypes.NEW_FEEDBACK: res.NEW_FEEDBACK,
-            MessageTypes.NEW_FEEDBACK_ANSWER: res.NEW_FEEDBACK_ANSWER,
-            MessageTypes.FEEDBACK_CHANGED: res.FEEDBACK_CHANGED,
-            MessageTypes.FEEDBACK_DELETED: res.FEEDBACK_DELETED,
-            MessageTypes.REFUND: res.REFUND,
-            MessageTypes.FEEDBACK_ANSWER_CHANGED: res.FEEDBACK_ANSWER_CHANGED,
-            MessageTypes.FEEDBACK_ANSWER_DELETED: res.FEEDBACK_ANSWER_DELETED,
-            MessageTypes.ORDER_CONFIRMED_BY_ADMIN: res.ORDER_CONFIRMED_BY_ADMIN,
-            MessageTypes.PARTIAL_REFUND: res.PARTIAL_REFUND,
-            MessageTypes.ORDER_REOPENED: res.ORDER_REOPENED,
-            MessageTypes.REFUND_BY_ADMIN: res.REFUND_BY_ADMIN
-        }
-
-        for i in sys_msg_types:
-            if sys_msg_types[i].search(self.last_message_text):
-                return i
-        else:
-            return MessageTypes.NON_SYSTEM
+        return MessageTypeClassifier().classify(self.last_message_text)
 
     def __str__(self):
         return self.last_message_text
@@ -179,14 +177,14 @@ class Chat:
     :type looking_text: :obj:`str` or :obj:`None`
 
     :param html: HTML код чата.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
 
     :param messages: последние 100 сообщений чата.
     :type messages: :obj:`list` of :class:`FunPayAPI.types.Message` or :obj:`None`
     """
 
     def __init__(self, id_: int, name: str, looking_link: str | None, looking_text: str | None,
-                 html: str, messages: Optional[list[Message]] = None):
+                 html: str | None, messages: Optional[list[Message]] = None):
         self.id: int = id_
         """ID чата."""
         self.name: str = name
@@ -195,8 +193,8 @@ class Chat:
         """Ссылка на лот, который в данный момент смотрит собеседник."""
         self.looking_text: str | None = looking_text
         """Название лота, который в данный момент смотрит собеседник."""
-        self.html: str = html
-        """HTML код чата."""
+        self.html: str | None = html
+        """HTML код чата (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.messages: list[Message] = messages or []
         """Последние 100 сообщений чата."""
 
@@ -224,7 +222,7 @@ class Message(BaseOrderInfo):
     :type author_id: :obj:`int`
 
     :param html: HTML код сообщения.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
 
     :param image_link: ссылка на изображение из сообщения (если есть).
     :type image_link: :obj:`str` or :obj:`None`, опционально
@@ -235,7 +233,7 @@ class Message(BaseOrderInfo):
 
     def __init__(self, id_: int, text: str | None, chat_id: int | str, chat_name: str | None,
                  interlocutor_id: int | None,
-                 author: str | None, author_id: int, html: str,
+                 author: str | None, author_id: int, html: str | None,
                  image_link: str | None = None, image_name: str | None = None,
                  determine_msg_type: bool = True, badge_text: Optional[str] = None, tag: Optional[str] = None):
         self.id: int = id_
@@ -256,8 +254,8 @@ class Message(BaseOrderInfo):
         """Автор сообщения."""
         self.author_id: int = author_id
         """ID автора сообщения."""
-        self.html: str = html
-        """HTML-код сообщения."""
+        self.html: str | None = html
+        """HTML-код сообщения (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.image_link: str | None = image_link
         """Ссылка на изображение в сообщении (если оно есть)."""
         self.image_name: str | None = image_name
@@ -292,7 +290,8 @@ class Message(BaseOrderInfo):
 
     def get_message_type(self) -> MessageTypes:
         """
-        Определяет тип сообщения на основе регулярных выражений из MessageTypesRes.
+        Определяет тип сообщения на основе регулярных выражений из RegularExpressions
+        (см. :class:`FunPayAPI.common.utils.MessageTypeClassifier`).
 
         Внимание! Данный способ определения типа сообщения не является 100% правильным, т.к. он основан на сравнении с
         регулярными выражениями. Возможно ложное "срабатывание", если пользователь напишет "поддельное" сообщение,
@@ -302,42 +301,7 @@ class Message(BaseOrderInfo):
         :return: тип последнего сообщения в чате.
         :rtype: :class:`FunPayAPI.common.enums.MessageTypes`
         """
-        if not self.text:
-            return MessageTypes.NON_SYSTEM
-
-        res = RegularExpressions()
-        if res.DISCORD.search(self.text):
-            return MessageTypes.DISCORD
-        if res.DEAR_VENDORS.search(self.text):
-            return MessageTypes.DEAR_VENDORS
-
-        if res.ORDER_PURCHASED.findall(self.text) and res.ORDER_PURCHASED2.findall(self.text):
-            return MessageTypes.ORDER_PURCHASED
-
-        if res.ORDER_ID.search(self.text) is None:
-            return MessageTypes.NON_SYSTEM
-
-        # Регулярные выражения выставлены в порядке от самых часто-используемых к самым редко-используемым
-        sys_msg_types = {
-            MessageTypes.ORDER_CONFIRMED: res.ORDER_CONFIRMED,
-            MessageTypes.NEW_FEEDBACK: res.NEW_FEEDBACK,
-            MessageTypes.NEW_FEEDBACK_ANSWER: res.NEW_FEEDBACK_ANSWER,
-            MessageTypes.FEEDBACK_CHANGED: res.FEEDBACK_CHANGED,
-            MessageTypes.FEEDBACK_DELETED: res.FEEDBACK_DELETED,
-            MessageTypes.REFUND: res.REFUND,
-            MessageTypes.FEEDBACK_ANSWER_CHANGED: res.FEEDBACK_ANSWER_CHANGED,
-            MessageTypes.FEEDBACK_ANSWER_DELETED: res.FEEDBACK_ANSWER_DELETED,
-            MessageTypes.ORDER_CONFIRMED_BY_ADMIN: res.ORDER_CONFIRMED_BY_ADMIN,
-            MessageTypes.PARTIAL_REFUND: res.PARTIAL_REFUND,
-            MessageTypes.ORDER_REOPENED: res.ORDER_REOPENED,
-            MessageTypes.REFUND_BY_ADMIN: res.REFUND_BY_ADMIN
-        }
-
-        for i in sys_msg_types:
-            if sys_msg_types[i].search(self.text):
-                return i
-        else:
-            return MessageTypes.NON_SYSTEM
+        return MessageTypeClassifier().classify(self.text)
 
     def __str__(self):
         return self.text if self.text is not None else self.image_link if self.image_link is not None else ""
@@ -381,7 +345,7 @@ class OrderShortcut(BaseOrderInfo):
     :type subcategory: :class:`FunPayAPI.types.SubCategory` or :obj:`None`
 
     :param html: HTML код виджета заказа.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
 
     :param dont_search_amount: не искать кол-во товара.
     :type dont_search_amount: :obj:`bool`, опционально
@@ -390,7 +354,7 @@ class OrderShortcut(BaseOrderInfo):
     def __init__(self, id_: str, description: str, price: float, currency: Currency,
                  buyer_username: str, buyer_id: int, chat_id: int | str, status: OrderStatuses,
                  date: datetime.datetime, subcategory_name: str, subcategory: SubCategory | None,
-                 html: str, dont_search_amount: bool = False):
+                 html: str | None, dont_search_amount: bool = False):
         self.id: str = id_ if not id_.startswith("#") else id_[1:]
         """ID заказа."""
         self.description: str = description
@@ -415,8 +379,8 @@ class OrderShortcut(BaseOrderInfo):
         """Название подкатегории, к которой относится заказ."""
         self.subcategory: SubCategory | None = subcategory
         """Подкатегория, к которой относится заказ."""
-        self.html: str = html
-        """HTML код виджета заказа."""
+        self.html: str | None = html
+        """HTML код виджета заказа (None, если HTML не сохраняется, см. Account.keep_html)."""
         BaseOrderInfo.__init__(self)
 
     def parse_amount(self) -> int:
@@ -480,7 +444,7 @@ class Order:
     :type chat_id: :obj:`int` or :obj:`str`
 
     :param html: HTML код заказа.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
 
     :param review: объект отзыва на заказ.
     :type review: :class:`FunPayAPI.types.Review` or :obj:`None`
@@ -494,7 +458,7 @@ class Order:
                  full_description: str | None, amount: int, sum_: float, currency: Currency,
                  buyer_id: int, buyer_username: str,
                  seller_id: int, seller_username: str, chat_id: str | int,
-                 html: str, review: Review | None, order_secrets: list[str]):
+                 html: str | None, review: Review | None, order_secrets: list[str]):
         self.id: str = id_ if not id_.startswith("#") else id_[1:]
         """ID заказа."""
         self.status: OrderStatuses = status
@@ -525,8 +489,8 @@ class Order:
         """Никнейм продавца."""
         self.chat_id: str | int = chat_id
         """ID чата."""
-        self.html: str = html
-        """HTML код заказа."""
+        self.html: str | None = html
+        """HTML код заказа (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.review: Review | None = review
         """Объект отзыва заказа."""
         self.amount: int = amount
@@ -1003,7 +967,7 @@ class SellerShortcut:
     """
 
     def __init__(self, id_: int, username: str, online: bool, stars: None | int, reviews: int,
-                 html: str):
+                 html: str | None):
         self.id: int = id_
         """ID пользователя."""
         self.username: str = username
@@ -1014,8 +978,8 @@ class SellerShortcut:
         """Количество звезд."""
         self.reviews: int = reviews
         """Количество отзывов."""
-        self.html: str = html
-        """HTML код страницы пользователя."""
+        self.html: str | None = html
+        """HTML код страницы пользователя (None, если HTML не сохраняется, см. Account.keep_html)."""
 
     @property
     def link(self):
@@ -1048,14 +1012,14 @@ class LotShortcut:
     :type subcategory: :class:`FunPayAPI.types.SubCategory`
 
     :param html: HTML код виджета лота.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
     """
 
     def __init__(self, id_: int | str, server: str | None, side: str | None,
                  description: str | None, amount: int | None, price: float, currency: Currency,
                  subcategory: SubCategory | None,
                  seller: SellerShortcut | None, auto: bool, promo: bool | None, attributes: dict[str, int | str] | None,
-                 html: str):
+                 html: str | None):
         self.id: int | str = id_
         if isinstance(self.id, str) and self.id.isnumeric():
             self.id = int(self.id)
@@ -1084,8 +1048,8 @@ class LotShortcut:
         """Атрибуты лота (только для лотов из таблицы)"""
         self.subcategory: SubCategory = subcategory
         """Подкатегория лота."""
-        self.html: str = html
-        """HTML-код виджета лота."""
+        self.html: str | None = html
+        """HTML-код виджета лота (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.public_link: str = f"https://funpay.com/chips/offer?id={self.id}" \
             if self.subcategory.type is SubCategoryTypes.CURRENCY else f"https://funpay.com/lots/offer?id={self.id}"
         """Публичная ссылка на лот."""
@@ -1117,13 +1081,13 @@ class MyLotShortcut:
     :type subcategory: :class:`FunPayAPI.types.SubCategory`
 
     :param html: HTML код виджета лота.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
     """
 
     def __init__(self, id_: int | str, server: str | None, side: str | None,
                  description: str | None, amount: int | None, price: float, currency: Currency,
                  subcategory: SubCategory | None, auto: bool, active: bool,
-                 html: str):
+                 html: str | None):
         self.id: int | str = id_
         if isinstance(self.id, str) and self.id.isnumeric():
             self.id = int(self.id)
@@ -1148,8 +1112,8 @@ class MyLotShortcut:
         """Подкатегория лота."""
         self.active: bool = active
         """Активен ли лот?"""
-        self.html: str = html
-        """HTML-код виджета лота."""
+        self.html: str | None = html
+        """HTML-код виджета лота (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.public_link: str = f"https://funpay.com/chips/offer?id={self.id}" \
             if self.subcategory.type is SubCategoryTypes.CURRENCY else f"https://funpay.com/lots/offer?id={self.id}"
         """Публичная ссылка на лот."""
@@ -1175,10 +1139,10 @@ class UserProfile:
     :type banned: :obj:`bool`
 
     :param html: HTML код страницы пользователя.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
     """
 
-    def __init__(self, id_: int, username: str, profile_photo: str, online: bool, banned: bool, html: str):
+    def __init__(self, id_: int, username: str, profile_photo: str, online: bool, banned: bool, html: str | None):
         self.id: int = id_
         """ID пользователя."""
         self.username: str = username
@@ -1189,8 +1153,8 @@ class UserProfile:
         """Онлайн ли пользователь."""
         self.banned: bool = banned
         """Заблокирован ли пользователь."""
-        self.html: str = html
-        """HTML код страницы пользователя."""
+        self.html: str | None = html
+        """HTML код страницы пользователя (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.__lots_ids: dict[int | str, LotShortcut] = {}
         """Все лоты пользователя в виде словаря {ID: лот}}"""
         self.__sorted_by_subcategory_lots: dict[SubCategory, dict[int | str, LotShortcut]] = {}
@@ -1319,7 +1283,7 @@ class Review:
     :type anonymous: :obj:`bool`
 
     :param html: HTML код отзыва.
-    :type html: :obj:`str`
+    :type html: :obj:`str` or :obj:`None`
 
     :param hidden: скрыт ли отзыв?
     :type hidden: :obj:`bool`
@@ -1340,8 +1304,8 @@ class Review:
     :type reply_by_bot: :obj:`bool`
     """
 
-    def __init__(self, stars: int | None, text: str | None, reply: str | None, anonymous: bool, html: str, hidden: bool,
-                 order_id: str | None = None, author: str | None = None, author_id: int | None = None,
+    def __init__(self, stars: int | None, text: str | None, reply: str | None, anonymous: bool, html: str | None,
+                 hidden: bool, order_id: str | None = None, author: str | None = None, author_id: int | None = None,
                  by_bot: bool = False, reply_by_bot: bool = False):
         self.stars: int | None = stars
         """Кол-во звезде в отзыве."""
@@ -1351,8 +1315,8 @@ class Review:
         """Текст ответа на отзыв."""
         self.anonymous: bool = anonymous
         """Анонимный ли отзыв?"""
-        self.html: str = html
-        """HTML код отзыва."""
+        self.html: str | None = html
+        """HTML код отзыва (None, если HTML не сохраняется, см. Account.keep_html)."""
         self.hidden: bool = hidden
         """Скрыт ли отзыв?"""
         self.order_id: str | None = order_id[1:] if order_id and order_id.startswith("#") else order_id
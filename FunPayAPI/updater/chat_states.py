@@ -0,0 +1,341 @@
+"""
+В данном модуле описано компактное хранилище состояний чатов Runner'а с LRU / TTL вытеснением
+и (опционально) выгрузкой вытесненных чатов на диск.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import shelve
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Iterator
+
+import logging
+
+logger = logging.getLogger("FunPayAPI.chat_states")
+
+
+class ChatState:
+    """
+    Состояние одного чата.
+    Значение поля `None` означает, что значение не сохранено.
+    """
+    __slots__ = ("last_message_id", "node_msg_id", "user_msg_id", "last_text", "tag", "user_id", "by_bot_ids",
+                 "touched")
+
+    def __init__(self):
+        self.last_message_id: int | None = None
+        """ID последнего сообщения в чате (из истории чата)."""
+        self.node_msg_id: int | None = None
+        """ID последнего сообщения чата (из списка чатов)."""
+        self.user_msg_id: int | None = None
+        """ID последнего прочитанного сообщения чата (из списка чатов)."""
+        self.last_text: str | None = None
+        """Текст последнего сообщения чата (из списка чатов)."""
+        self.tag: str | None = None
+        """Тег чата."""
+        self.user_id: int | None = None
+        """ID собеседника."""
+        self.by_bot_ids: list[int] | None = None
+        """ID сообщений, отправленных ботом."""
+        self.touched: float = time.time()
+        """Время последнего изменения."""
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, i) is None for i in self.__slots__ if i != "touched")
+
+    def dump(self) -> tuple:
+        return tuple(getattr(self, i) for i in self.__slots__)
+
+    @classmethod
+    def load(cls, data: tuple) -> ChatState:
+        obj = cls()
+        for name, value in zip(cls.__slots__, data):
+            setattr(obj, name, value)
+        return obj
+
+
+class ChatStatesStore:
+    """
+    Хранилище состояний чатов.
+
+    :param max_size: максимальное кол-во чатов в памяти.
+    :type max_size: :obj:`int`, опционально
+
+    :param ttl: время (в секундах) без изменений, после которого чат вытесняется из памяти (0 - без ограничения).
+    :type ttl: :obj:`int`, опционально
+
+    :param spill_path: путь до файла, в который выгружаются вытесненные чаты (None - не выгружать).
+    :type spill_path: :obj:`str` or :obj:`None`, опционально
+
+    :param spill_ttl: время (в секундах) без изменений, после которого выгруженный чат удаляется с диска
+        (0 - без ограничения).
+    :type spill_ttl: :obj:`int`, опционально
+
+    :param tombstones_limit: максимальное кол-во вытесненных без выгрузки чатов, для которых запоминается ID
+        последнего сообщения (чтобы последнее сообщение такого чата не считалось новым).
+    :type tombstones_limit: :obj:`int`, опционально
+    """
+
+    def __init__(self, max_size: int = 5000, ttl: int = 7 * 24 * 60 * 60, spill_path: str | None = None,
+                 spill_ttl: int = 30 * 24 * 60 * 60, tombstones_limit: int = 100000):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.spill_path = spill_path
+        self.spill_ttl = spill_ttl
+        self.states: OrderedDict[int, ChatState] = OrderedDict()
+        self.tombstones: LRUDict[int, int] = LRUDict(tombstones_limit)
+        """ID последних сообщений чатов, вытесненных без выгрузки на диск ({ID чата: ID сообщения})."""
+        self.stats: dict[str, int] = {"evicted": 0, "spilled": 0, "restored": 0, "expired": 0, "tombstoned": 0}
+        self.__lock = threading.RLock()
+        self.__spill: shelve.Shelf | None = None
+        self.__last_ttl_check = time.time()
+        self.__last_spill_prune = time.time()
+
+        if spill_path:
+            try:
+                if os.path.dirname(spill_path):
+                    os.makedirs(os.path.dirname(spill_path), exist_ok=True)
+                self.__spill = shelve.open(spill_path)
+            except:
+                logger.warning("Не удалось открыть файл для выгрузки состояний чатов.")
+                logger.debug("TRACEBACK", exc_info=True)
+            else:
+                self.__prune_spill()
+                atexit.register(self.close)
+
+    def get(self, chat_id: int) -> ChatState | None:
+        """
+        Возвращает состояние чата (при необходимости восстанавливает его с диска).
+
+        :param chat_id: ID чата.
+
+        :return: состояние чата или None, если оно не найдено.
+        """
+        with self.__lock:
+            state = self.states.get(chat_id)
+            if state is None and self.__spill is not None and (key := str(chat_id)) in self.__spill:
+                try:
+                    state = ChatState.load(self.__spill.pop(key))
+                except:
+                    logger.debug("TRACEBACK", exc_info=True)
+                    return None
+                if self.__spill_expired(state.touched, time.time()):
+                    self.stats["expired"] += 1
+                    return None
+                self.states[chat_id] = state
+                self.stats["restored"] += 1
+                self.__evict()
+            elif state is None and (message_id := self.tombstones.pop(chat_id, None)) is not None:
+                state = self.states[chat_id] = ChatState()
+                state.node_msg_id = state.last_message_id = message_id
+                self.stats["restored"] += 1
+                self.__evict()
+            return state
+
+    def get_or_create(self, chat_id: int) -> ChatState:
+        """
+        Возвращает состояние чата, создавая его при отсутствии, и помечает его как недавно использованное.
+
+        :param chat_id: ID чата.
+
+        :return: состояние чата.
+        """
+        with self.__lock:
+            state = self.get(chat_id)
+            if state is None:
+                state = self.states[chat_id] = ChatState()
+            state.touched = time.time()
+            self.states.move_to_end(chat_id)
+            self.__evict()
+            return state
+
+    def __spill_expired(self, touched: float, now: float) -> bool:
+        return bool(self.spill_ttl) and now - touched > self.spill_ttl
+
+    def __prune_spill(self):
+        """
+        Удаляет с диска выгруженные чаты, которые не изменялись дольше self.spill_ttl секунд.
+        """
+        if self.__spill is None:
+            return
+        now = time.time()
+        self.__last_spill_prune = now
+        touched_index = ChatState.__slots__.index("touched")
+        try:
+            if self.spill_ttl:
+                for key in list(self.__spill.keys()):
+                    try:
+                        expired = self.__spill_expired(self.__spill[key][touched_index], now)
+                    except:
+                        logger.debug("TRACEBACK", exc_info=True)
+                        expired = True
+                    if expired:
+                        del self.__spill[key]
+                        self.stats["expired"] += 1
+            self.__spill.sync()
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+
+    def __evict(self):
+        now = time.time()
+        check_ttl = self.ttl and now - self.__last_ttl_check > 60
+        if check_ttl:
+            self.__last_ttl_check = now
+        if self.__spill is not None and now - self.__last_spill_prune > 60 * 60:
+            self.__prune_spill()
+        while self.states:
+            chat_id, state = next(iter(self.states.items()))
+            if len(self.states) <= self.max_size and not (check_ttl and now - state.touched > self.ttl):
+                break
+            del self.states[chat_id]
+            self.stats["evicted"] += 1
+            if self.__spill is not None and not state.is_empty():
+                try:
+                    self.__spill[str(chat_id)] = state.dump()
+                    self.stats["spilled"] += 1
+                    continue
+                except:
+                    logger.debug("TRACEBACK", exc_info=True)
+            message_id = max(state.node_msg_id or 0, state.last_message_id or 0)
+            if message_id:
+                self.tombstones[chat_id] = message_id
+                self.stats["tombstoned"] += 1
+
+    def close(self):
+        """
+        Сохраняет и закрывает файл выгрузки (вызывается автоматически при завершении программы).
+        """
+        with self.__lock:
+            if self.__spill is None:
+                return
+            try:
+                self.__spill.close()
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+            self.__spill = None
+
+    def items(self) -> list[tuple[int, ChatState]]:
+        """
+        :return: состояния чатов, находящихся в памяти.
+        """
+        with self.__lock:
+            return list(self.states.items())
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        :return: статистика хранилища: кол-во чатов в памяти, приблизительный размер (в байтах),
+            кол-во вытесненных / выгруженных / восстановленных / удаленных с диска по истечении срока /
+            вытесненных без выгрузки чатов, кол-во хранимых ID последних сообщений вытесненных чатов.
+        """
+        with self.__lock:
+            size = sys.getsizeof(self.states) + sys.getsizeof(self.tombstones)
+            for chat_id, state in self.states.items():
+                size += sys.getsizeof(chat_id) + sys.getsizeof(state)
+                if state.by_bot_ids:
+                    size += sys.getsizeof(state.by_bot_ids)
+                if state.last_text:
+                    size += sys.getsizeof(state.last_text)
+            return {"resident": len(self.states), "resident_bytes": size, "tombstones": len(self.tombstones),
+                    **self.stats}
+
+    def view(self, *fields: str) -> ChatStatesView:
+        """
+        Возвращает словарь-представление полей состояний чатов ({ID чата: значение}).
+
+        :param fields: поля ChatState. Если передано несколько полей, значение - список значений этих полей.
+        """
+        return ChatStatesView(self, fields)
+
+
+class ChatStatesView(MutableMapping):
+    """
+    Словарь-представление одного (или нескольких) полей состояний чатов.
+    Позволяет работать с хранилищем так же, как с обычным словарем {ID чата: значение}.
+    """
+
+    def __init__(self, store: ChatStatesStore, fields: tuple[str, ...]):
+        self.store = store
+        self.fields = fields
+
+    def __get_value(self, state: ChatState | None):
+        if state is None or getattr(state, self.fields[0]) is None:
+            return None
+        if len(self.fields) == 1:
+            return getattr(state, self.fields[0])
+        return [getattr(state, i) for i in self.fields]
+
+    def __getitem__(self, chat_id):
+        value = self.__get_value(self.store.get(chat_id))
+        if value is None:
+            raise KeyError(chat_id)
+        return value
+
+    def __setitem__(self, chat_id, value):
+        state = self.store.get_or_create(chat_id)
+        if len(self.fields) == 1:
+            setattr(state, self.fields[0], value)
+        else:
+            for name, field_value in zip(self.fields, value):
+                setattr(state, name, field_value)
+
+    def __delitem__(self, chat_id):
+        state = self.store.get(chat_id)
+        if state is None or getattr(state, self.fields[0]) is None:
+            raise KeyError(chat_id)
+        for name in self.fields:
+            setattr(state, name, None)
+
+    def __contains__(self, chat_id) -> bool:
+        return self.__get_value(self.store.get(chat_id)) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter([chat_id for chat_id, state in self.store.items() if getattr(state, self.fields[0]) is not None])
+
+    def __len__(self) -> int:
+        return sum(1 for _, state in self.store.items() if getattr(state, self.fields[0]) is not None)
+
+    def get(self, chat_id, default=None):
+        value = self.__get_value(self.store.get(chat_id))
+        return default if value is None else value
+
+    def items(self):
+        return [(chat_id, value) for chat_id, state in self.store.items()
+                if (value := self.__get_value(state)) is not None]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def replace(self, data: dict):
+        """
+        Заменяет все значения представления значениями из переданного словаря.
+
+        :param data: новые значения {ID чата: значение}.
+        """
+        for chat_id in list(self):
+            del self[chat_id]
+        for chat_id, value in data.items():
+            self[chat_id] = value
+
+
+class LRUDict(OrderedDict):
+    """
+    Словарь с ограниченным кол-вом ключей: при переполнении удаляются давно не изменявшиеся ключи.
+
+    :param max_size: максимальное кол-во ключей.
+    :type max_size: :obj:`int`
+    """
+
+    def __init__(self, max_size: int, *args, **kwargs):
+        self.max_size = max_size
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
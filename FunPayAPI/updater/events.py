@@ -178,6 +178,17 @@ class NewOrderEvent(BaseEvent):
         self.order: types.OrderShortcut = order_obj
         """Объект нового заказа."""
 
+    @property
+    def full_order(self) -> types.Order | None:
+        """
+        Полный объект заказа, предзагруженный Runner'ом.
+        Если предзагрузка еще не завершена, ожидает ее завершения.
+        None, если предзагрузка не запускалась или не удалась.
+        """
+        if self.order._order_future is None:
+            return self.order._order
+        return self.order._order_future.result()
+
 
 class OrderStatusChangedEvent(BaseEvent):
     """
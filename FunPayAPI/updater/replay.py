@@ -0,0 +1,255 @@
+"""
+В данном модуле описаны инструменты для записи ответов `runner/` и их воспроизведения без обращения к funpay.com
+(для бенчмарков и проверки обработки событий на реальных данных).
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, Generator, Literal
+
+import requests
+
+from ..account import Account
+
+if TYPE_CHECKING:
+    from .runner import Runner
+
+import logging
+
+logger = logging.getLogger("FunPayAPI.replay")
+
+
+class RunnerRecorder:
+    """
+    Записывает ответы `runner/` в сжатый лог (gzip, одна JSON-строка на ответ).
+    golden_key, PHPSESSID и CSRF токен аккаунта заменяются заглушками.
+    Файл открывается один раз; после каждой записи сжатые данные сбрасываются на диск (Z_SYNC_FLUSH), поэтому лог
+    остается читаемым даже после аварийного завершения.
+
+    :param account: аккаунт, ответы которого записываются.
+    :type account: :class:`FunPayAPI.account.Account`
+
+    :param path: путь до файла лога.
+    :type path: :obj:`str`
+    """
+
+    def __init__(self, account: Account, path: str):
+        self.account: Account = account
+        self.path: str = path
+        self.records: int = 0
+        """Кол-во записанных ответов."""
+        self.__lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        new = not os.path.exists(path)
+        self.__file: gzip.GzipFile | None = gzip.open(path, "ab")
+        atexit.register(self.close)
+        if new:
+            self.__write({"version": 1, "account_id": account.id, "username": account.username,
+                          "locale": account.locale, "created": time.time()})
+
+    def scrub(self, text: str) -> str:
+        """
+        Заменяет секретные данные аккаунта в тексте заглушками.
+
+        :param text: текст.
+        :type text: :obj:`str`
+
+        :return: текст без секретных данных.
+        :rtype: :obj:`str`
+        """
+        for secret, placeholder in ((self.account.golden_key, "<golden_key>"),
+                                    (self.account.phpsessid, "<phpsessid>"),
+                                    (self.account.csrf_token, "<csrf_token>")):
+            if secret:
+                text = text.replace(secret, placeholder)
+        return text
+
+    def __write(self, data: dict):
+        line = self.scrub(json.dumps(data, ensure_ascii=False)) + "\n"
+        with self.__lock:
+            if self.__file is None:
+                return
+            self.__file.write(line.encode("utf-8"))
+            self.__file.flush()
+
+    def close(self):
+        """
+        Завершает и закрывает лог (вызывается автоматически при завершении программы).
+        """
+        with self.__lock:
+            if self.__file is None:
+                return
+            try:
+                self.__file.close()
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+            self.__file = None
+
+    def record(self, objects: list[dict], request: dict | None, response: requests.Response):
+        """
+        Записывает ответ `runner/`.
+
+        :param objects: объекты запроса.
+        :type objects: :obj:`list` of :obj:`dict`
+
+        :param request: дополнительный объект запроса (отправка сообщения) или None.
+        :type request: :obj:`dict` or :obj:`None`
+
+        :param response: ответ FunPay.
+        :type response: :class:`requests.Response`
+        """
+        try:
+            data = response.json()
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+            return
+        self.__write({"t": time.time(),
+                      "request": [{"type": i.get("type"), "id": i.get("id")} for i in objects],
+                      "action": request.get("action") if request else None,
+                      "response": data})
+        self.records += 1
+
+
+def read_records(path: str) -> tuple[dict, list[dict]]:
+    """
+    Читает лог, записанный :class:`FunPayAPI.updater.replay.RunnerRecorder`.
+
+    :param path: путь до файла лога.
+    :type path: :obj:`str`
+
+    :return: заголовок лога и список записей.
+    :rtype: :obj:`tuple` (:obj:`dict`, :obj:`list` of :obj:`dict`)
+    """
+    header, records = {}, []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # оборванная последняя строка лога, не закрытого после аварийного завершения
+                    break
+                if "version" in data:
+                    header = data
+                else:
+                    records.append(data)
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            # лог не был закрыт (аварийное завершение): все сброшенные на диск записи уже прочитаны
+            logger.debug("TRACEBACK", exc_info=True)
+    return header, records
+
+
+class ReplayResponse:
+    """
+    Замена :class:`requests.Response` для воспроизводимых ответов.
+    """
+
+    def __init__(self, data: dict):
+        self.__data = data
+        self.status_code = 200
+        self.headers = {}
+        self.text = json.dumps(data, ensure_ascii=False)
+        self.content = self.text.encode()
+
+    def json(self) -> dict:
+        return self.__data
+
+
+class ReplayAccount(Account):
+    """
+    Аккаунт, который вместо запросов к funpay.com отдает записанные ответы `runner/`.
+
+    Ответы с `chat_bookmarks` / `orders_counters` выдаются по порядку методом
+    :meth:`FunPayAPI.updater.replay.ReplayAccount.iter_updates`. Запросы истории чатов (`chat_node`) обслуживаются
+    из индекса всех записанных `chat_node` (по каждому чату - по порядку записи).
+
+    :param path: путь до файла лога.
+    :type path: :obj:`str`
+    """
+
+    def __init__(self, path: str):
+        super().__init__("<golden_key>")
+        header, self.records = read_records(path)
+        self.id = header.get("account_id") or 0
+        self.username = header.get("username") or "replay"
+        self.csrf_token = "<csrf_token>"
+        self.__chat_nodes: dict[str, list[dict]] = {}
+        for record in self.records:
+            for obj in record["response"].get("objects", []):
+                if obj.get("type") == "chat_node" and obj.get("data"):
+                    node_id = str(obj["data"]["node"]["id"])
+                    self.__chat_nodes.setdefault(node_id, []).append(obj)
+                    if name := obj["data"]["node"].get("name"):
+                        self.__chat_nodes.setdefault(name, []).append(obj)
+        self.served: int = 0
+        """Кол-во обслуженных запросов `runner/`."""
+
+    @property
+    def is_initiated(self) -> bool:
+        return True
+
+    def method(self, request_method: Literal["post", "get"], api_method: str, headers: dict, payload,
+               exclude_phpsessid: bool = False, raise_not_200: bool = False,
+               locale: Literal["ru", "en", "uk"] | None = None, use_cache: bool = False) -> requests.Response:
+        raise RuntimeError(f"ReplayAccount не отправляет запросы ({request_method} {api_method}).")
+
+    def runner_request(self, payload: dict) -> ReplayResponse:
+        objects = payload.get("objects") or []
+        if isinstance(objects, str):
+            objects = json.loads(objects)
+        result = []
+        for obj in objects:
+            if obj.get("type") != "chat_node":
+                continue
+            nodes = self.__chat_nodes.get(str(obj.get("id")))
+            result.append(nodes.pop(0) if nodes else {"type": "chat_node", "id": obj.get("id"),
+                                                      "tag": obj.get("tag"), "data": False})
+        self.served += 1
+        return ReplayResponse({"objects": result, "response": False})
+
+    def abuse_runner(self, chats_data: dict[int | str, str | None] | None = None,
+                     last_order_event_tag: str | None = None,
+                     last_msg_event_tag: str | None = None,
+                     buyer_viewing_ids: list[int | str] | None = None,
+                     request: None | dict = None, include_runner_context: bool = False) -> ReplayResponse:
+        # запросы выполняются синхронно, без очереди Runner'а
+        return self.runner_request(self.get_payload_data(chats_data, last_order_event_tag, last_msg_event_tag,
+                                                         buyer_viewing_ids, request,
+                                                         include_runner_context=include_runner_context))
+
+    def iter_updates(self) -> Generator[list[dict], None, None]:
+        """
+        Поочередно выдает объекты `chat_bookmarks` / `orders_counters` из записанных ответов
+        (в том виде, в котором их получает :meth:`FunPayAPI.updater.runner.Runner.parse_updates`).
+
+        :return: генератор списков объектов.
+        """
+        for record in self.records:
+            objects = [i for i in record["response"].get("objects", [])
+                       if i.get("type") in ("chat_bookmarks", "orders_counters") and i.get("data")]
+            if objects:
+                yield objects
+
+
+def replay(runner: Runner) -> Generator:
+    """
+    Прогоняет все записанные обновления через Runner привязанного :class:`FunPayAPI.updater.replay.ReplayAccount`.
+
+    :param runner: Runner, созданный для ReplayAccount.
+    :type runner: :class:`FunPayAPI.updater.runner.Runner`
+
+    :return: генератор событий.
+    """
+    for objects in runner.account.iter_updates():
+        for event in runner.parse_updates(objects):
+            yield event
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import random
 import re
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Generator
 
 import requests
@@ -17,6 +19,7 @@ from bs4 import BeautifulSoup
 
 from ..common import exceptions
 from .events import *
+from .chat_states import ChatStatesStore, ChatStatesView, LRUDict
 
 logger = logging.getLogger("FunPayAPI.runner")
 
@@ -44,10 +47,34 @@ class Runner:
         Из событий, связанных с заказами, будет возвращаться только
         :class:`FunPayAPI.updater.events.OrdersListChangedEvent`.
     :type disabled_order_requests: :obj:`bool`, опционально
+
+    :param order_prefetch_workers: кол-во потоков для предзагрузки полных объектов новых заказов
+        (:attr:`FunPayAPI.updater.events.NewOrderEvent.full_order`). 0 - отключить предзагрузку.
+    :type order_prefetch_workers: :obj:`int`, опционально
+
+    :param saved_orders_limit: максимальное кол-во отслеживаемых заказов (самые давно не встречавшиеся вытесняются).
+    :type saved_orders_limit: :obj:`int`, опционально
+
+    :param chat_states_limit: максимальное кол-во чатов, состояние которых хранится в памяти.
+    :type chat_states_limit: :obj:`int`, опционально
+
+    :param chat_states_ttl: время (в секундах) без изменений, после которого состояние чата вытесняется из памяти.
+    :type chat_states_ttl: :obj:`int`, опционально
+
+    :param chat_states_spill_path: путь до файла, в который выгружаются вытесненные состояния чатов
+        (None - не выгружать).
+    :type chat_states_spill_path: :obj:`str` or :obj:`None`, опционально
+
+    :param lane_aging: время (в секундах) ожидания в очереди, за которое приоритет полезной нагрузки повышается
+        на одну ступень (чтобы полезные нагрузки PREFETCH не ждали бесконечно). 0 - не повышать.
+    :type lane_aging: :obj:`int` or :obj:`float`, опционально
     """
 
     def __init__(self, account: Account, disable_message_requests: bool = False,
-                 disabled_order_requests: bool = False):
+                 disabled_order_requests: bool = False, order_prefetch_workers: int = 4,
+                 saved_orders_limit: int = 1000, chat_states_limit: int = 5000,
+                 chat_states_ttl: int = 7 * 24 * 60 * 60, chat_states_spill_path: str | None = None,
+                 lane_aging: int | float = 5):
         # todo добавить события и исключение событий о новых покупках (не продажах!)
         if not account.is_initiated:
             raise exceptions.AccountNotInitiatedError()
@@ -63,28 +90,30 @@ class Runner:
         self.__last_msg_event_tag = utils.random_tag()
         self.__last_order_event_tag = utils.random_tag()
         self.__is_running = False
-
-
-        self.saved_orders: dict[str, types.OrderShortcut] | None = None
-        """Сохраненные состояния заказов ({ID заказа: экземпляр types.OrderShortcut})."""
-
-        self.runner_last_messages: dict[int, list[int, int, str | None]] = {}
-        """ID последний сообщений {ID чата: [ID последего сообщения чата, ID последнего прочитанного сообщения чата, 
-        текст последнего сообщения или None, если это изображение]}."""
-
-        self.by_bot_ids: dict[int, list[int]] = {}
-        """ID сообщений, отправленных с помощью self.account.send_message ({ID чата: [ID сообщения, ...]})."""
-
-        self.last_messages_ids: dict[int, int] = {}
-        """ID последних сообщений в чатах ({ID чата: ID последнего сообщения})."""
-
-        self.chat_node_tags: dict[int, str] = {}
-        """Теги прочитанных чатов ({ID чата: тег})"""
-
-        self.users_ids: dict[int, int] = {}
-        """id чата - id собеседника"""
-
-        self.buyers_viewing: dict[int, types.BuyerViewing] = {}
+        self.__order_prefetch_executor = ThreadPoolExecutor(max_workers=order_prefetch_workers,
+                                                            thread_name_prefix="OrderPrefetch") \
+            if order_prefetch_workers > 0 else None
+
+        self.saved_orders: OrderedDict[str, types.OrderShortcut] | None = None
+        """Сохраненные состояния заказов ({ID заказа: экземпляр types.OrderShortcut}), LRU."""
+
+        self.saved_orders_limit: int = saved_orders_limit
+        """Максимальное кол-во заказов в self.saved_orders."""
+
+        self.__paid_orders: set[str] = set()
+        """ID отслеживаемых заказов в статусе PAID, которые были на первой странице продаж."""
+        self.__orders_full_scan_time = 0
+        """Время последнего полного разбора первой страницы продаж."""
+
+        self.chat_states: ChatStatesStore = ChatStatesStore(chat_states_limit, chat_states_ttl, chat_states_spill_path)
+        """Состояния чатов (все словари ниже - представления этого хранилища)."""
+        self.__runner_last_messages = self.chat_states.view("node_msg_id", "user_msg_id", "last_text")
+        self.__by_bot_ids = self.chat_states.view("by_bot_ids")
+        self.__last_messages_ids = self.chat_states.view("last_message_id")
+        self.__chat_node_tags = self.chat_states.view("tag")
+        self.__users_ids = self.chat_states.view("user_id")
+
+        self.buyers_viewing: LRUDict[int, types.BuyerViewing] = LRUDict(1000)
         """Что смотрит покупатель? ({ID покупателя: что смотрит}"""
 
         self.runner_len: int = 10
@@ -93,8 +122,22 @@ class Runner:
         self.payload_queue: dict [str, dict] = {}
         """uuid4 - payload"""
 
-        self.runner_results: dict [str, requests.Response | Exception] = {}
-        """uuid4 - response/exception"""
+        self.payload_futures: dict[str, Future] = {}
+        """uuid4 - Future, который завершается ответом / исключением сразу после выполнения запроса."""
+
+        self.payload_lanes: dict[str, RunnerLanes] = {}
+        """uuid4 - приоритет полезной нагрузки"""
+
+        self.payload_times: dict[str, float] = {}
+        """uuid4 - время добавления полезной нагрузки в очередь"""
+
+        self.lane_aging: int | float = lane_aging
+        """Время (в секундах) ожидания, за которое приоритет полезной нагрузки повышается на одну ступень."""
+
+        self.lanes_stats: dict[RunnerLanes, dict[str, int]] = {i: {"max_depth": 0, "dispatched": 0}
+                                                               for i in RunnerLanes}
+        """Статистика очереди по приоритетам ({приоритет: {"max_depth": ..., "dispatched": ...}})."""
+        self.__queue_condition = threading.Condition()
         self.account: Account = account
         """Экземпляр аккаунта, к которому привязан Runner."""
 
@@ -102,75 +145,252 @@ class Runner:
         self.__chat_bookmarks: list[dict] = []
         self.__chat_nodes: dict[int, tuple[dict, int]] = {}
         self.__chat_bookmarks_time = 0
+
+        self.__chat_activity: dict[int, list[float]] = {}
+        """Индекс активности чатов ({ID чата: [время последнего изменения, частота изменений (в минуту),
+        время последнего запроса chat_node]})."""
+        self.__chat_positions: dict[int, int] = {}
+        """Позиции чатов в последнем полученном chat_bookmarks ({ID чата: позиция})."""
+        self.__prefetched_chats: set[int] = set()
+        """ID чатов, chat_node которых были добавлены в текущий запрос по индексу активности."""
+        self.chat_prefetch_stats: dict[str, int] = {"requested": 0, "hits": 0}
+        """Статистика подкидывания chat_node: сколько запрошено и сколько ответов содержали новые сообщения."""
         self.account.runner = self
 
-    def __add_payload(self, payload: dict):
+    @staticmethod
+    def get_payload_lane(payload: dict, awaited: bool = False) -> RunnerLanes:
+        """
+        Определяет приоритет полезной нагрузки.
+
+        :param payload: полезная нагрузка.
+        :type payload: dict
+
+        :param awaited: ждет ли вызывающий ответа на полезную нагрузку. chat_node попадают в DELIVERY, только если
+            ответа ждут, иначе это предзагрузка (PREFETCH).
+        :type awaited: bool
+
+        :return: приоритет полезной нагрузки.
+        :rtype: :class:`FunPayAPI.common.enums.RunnerLanes`
+        """
+        types_ = {i["type"] for i in payload["objects"]}
+        if payload["request"] or (awaited and "chat_node" in types_):
+            return RunnerLanes.DELIVERY
+        elif "chat_bookmarks" in types_ or "orders_counters" in types_:
+            return RunnerLanes.LISTENER
+        return RunnerLanes.PREFETCH
+
+    def __get_effective_lane(self, id_: str) -> int:
+        """
+        :return: приоритет полезной нагрузки с учетом времени ожидания в очереди: за каждые self.lane_aging секунд
+            ожидания приоритет повышается на одну ступень (но не выше DELIVERY).
+        """
+        lane = self.payload_lanes[id_].value
+        if not self.lane_aging:
+            return lane
+        waited = time.time() - self.payload_times.get(id_, time.time())
+        return max(lane - int(waited // self.lane_aging), RunnerLanes.DELIVERY.value)
+
+    def get_queue_depths(self) -> dict[RunnerLanes, int]:
+        """
+        Возвращает текущее кол-во полезных нагрузок в очереди для каждого приоритета.
+
+        :return: словарь {приоритет: кол-во полезных нагрузок в очереди}.
+        :rtype: dict[:class:`FunPayAPI.common.enums.RunnerLanes`, int]
+        """
+        result = {i: 0 for i in RunnerLanes}
+        for lane in list(self.payload_lanes.values()):
+            result[lane] += 1
+        return result
+
+    @property
+    def runner_last_messages(self) -> ChatStatesView:
+        """ID последний сообщений {ID чата: [ID последего сообщения чата, ID последнего прочитанного сообщения чата,
+        текст последнего сообщения или None, если это изображение]}."""
+        return self.__runner_last_messages
+
+    @runner_last_messages.setter
+    def runner_last_messages(self, value: dict[int, list[int, int, str | None]]):
+        self.__runner_last_messages.replace(value)
+
+    @property
+    def by_bot_ids(self) -> ChatStatesView:
+        """ID сообщений, отправленных с помощью self.account.send_message ({ID чата: [ID сообщения, ...]})."""
+        return self.__by_bot_ids
+
+    @by_bot_ids.setter
+    def by_bot_ids(self, value: dict[int, list[int]]):
+        self.__by_bot_ids.replace(value)
+
+    @property
+    def last_messages_ids(self) -> ChatStatesView:
+        """ID последних сообщений в чатах ({ID чата: ID последнего сообщения})."""
+        return self.__last_messages_ids
+
+    @last_messages_ids.setter
+    def last_messages_ids(self, value: dict[int, int]):
+        self.__last_messages_ids.replace(value)
+
+    @property
+    def chat_node_tags(self) -> ChatStatesView:
+        """Теги прочитанных чатов ({ID чата: тег})"""
+        return self.__chat_node_tags
+
+    @chat_node_tags.setter
+    def chat_node_tags(self, value: dict[int, str]):
+        self.__chat_node_tags.replace(value)
+
+    @property
+    def users_ids(self) -> ChatStatesView:
+        """id чата - id собеседника"""
+        return self.__users_ids
+
+    @users_ids.setter
+    def users_ids(self, value: dict[int, int]):
+        self.__users_ids.replace(value)
+
+    def get_chat_states_stats(self) -> dict[str, int]:
         """
-        Добавляет полезную нагрузку в очередь и присваивает ей уникальный идентификатор.
+        :return: статистика хранилища состояний чатов (см. :meth:`FunPayAPI.updater.chat_states.ChatStatesStore.get_stats`).
+        :rtype: :obj:`dict`
+        """
+        return self.chat_states.get_stats()
+
+    def add_payload(self, payload: dict, lane: RunnerLanes | None = None, awaited: bool = False) -> Future:
+        """
+        Добавляет полезную нагрузку в очередь, присваивает ей уникальный идентификатор и будит основной цикл.
+        Не ждет выполнения запроса.
 
         :param payload: словарь с данными для добавления в очередь.
         :type payload: dict
 
-        :return: уникальный идентификатор добавленной полезной нагрузки.
-        :rtype: str
+        :param lane: приоритет полезной нагрузки (если не передан - определяется автоматически).
+        :type lane: :class:`FunPayAPI.common.enums.RunnerLanes` or None
+
+        :param awaited: будет ли вызывающий ждать ответа (см. :meth:`get_payload_lane`).
+        :type awaited: bool
+
+        :return: Future, в который будет записан ответ (или исключение) на данную полезную нагрузку.
+        :rtype: concurrent.futures.Future
         """
         id_ = str(uuid.uuid4())
-        self.payload_queue[id_] = payload
-        return id_
+        future = Future()
+        lane = lane or self.get_payload_lane(payload, awaited)
+        with self.__queue_condition:
+            self.payload_futures[id_] = future
+            self.payload_lanes[id_] = lane
+            self.payload_times[id_] = time.time()
+            self.payload_queue[id_] = payload
+            depth = sum(1 for i in self.payload_lanes.values() if i == lane)
+            if depth > self.lanes_stats[lane]["max_depth"]:
+                self.lanes_stats[lane]["max_depth"] = depth
+            self.__queue_condition.notify()
+        return future
+
+    def __set_results(self, ids: set[str], result: requests.Response | Exception):
+        """
+        Завершает Future полезных нагрузок с переданными ID.
 
-    def get_result(self, payload: dict) -> requests.Response:
+        :param ids: ID полезных нагрузок.
+        :type ids: set[str]
+
+        :param result: ответ FunPay или исключение.
+        :type result: requests.Response | Exception
+        """
+        for id_ in ids:
+            future = self.payload_futures.pop(id_, None)
+            if future is None or future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_result(self, payload: dict, lane: RunnerLanes | None = None) -> requests.Response:
         """
         Отправляет полезную нагрузку на обработку и возвращает HTTP-ответ после выполнения.
 
         :param payload: словарь с данными для отправки на обработку.
         :type payload: dict
 
+        :param lane: приоритет полезной нагрузки (если не передан - определяется автоматически).
+        :type lane: :class:`FunPayAPI.common.enums.RunnerLanes` or None
+
         :return: объект ответа от обработчика в виде `requests.Response`.
         :rtype: requests.Response
 
-        :raises Exception: если результат не был получен в течение ожидания или произошла ошибка при обработке.
+        :raises Exception: если во время выполнения запроса произошла ошибка.
         """
+        return self.add_payload(payload, lane, awaited=True).result()
 
-        id_ = self.__add_payload(payload)
-        while id_ in self.payload_queue:
-            time.sleep(0.1)
-        for i in range(300):
-            if id_ in self.runner_results:
-                break
-            time.sleep(0.1)
-        result = self.runner_results.pop(id_, Exception("Что-то пошло не так во время получения результата"))
-        if isinstance(result, Exception):
-            raise result
-        return result
+    def __update_chat_activity(self, order: list[int]):
+        """
+        Обновляет индекс активности чатов по новому порядку чатов из chat_bookmarks.
+        Чат считается изменившимся, если он поднялся в списке или появился в нем.
+
+        :param order: ID чатов в порядке из chat_bookmarks (сверху вниз).
+        :type order: :obj:`list` of :obj:`int`
+        """
+        now = time.time()
+        old_positions = self.__chat_positions
+        for position, chat_id in enumerate(order):
+            old_position = old_positions.get(chat_id)
+            if not old_positions or (old_position is not None and old_position <= position):
+                continue
+            if chat_id not in self.__chat_activity:
+                self.__chat_activity[chat_id] = [now, 0.0, 0.0]
+                continue
+            activity = self.__chat_activity[chat_id]
+            activity[1] = activity[1] * 0.7 + 0.3 * 60 / max(now - activity[0], 1)
+            activity[0] = now
+        self.__chat_positions = {chat_id: position for position, chat_id in enumerate(order)}
+
+        if len(self.__chat_activity) > 1000:
+            for chat_id, _ in sorted(self.__chat_activity.items(), key=lambda x: x[1][0])[:-1000]:
+                del self.__chat_activity[chat_id]
 
     def __detect_chats_with_activity(self, amount: int) -> list[int]:
-        if not self.__chat_bookmarks or len(self.__chat_bookmarks) < 2:
-            return []
-        new_list = self.__chat_bookmarks[-1]["data"]["order"]
-        old_list = random.choice(self.__chat_bookmarks[:-1])["data"]["order"]
-        old_positions = {chat_id: i for i, chat_id in enumerate(old_list)}
-        last = float('inf')
-        split_index = len(new_list)
-        for i in range(len(new_list)-1, -1, -1):
-            idx = old_positions.get(new_list[i])
-
-            if idx is None or i < idx or last < idx:
-                split_index = i
-                break
-            else:
-                last = idx
+        """
+        Выбирает чаты, в которых вероятнее всего есть новые сообщения.
 
-        result = new_list[:split_index+1]
-        if len(result) >= amount:
-            return random.sample(result, amount)
-        i = 0
-        result = set(result)
-        while len(result) < amount and i < len(new_list):
-            result.add(new_list[i])
-            i+=1
+        Сначала идут чаты, изменившиеся после последнего запроса их chat_node (самые свежие изменения - первыми),
+        затем - чаты с наибольшей частотой изменений, затем - чаты сверху списка chat_bookmarks.
 
-        return list(result)
+        :param amount: кол-во чатов.
+        :type amount: :obj:`int`
 
+        :return: ID чатов.
+        :rtype: :obj:`list` of :obj:`int`
+        """
+        if not self.__chat_positions:
+            return []
+        now = time.time()
+        pending = sorted((chat_id for chat_id, (changed, _, fetched) in self.__chat_activity.items()
+                          if changed > fetched), key=lambda x: self.__chat_activity[x][0], reverse=True)
+        result = pending[:amount]
+        if len(result) < amount:
+            selected = set(result)
+            default = [float("inf"), 0.0, 0.0]
+
+            def score(chat_id: int) -> tuple[float, int]:
+                changed, rate, _ = self.__chat_activity.get(chat_id, default)
+                return rate / (1 + max(now - changed, 0) / 300), -self.__chat_positions[chat_id]
+
+            candidates = sorted((i for i in self.__chat_positions if i not in selected), key=score, reverse=True)
+            result.extend(candidates[:amount - len(result)])
+
+        for chat_id in result:
+            if chat_id in self.__chat_activity:
+                self.__chat_activity[chat_id][2] = now
+        return result
+
+    def get_chat_prefetch_hit_rate(self) -> float:
+        """
+        :return: доля подкинутых по индексу активности chat_node, в ответе на которые были новые сообщения.
+        :rtype: :obj:`float`
+        """
+        if not self.chat_prefetch_stats["requested"]:
+            return 0.0
+        return self.chat_prefetch_stats["hits"] / self.chat_prefetch_stats["requested"]
 
     def __fill_request_data(self, request_data: dict) -> dict:
         """
@@ -201,11 +421,14 @@ class Runner:
                     self.account.get_payload_data(last_msg_event_tag=self.__last_msg_event_tag)["objects"])
                 self.__chat_bookmarks_time = time.time()
 
+        self.__prefetched_chats = set()
         try:
             if (self.make_msg_requests and (remaining := self.runner_len - len(request_data["objects"])) > 0):
-                payload_data = self.account.get_payload_data(chats_data=self.__detect_chats_with_activity(remaining),
-                                                             include_runner_context=True)
+                requested = {i["id"] for i in request_data["objects"] if i["type"] == "chat_node"}
+                chats = [i for i in self.__detect_chats_with_activity(remaining) if i not in requested]
+                payload_data = self.account.get_payload_data(chats_data=chats, include_runner_context=True)
                 request_data["objects"].extend(payload_data["objects"])
+                self.__prefetched_chats = set(chats)
         except:
             logger.warning("Что-то пошло не так во время подкидывания чатов.")
             logger.debug("TRACEBACK", exc_info=True)
@@ -221,28 +444,30 @@ class Runner:
         self.__is_running = True
 
         while True:
+            ids = set()
             try:
                 request_data = {"objects": [],
                                 "request": False}
-                ids = set()
-
-                for id_ in list(self.payload_queue.keys()):
-                    payload = self.payload_queue.get(id_)
-                    if payload is None:
-                        continue
-                    if ((not request_data["objects"] and not request_data["request"])
-                            or ((len(request_data["objects"]) + len(payload["objects"]) <= self.runner_len and
-                            int(bool(request_data["request"])) + int(bool(payload["request"])) <= 1))):
-                        request_data["objects"].extend(payload["objects"])
-                        request_data["request"] = request_data["request"] or payload["request"]
-                        ids.add(id_)
-                        self.payload_queue.pop(id_, None)
-                    else:
-                        break
 
+                with self.__queue_condition:
+                    while not self.payload_queue:
+                        self.__queue_condition.wait()
+
+                    # sorted стабилен, поэтому внутри одного приоритета сохраняется порядок FCFS
+                    for id_ in sorted(self.payload_queue, key=self.__get_effective_lane):
+                        payload = self.payload_queue[id_]
+                        if ((not request_data["objects"] and not request_data["request"])
+                                or ((len(request_data["objects"]) + len(payload["objects"]) <= self.runner_len and
+                                int(bool(request_data["request"])) + int(bool(payload["request"])) <= 1))):
+                            request_data["objects"].extend(payload["objects"])
+                            request_data["request"] = request_data["request"] or payload["request"]
+                            ids.add(id_)
+                            self.payload_queue.pop(id_)
+                            self.payload_times.pop(id_, None)
+                            self.lanes_stats[self.payload_lanes.pop(id_)]["dispatched"] += 1
 
                 if not request_data["objects"] and not request_data["request"]:
-                    time.sleep(0.1)
+                    self.__set_results(ids, Exception("Передана пустая полезная нагрузка."))
                     continue
                 types_ = [i["type"] for i in request_data["objects"]]
                 if "orders_counters" in types_ and "chat_bookmarks" in types_:
@@ -256,17 +481,18 @@ class Runner:
                 except Exception as e:
                     result = e
 
-                for id_ in ids:
-                    self.runner_results[id_] = result
+                self.__set_results(ids, result)
                 if isinstance(result, Exception):
                     time.sleep(5)
                     continue
                 try:
                     result = result.json()
+                    self.chat_prefetch_stats["requested"] += len(self.__prefetched_chats)
                     for obj in result["objects"]:
                         if not is_listener_request and obj["type"] == "orders_counters":
                             self.__orders_counters = obj
                         elif obj["type"] == "chat_bookmarks" and (data := obj.get("data")) and data.get("order"):
+                            self.__update_chat_activity(data["order"])
                             if not is_listener_request:
                                 self.__chat_bookmarks.append(obj)
                         elif (self.make_msg_requests and
@@ -274,6 +500,9 @@ class Runner:
                                (node := data.get("node")) and
                               (node_id:=node.get("id")) and (messages := data.get("messages")))):
                             last_msg_id = messages[-1]["id"]
+                            if node_id in self.__prefetched_chats and \
+                                    last_msg_id > self.last_messages_ids.get(node_id, 0):
+                                self.chat_prefetch_stats["hits"] += 1
                             if (last_msg_id > self.last_messages_ids.get(node_id, 0) and
                                     (node_id not in self.__chat_nodes or last_msg_id > self.__chat_nodes[node_id][-1])):
                                 self.__chat_nodes[node_id] = (obj, last_msg_id)
@@ -283,6 +512,7 @@ class Runner:
             except:
                 logger.error("Бабах")
                 logger.debug("TRACEBACK", exc_info=True)
+                self.__set_results(ids, Exception("Что-то пошло не так во время получения результата"))
 
 
 
@@ -379,7 +609,7 @@ class Runner:
 
             chat_with = chat.find("div", {"class": "media-user-name"}).text
             chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id,
-                                          user_msg_id, unread, str(chat))
+                                          user_msg_id, unread, str(chat) if self.account.keep_html else None)
             if last_msg_text_or_none is not None:
                 chat_obj.last_by_bot = by_bot
                 chat_obj.last_by_vertex = by_vertex
@@ -536,11 +766,32 @@ class Runner:
         if not self.make_order_requests:
             return events
 
+        # раз в 5 минут разбираем страницу полностью, чтобы не пропустить редкие изменения статусов закрытых заказов
+        # (например, возврат средств администратором после подтверждения)
+        full_scan = time.time() - self.__orders_full_scan_time > 300
+
+        def stop_at(order_id: str, status: types.OrderStatuses) -> bool:
+            """
+            Останавливает разбор на первом известном заказе с неизменившимся статусом, если все ожидающие
+            выполнения заказы уже просмотрены.
+            """
+            nonlocal stopped
+            if full_scan:
+                return False
+            pending_paid.discard(order_id)
+            if self.saved_orders is None or (known := self.saved_orders.get(order_id)) is None or \
+                    known.status != status or pending_paid:
+                return False
+            stopped = True
+            return True
+
         attempts = 3
         while attempts:
             attempts -= 1
+            pending_paid = set(self.__paid_orders)
+            stopped = False
             try:
-                orders_list = self.account.get_sales()[1]  # todo добавить возможность реакции на подтверждение очень старых заказов
+                orders_list = self.account.get_sales(stop_at=stop_at)[1]  # todo добавить возможность реакции на подтверждение очень старых заказов
                 break
             except exceptions.RequestFailedError as e:
                 logger.error(e)
@@ -552,20 +803,78 @@ class Runner:
             logger.error("Не удалось обновить список продаж: превышено кол-во попыток.")
             return events
 
-        now_orders = {}
+        is_first = self.saved_orders is None
+        if is_first:
+            self.saved_orders = OrderedDict()
+        if not stopped:
+            # страница просмотрена полностью: заказы, которых на ней нет, больше не отслеживаем
+            self.__paid_orders = set()
+            self.__orders_full_scan_time = time.time()
+
+        orders_changed = False
         for order in orders_list:
-            now_orders[order.id] = order
-            if self.saved_orders is None:
+            saved_order = self.saved_orders.get(order.id)
+            if is_first:
                 events.append(InitialOrderEvent(self.__last_order_event_tag, order))
-            elif order.id not in self.saved_orders:
+            elif saved_order is None:
+                orders_changed = True
                 events.append(NewOrderEvent(self.__last_order_event_tag, order))
+                self.prefetch_order(order)
                 if order.status == types.OrderStatuses.CLOSED:
                     events.append(OrderStatusChangedEvent(self.__last_order_event_tag, order))
-            elif order.status != self.saved_orders[order.id].status:
+            elif order.status != saved_order.status:
+                # предзагруженный объект заказа содержит прежний статус
+                self.account.forget_order(order.id)
+                orders_changed = True
                 events.append(OrderStatusChangedEvent(self.__last_order_event_tag, order))
-        self.saved_orders = now_orders
+
+            if order.status == types.OrderStatuses.PAID:
+                self.__paid_orders.add(order.id)
+            else:
+                self.__paid_orders.discard(order.id)
+
+        # самые новые заказы должны оказаться в конце LRU
+        for order in reversed(orders_list):
+            self.saved_orders[order.id] = order
+            self.saved_orders.move_to_end(order.id)
+
+        while len(self.saved_orders) > self.saved_orders_limit:
+            order_id, _ = self.saved_orders.popitem(last=False)
+            self.__paid_orders.discard(order_id)
+        if orders_changed:
+            # после продажи / изменения статуса заказа лоты аккаунта (кол-во товаров, активность) могли измениться
+            self.account.response_cache.invalidate(f"users/{self.account.id}/", "offerEdit?")
         return events
 
+    def prefetch_order(self, order: types.OrderShortcut):
+        """
+        Запускает фоновое получение полного объекта заказа в пуле потоков предзагрузки.
+        Результат сохраняется в самом объекте заказа (см. :meth:`FunPayAPI.types.BaseOrderInfo._start_order_attempt`)
+        и используется :meth:`FunPayAPI.account.Account.get_order` (см. :meth:`FunPayAPI.account.Account.share_order_future`).
+
+        :param order: краткий объект заказа.
+        :type order: :class:`FunPayAPI.types.OrderShortcut`
+        """
+        if self.__order_prefetch_executor is None or order.id == "ADTEST" or not order._start_order_attempt():
+            return
+        self.account.share_order_future(order.id, order._order_future)
+        self.__order_prefetch_executor.submit(self.__fetch_order, order)
+
+    def __fetch_order(self, order: types.OrderShortcut):
+        full_order = None
+        try:
+            for i in range(2, -1, -1):
+                try:
+                    full_order = self.account.get_order(order.id, use_prefetched=False)
+                    break
+                except:
+                    logger.warning(f"Произошла ошибка при предзагрузке заказа #{order.id}. Осталось {i} попыток.")
+                    logger.debug("TRACEBACK", exc_info=True)
+                    if i:
+                        time.sleep(1)
+        finally:
+            order._finish_order_attempt(full_order)
+
     def update_last_message(self, chat_id: int, message_id: int, message_text: str | None):
         """
         Обновляет сохраненный ID последнего сообщения чата.
@@ -597,19 +906,37 @@ class Runner:
             self.by_bot_ids[chat_id].append(message_id)
 
     def listen(self, requests_delay: int | float = 6.0,
-               ignore_exceptions: bool = True) -> Generator[InitialChatEvent | ChatsListChangedEvent |
-                                                            LastChatMessageChangedEvent | NewMessageEvent |
-                                                            InitialOrderEvent | OrdersListChangedEvent | NewOrderEvent |
-                                                            OrderStatusChangedEvent]:
+               ignore_exceptions: bool = True, min_delay: int | float | None = None,
+               max_delay: int | float | None = None, decay: float = 1.5) -> Generator[InitialChatEvent |
+                                                                                      ChatsListChangedEvent |
+                                                                                      LastChatMessageChangedEvent |
+                                                                                      NewMessageEvent |
+                                                                                      InitialOrderEvent |
+                                                                                      OrdersListChangedEvent |
+                                                                                      NewOrderEvent |
+                                                                                      OrderStatusChangedEvent]:
         """
         Бесконечно отправляет запросы для получения новых событий.
 
-        :param requests_delay: задержка между запросами (в секундах).
+        Задержка между запросами подбирается адаптивно: после новых сообщений / заказов она сбрасывается до
+        `min_delay`, а в периоды простоя увеличивается в `decay` раз после каждой пустой итерации (но не более
+        `max_delay`). Если недавно был получен ответ 429, задержка не опускается ниже `requests_delay`.
+
+        :param requests_delay: начальная задержка между запросами (в секундах).
         :type requests_delay: :obj:`int` or :obj:`float`, опционально
 
         :param ignore_exceptions: игнорировать ошибки?
         :type ignore_exceptions: :obj:`bool`, опционально
 
+        :param min_delay: минимальная задержка между запросами (в секундах). По умолчанию равна `requests_delay`.
+        :type min_delay: :obj:`int` or :obj:`float` or :obj:`None`, опционально
+
+        :param max_delay: максимальная задержка между запросами (в секундах). По умолчанию равна `requests_delay`.
+        :type max_delay: :obj:`int` or :obj:`float` or :obj:`None`, опционально
+
+        :param decay: множитель увеличения задержки после каждой итерации без активности.
+        :type decay: :obj:`float`, опционально
+
         :return: генератор событий FunPay.
         :rtype: :obj:`Generator` of :class:`FunPayAPI.updater.events.InitialChatEvent`,
             :class:`FunPayAPI.updater.events.ChatsListChangedEvent`,
@@ -619,9 +946,14 @@ class Runner:
             :class:`FunPayAPI.updater.events.NewOrderEvent`,
             :class:`FunPayAPI.updater.events.OrderStatusChangedEvent`
         """
+        min_delay = requests_delay if min_delay is None else min_delay
+        max_delay = requests_delay if max_delay is None else max_delay
+        min_delay, max_delay = min(min_delay, max_delay), max(min_delay, max_delay)
+        delay = max(min(requests_delay, max_delay), min_delay)
 
         while True:
             start_time = time.time()
+            activity = False
             try:
                 if not (self.__orders_counters and self.__chat_bookmarks):
                     updates_objects = self.get_updates()["objects"]
@@ -643,6 +975,7 @@ class Runner:
                 if is_request_made and not events:
                     # если сделали запрос и не получили эвентов, то сохраненные чаты нам больше не понадобятся
                     self.__chat_nodes = {}
+                activity = any(isinstance(event, (NewMessageEvent, NewOrderEvent)) for event in events)
                 for event in events:
                     yield event
             except Exception as e:
@@ -652,10 +985,17 @@ class Runner:
                     logger.error("Произошла ошибка при получении событий. "
                                  "(ничего страшного, если это сообщение появляется нечасто).")
                     logger.debug("TRACEBACK", exc_info=True)
+
+            if activity:
+                delay = min_delay
+            else:
+                delay = min(delay * decay, max_delay)
+
             iteration_time = time.time() - start_time
             if time.time() - self.account.last_429_err_time > 60:
-                rt = requests_delay - iteration_time
+                rt = delay - iteration_time
                 if rt > 0:
                     time.sleep(rt)
             else:
-                time.sleep(requests_delay)
+                delay = max(delay, requests_delay)
+                time.sleep(delay)
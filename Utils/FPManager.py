@@ -209,6 +209,97 @@ def load_pinned_plugins() -> list[str]:
             return []
 
 
+def cache_handlers_stats(handlers_stats: dict) -> None:
+    """
+    Кэширует статистику выполнения хэндлеров.
+
+    :param handlers_stats: статистика хэндлеров (см. Utils.handlers_stats.HandlersStats.to_dict).
+    """
+    if not os.path.exists("storage/cache"):
+        os.makedirs("storage/cache")
+
+    with open("storage/cache/handlers_stats.json", "w", encoding="utf-8") as f:
+        f.write(json.dumps(handlers_stats, ensure_ascii=False, indent=4))
+
+
+def cache_request_metrics(request_metrics: dict) -> None:
+    """
+    Кэширует снимок метрик запросов к FunPay.
+
+    :param request_metrics: снимок метрик (см. funpayautobot.get_request_metrics).
+    """
+    if not os.path.exists("storage/cache"):
+        os.makedirs("storage/cache")
+
+    with open("storage/cache/request_metrics.json", "w", encoding="utf-8") as f:
+        f.write(json.dumps(request_metrics, ensure_ascii=False, indent=4))
+
+
+def cache_session_snapshot(session_key: str, snapshot: dict) -> None:
+    """
+    Сохраняет снимок сессии аккаунта (данные аккаунта, профиль, баланс) для быстрого старта.
+
+    :param session_key: идентификатор аккаунта (FunPayAPI.Account.session_key).
+    :param snapshot: снимок сессии (только JSON-совместимые данные).
+    """
+    if not os.path.exists("storage/cache"):
+        os.makedirs("storage/cache")
+
+    path = f"storage/cache/session_{session_key}.json"
+    # запись во временный файл, чтобы одновременно запущенный процесс не прочитал файл частично
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot, ensure_ascii=False))
+    os.replace(f"{path}.tmp", path)
+
+
+def load_session_snapshot(session_key: str) -> dict | None:
+    """
+    Загружает снимок сессии аккаунта.
+
+    :param session_key: идентификатор аккаунта (FunPayAPI.Account.session_key).
+
+    :return: снимок сессии или None, если он не найден / поврежден.
+    """
+    path = f"storage/cache/session_{session_key}.json"
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.loads(f.read())
+        except json.decoder.JSONDecodeError:
+            return None
+
+
+def cache_exchange_rates(exchange_rates: dict) -> None:
+    """
+    Кэширует снимок курсов валют.
+
+    :param exchange_rates: снимок курсов (см. Utils.exchange_rates.ExchangeRates.to_dict).
+    """
+    if not os.path.exists("storage/cache"):
+        os.makedirs("storage/cache")
+
+    with open("storage/cache/exchange_rates.json", "w", encoding="utf-8") as f:
+        f.write(json.dumps(exchange_rates, ensure_ascii=False, indent=4))
+
+
+def load_exchange_rates() -> dict | None:
+    """
+    Загружает снимок курсов валют из кэша.
+
+    :return: снимок курсов или None, если он не найден / поврежден.
+    """
+    if not os.path.exists("storage/cache/exchange_rates.json"):
+        return None
+
+    with open("storage/cache/exchange_rates.json", "r", encoding="utf-8") as f:
+        try:
+            return json.loads(f.read())
+        except json.decoder.JSONDecodeError:
+            return None
+
+
 def cache_old_users(old_users: dict[int, float]):
     """
     Сохраняет в кэш список пользователей, которые уже писали на аккаунт.
@@ -139,12 +139,26 @@ def load_main_config(config_path: str):
             "port": "any+empty",
             "login": "any+empty",
             "password": "any+empty",
-            "check": ["0", "1"]
+            "check": ["0", "1"],
+            "pool": ["0", "1"],
+            "poolPolicy": ["sticky", "best"]
         },
 
         "Other": {
             "watermark": "any+empty",
             "requestsDelay": [str(i) for i in range(1, 101)],
+            "requestsDelayMin": [str(i) for i in range(1, 101)],
+            "requestsDelayMax": [str(i) for i in range(1, 101)],
+            "requestsDelayDecay": ["1", "1.25", "1.5", "1.75", "2", "2.5", "3"],
+            "handlersConcurrency": [str(i) for i in range(1, 11)],
+            "handlersTimeout": [str(i) for i in range(0, 601)],
+            "handlerTimeBudget": [str(i) for i in range(0, 601)],
+            "autoDisableSlowPlugins": ["0", "1"],
+            "recordRunner": ["0", "1"],
+            "fastStart": ["0", "1"],
+            "exchangeRatesInterval": [str(i) for i in range(60, 3601)],
+            "parserBackend": ["bs4", "lxml"],
+            "keepHTML": ["0", "1"],
             "language": ["ru", "en"]
         }
     }
@@ -226,6 +240,72 @@ def load_main_config(config_path: str):
                 config.set("Greetings", "onlyNewChats", "0")
                 with open("configs/_main.cfg", "w", encoding="utf-8") as f:
                     config.write(f)
+            elif section_name == "Other" and param_name == "requestsDelayMin" and param_name not in config[
+                section_name]:
+                # по умолчанию задержка остается постоянной, как до появления адаптивной задержки
+                config.set("Other", "requestsDelayMin", config["Other"].get("requestsDelay", "4"))
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "requestsDelayMax" and param_name not in config[
+                section_name]:
+                # по умолчанию задержка остается постоянной, как до появления адаптивной задержки
+                config.set("Other", "requestsDelayMax", config["Other"].get("requestsDelay", "4"))
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "requestsDelayDecay" and param_name not in config[
+                section_name]:
+                config.set("Other", "requestsDelayDecay", "1.5")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "handlersConcurrency" and param_name not in config[
+                section_name]:
+                config.set("Other", "handlersConcurrency", "1")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "handlersTimeout" and param_name not in config[
+                section_name]:
+                config.set("Other", "handlersTimeout", "60")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "handlerTimeBudget" and param_name not in config[
+                section_name]:
+                config.set("Other", "handlerTimeBudget", "10")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "autoDisableSlowPlugins" and param_name not in config[
+                section_name]:
+                config.set("Other", "autoDisableSlowPlugins", "0")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Proxy" and param_name == "pool" and param_name not in config[section_name]:
+                config.set("Proxy", "pool", "0")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Proxy" and param_name == "poolPolicy" and param_name not in config[section_name]:
+                config.set("Proxy", "poolPolicy", "sticky")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "fastStart" and param_name not in config[section_name]:
+                config.set("Other", "fastStart", "0")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "recordRunner" and param_name not in config[section_name]:
+                config.set("Other", "recordRunner", "0")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "exchangeRatesInterval" and \
+                    param_name not in config[section_name]:
+                config.set("Other", "exchangeRatesInterval", "600")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "parserBackend" and param_name not in config[section_name]:
+                config.set("Other", "parserBackend", "bs4")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
+            elif section_name == "Other" and param_name == "keepHTML" and param_name not in config[section_name]:
+                config.set("Other", "keepHTML", "0")
+                with open("configs/_main.cfg", "w", encoding="utf-8") as f:
+                    config.write(f)
 
             # END OF UPDATE
 
@@ -0,0 +1,271 @@
+"""
+В данном модуле описана шина событий, которая распределяет события FunPay по очередям хэндлеров,
+чтобы медленные хэндлеры плагинов не задерживали получение новых событий.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from fpsupport import funpayautobot
+
+from locales.localizer import Localizer
+from threading import Thread, Lock
+import logging
+import queue
+import time
+
+logger = logging.getLogger("FunPayAutobot.event_bus")
+localizer = Localizer()
+_ = localizer.translate
+
+
+NOTIFICATIONS_QUEUE = "builtin-notifications"
+"""Ключ очереди встроенных хэндлеров уведомлений (см. EventBus)."""
+
+
+class HandlersQueue:
+    """
+    Очередь цепочек хэндлеров одного плагина (или встроенных хэндлеров).
+    Цепочки выполняются потоками-обработчиками; хэндлеры внутри цепочки выполняются строго по порядку.
+    """
+
+    def __init__(self, bot: funpayautobot, name: str, concurrency: int, timeout: float, warn_after: float = 0,
+                 max_size: int = 1000, block: bool = False, run_chain: Callable | None = None):
+        """
+        :param bot: экземпляр кардинала.
+        :param name: название очереди (для логов).
+        :param concurrency: кол-во потоков-обработчиков.
+        :param timeout: время (в секундах), после которого зависший поток заменяется новым (0 - не заменять).
+            Одновременно заменено может быть не больше concurrency зависших потоков.
+        :param warn_after: время (в секундах), после которого о долгом выполнении цепочки пишется предупреждение
+            (используется, если timeout = 0; 0 - не предупреждать).
+        :param max_size: максимальное кол-во цепочек в очереди.
+        :param block: ждать ли освобождения места в заполненной очереди (иначе новая цепочка отбрасывается).
+        :param run_chain: функция, выполняющая цепочку (по умолчанию bot.run_handlers).
+        """
+        self.bot = bot
+        self.name = name
+        self.concurrency = max(int(concurrency), 1)
+        self.timeout = timeout
+        self.warn_after = warn_after
+        self.block = block
+        self.run_chain = run_chain or bot.run_handlers
+        self.queue: queue.Queue[tuple[list[Callable], tuple, Callable | None]] = queue.Queue(max(int(max_size), 1))
+        self.busy_since: dict[int, float] = {}  # {ID потока-обработчика: время начала выполнения цепочки}
+        self.dropped = 0  # кол-во цепочек, отброшенных из-за заполненной очереди
+        self.__warned: set[tuple[int, float]] = set()  # цепочки, о долгом выполнении которых уже предупредили
+        self.__workers_counter = 0
+        self.__abandoned = 0  # кол-во замененных (зависших) потоков, которые еще не завершились
+        self.__dropped_warned = 0  # кол-во отброшенных цепочек на момент последнего предупреждения
+        self.__drop_warning_time = 0
+        self.__lock = Lock()
+        for _ in range(self.concurrency):
+            self.__start_worker()
+
+    def __start_worker(self):
+        with self.__lock:
+            self.__workers_counter += 1
+            worker_id = self.__workers_counter
+        Thread(target=self.__worker, args=(worker_id,), daemon=True,
+               name=f"Handlers-{self.name}-{worker_id}").start()
+
+    def __worker(self, worker_id: int):
+        while True:
+            handlers_list, args, callback = self.queue.get()
+            self.busy_since[worker_id] = time.time()
+            try:
+                self.run_chain(handlers_list, args)
+                if callback:
+                    callback()
+            except:
+                logger.error(_("crd_handler_err"))
+                logger.debug("TRACEBACK", exc_info=True)
+            finally:
+                abandoned = self.busy_since.pop(worker_id, None) is None
+                self.queue.task_done()
+            if abandoned:
+                # вместо этого потока уже запущен новый
+                with self.__lock:
+                    self.__abandoned -= 1
+                return
+
+    def put(self, handlers_list: list[Callable], args: tuple, callback: Callable | None = None) -> bool:
+        """
+        Добавляет цепочку хэндлеров в очередь.
+
+        :param handlers_list: цепочка хэндлеров.
+        :param args: аргументы для хэндлеров.
+        :param callback: функция, которая будет вызвана после выполнения цепочки.
+
+        :return: True, если цепочка добавлена, False, если она отброшена из-за заполненной очереди.
+        """
+        if self.block:
+            self.queue.put((handlers_list, args, callback))
+            return True
+        try:
+            self.queue.put_nowait((handlers_list, args, callback))
+            return True
+        except queue.Full:
+            with self.__lock:
+                self.dropped += 1
+                dropped = self.dropped - self.__dropped_warned
+                if time.time() - self.__drop_warning_time < 60:
+                    return False
+                self.__dropped_warned, self.__drop_warning_time = self.dropped, time.time()
+            logger.warning(_("crd_handlers_queue_full", self.name, self.queue.maxsize, dropped))
+            return False
+
+    def check_timeouts(self):
+        """
+        Заменяет потоки-обработчики, которые выполняют цепочку дольше self.timeout секунд, новыми потоками.
+        Зависший поток завершится сам после выполнения текущей цепочки. Пока не завершились self.concurrency
+        замененных потоков, новые потоки не запускаются (только предупреждение).
+        Если тайм-аут не задан, только предупреждает о цепочках, которые выполняются дольше self.warn_after секунд.
+        """
+        now = time.time()
+        if not self.timeout:
+            if not self.warn_after:
+                return
+            busy = set(self.busy_since.items())
+            self.__warned &= busy
+            for worker_id, start_time in busy - self.__warned:
+                if now - start_time > self.warn_after:
+                    self.__warned.add((worker_id, start_time))
+                    logger.warning(_("crd_handlers_slow", self.name, int(now - start_time)))
+            return
+        self.__warned &= set(self.busy_since.items())
+        for worker_id, start_time in list(self.busy_since.items()):
+            if now - start_time <= self.timeout:
+                continue
+            with self.__lock:
+                if self.__abandoned >= self.concurrency:
+                    replace = False
+                else:
+                    replace = self.busy_since.pop(worker_id, None) is not None
+                    self.__abandoned += replace
+            if replace:
+                logger.warning(_("crd_handlers_timeout", self.name, int(now - start_time)))
+                self.__start_worker()
+            elif (worker_id, start_time) not in self.__warned and worker_id in self.busy_since:
+                self.__warned.add((worker_id, start_time))
+                logger.warning(_("crd_handlers_slow", self.name, int(now - start_time)))
+
+
+class EventBus:
+    """
+    Шина событий.
+
+    Встроенные хэндлеры (plugin_uuid is None) выполняются одной упорядоченной цепочкой в отдельном потоке
+    (ответы, автовыдача и т.д.). Встроенные хэндлеры уведомлений (notification = True) в этой цепочке не
+    выполняются: когда цепочка доходит до такого хэндлера, он отправляется в отдельную очередь уведомлений
+    и выполняется параллельно с оставшейся частью цепочки.
+    После выполнения встроенной цепочки хэндлеры каждого плагина отправляются в очередь этого плагина.
+    Кол-во потоков и тайм-аут очереди плагина можно переопределить в плагине переменными
+    HANDLERS_CONCURRENCY и HANDLERS_TIMEOUT.
+
+    Очереди ограничены queue_size цепочками. Когда заполнена очередь встроенной цепочки, publish ждет
+    освобождения места (получение новых событий притормаживается); цепочки для заполненных очередей уведомлений
+    и плагинов отбрасываются с предупреждением.
+    """
+
+    def __init__(self, bot: funpayautobot, concurrency: int = 1, timeout: float = 60, queue_size: int = 1000):
+        """
+        :param bot: экземпляр кардинала.
+        :param concurrency: кол-во потоков-обработчиков на плагин (и на очередь уведомлений) по умолчанию.
+        :param timeout: тайм-аут цепочки хэндлеров по умолчанию (в секундах, 0 - без тайм-аута).
+        :param queue_size: максимальное кол-во цепочек в одной очереди.
+        """
+        self.bot = bot
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.queues: dict[str | None, HandlersQueue] = {}
+        self.__lock = Lock()
+        Thread(target=self.__watchdog_loop, daemon=True, name="EventBusWatchdog").start()
+
+    def get_queue(self, plugin_uuid: str | None) -> HandlersQueue:
+        """
+        Возвращает (и при необходимости создает) очередь хэндлеров плагина.
+
+        :param plugin_uuid: UUID плагина (None для встроенных хэндлеров,
+            NOTIFICATIONS_QUEUE для встроенных хэндлеров уведомлений).
+
+        :return: очередь хэндлеров.
+        """
+        with self.__lock:
+            if plugin_uuid not in self.queues:
+                if plugin_uuid is None:
+                    # встроенные хэндлеры зависят друг от друга, поэтому всегда выполняются в одном потоке:
+                    # зависший поток не заменяется (иначе цепочки выполнялись бы параллельно и не по порядку)
+                    handlers_queue = HandlersQueue(self.bot, "builtin", 1, 0, self.timeout, self.queue_size,
+                                                   block=True, run_chain=self.__run_builtin_chain)
+                elif plugin_uuid == NOTIFICATIONS_QUEUE:
+                    handlers_queue = HandlersQueue(self.bot, NOTIFICATIONS_QUEUE, self.concurrency, self.timeout,
+                                                   max_size=self.queue_size)
+                else:
+                    plugin = self.bot.plugins.get(plugin_uuid)
+                    module = plugin.plugin if plugin else None
+                    handlers_queue = HandlersQueue(self.bot, plugin.name if plugin else plugin_uuid,
+                                                   getattr(module, "HANDLERS_CONCURRENCY", self.concurrency),
+                                                   getattr(module, "HANDLERS_TIMEOUT", self.timeout),
+                                                   max_size=self.queue_size)
+                self.queues[plugin_uuid] = handlers_queue
+            return self.queues[plugin_uuid]
+
+    def publish(self, handlers_list: list[Callable], args: tuple):
+        """
+        Распределяет хэндлеры события по цепочкам и ставит их в очереди. Не ждет выполнения хэндлеров.
+
+        :param handlers_list: список хэндлеров события.
+        :param args: аргументы для хэндлеров.
+        """
+        chains: dict[str | None, list[Callable]] = {}
+        for func in handlers_list:
+            chains.setdefault(getattr(func, "plugin_uuid", None), []).append(func)
+        builtin_chain = chains.pop(None, [])
+
+        def dispatch_plugins_chains():
+            for uuid, chain in chains.items():
+                self.get_queue(uuid).put(chain, args)
+
+        # даже пустая встроенная цепочка проходит через очередь, чтобы сохранить порядок событий в очередях плагинов
+        self.get_queue(None).put(builtin_chain, args, dispatch_plugins_chains)
+
+    def __run_builtin_chain(self, handlers_list: list[Callable], args: tuple):
+        """
+        Выполняет встроенную цепочку по порядку. Хэндлеры уведомлений отправляются в очередь уведомлений в тот момент,
+        когда до них доходит цепочка (атрибуты события, выставленные предыдущими хэндлерами, уже доступны).
+
+        :param handlers_list: встроенная цепочка хэндлеров.
+        :param args: аргументы для хэндлеров.
+        """
+        ordered = []
+        for func in handlers_list:
+            if not getattr(func, "notification", False):
+                ordered.append(func)
+                continue
+            if ordered:
+                self.bot.run_handlers(ordered, args)
+                ordered = []
+            self.get_queue(NOTIFICATIONS_QUEUE).put([func], args)
+        if ordered:
+            self.bot.run_handlers(ordered, args)
+
+    def get_queues_sizes(self) -> dict[str, int]:
+        """
+        :return: кол-во цепочек, ожидающих выполнения, в каждой очереди {название очереди: кол-во}.
+        """
+        return {i.name: i.queue.qsize() for i in list(self.queues.values())}
+
+    def __watchdog_loop(self):
+        while True:
+            time.sleep(1)
+            try:
+                self.bot.check_hung_handlers()
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+            for handlers_queue in list(self.queues.values()):
+                try:
+                    handlers_queue.check_timeouts()
+                except:
+                    logger.debug("TRACEBACK", exc_info=True)
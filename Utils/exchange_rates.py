@@ -0,0 +1,196 @@
+"""
+В данном модуле описан сервис курсов валют: снимок курсов относительно валюты аккаунта, из которого
+вычисляются курсы для любой пары валют.
+"""
+from __future__ import annotations
+
+from typing import Callable
+from threading import Lock, Thread
+import logging
+import time
+
+from FunPayAPI.common.enums import Currency
+
+logger = logging.getLogger("FunPayAutobot.exchange_rates")
+
+CURRENCIES = (Currency.RUB, Currency.USD, Currency.EUR)
+"""Валюты баланса FunPay."""
+
+
+class ExchangeRates:
+    """
+    Сервис курсов валют.
+
+    Снимок курсов - кол-во единиц каждой валюты за 1 единицу базовой валюты (валюты аккаунта). Курс любой пары
+    валют вычисляется из снимка заранее, поэтому получение курса не выполняет запросов, если снимок уже есть.
+    Устаревший снимок обновляется в отдельном потоке, пока используется предыдущий.
+
+    :param fetch: функция получения курса (FunPayAPI.Account.get_exchange_rate): принимает валюту, возвращает
+        X, где X <валюта> = 1 <валюта аккаунта>, и валюту аккаунта.
+    :type fetch: :obj:`Callable`
+
+    :param interval: интервал обновления снимка (в секундах).
+    :type interval: :obj:`float`, опционально
+
+    :param on_update: функция, вызываемая после обновления снимка (например, для сохранения в кэш).
+        Принимает снимок (см. :meth:`to_dict`).
+    :type on_update: :obj:`Callable` or :obj:`None`, опционально
+    """
+
+    def __init__(self, fetch: Callable[[Currency], tuple[float, Currency]], interval: float = 600,
+                 on_update: Callable[[dict], None] | None = None):
+        self.fetch = fetch
+        self.interval: float = interval
+        self.on_update = on_update
+        self.base: Currency | None = None
+        """Базовая валюта снимка (валюта аккаунта)."""
+        self.rates: dict[Currency, float] = {}
+        """Снимок курсов {валюта: кол-во единиц валюты за 1 единицу базовой валюты}."""
+        self.updated: float = 0
+        """Время получения снимка."""
+        self.__pairs: dict[tuple[Currency, Currency], float] = {}
+        self.__refresh_lock = Lock()
+        self.__refreshing = False
+
+    @property
+    def age(self) -> float:
+        """Возраст снимка (в секундах)."""
+        return time.time() - self.updated
+
+    def __set_snapshot(self, base: Currency, rates: dict[Currency, float], updated: float):
+        # курсы всех пар считаются один раз, а словарь подменяется целиком, чтобы чтение не требовало блокировок
+        self.__pairs = {(c1, c2): rates[c2] / rates[c1] for c1 in rates for c2 in rates}
+        self.base, self.rates, self.updated = base, rates, updated
+
+    def refresh(self) -> bool:
+        """
+        Получает новый снимок курсов (по одному запросу на каждую валюту, кроме валюты аккаунта).
+
+        :return: True, если снимок обновлен, False, если снимок уже обновляется в другом потоке.
+        """
+        if not self.__refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            base = self.base
+            rates = {}
+            for currency in CURRENCIES:
+                if currency == base:
+                    continue
+                rate, now_currency = self.fetch(currency)
+                if base is not None and now_currency != base:
+                    # валюта аккаунта изменилась - ранее полученные курсы относятся к другой базе
+                    rates = {}
+                base = now_currency
+                rates[currency] = rate
+            rates[base] = 1
+            missing = [i for i in CURRENCIES if i not in rates]
+            for currency in missing:
+                rate, now_currency = self.fetch(currency)
+                if now_currency != base:
+                    raise Exception("Валюта аккаунта изменилась во время получения курсов.")
+                rates[currency] = rate
+            self.__set_snapshot(base, rates, time.time())
+        finally:
+            self.__refresh_lock.release()
+        if self.on_update:
+            try:
+                self.on_update(self.to_dict())
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+        return True
+
+    def refresh_async(self):
+        """
+        Запускает обновление снимка в отдельном потоке (если оно еще не запущено).
+        """
+        if self.__refreshing:
+            return
+        self.__refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except:
+                logger.warning("Не удалось обновить курсы валют.")
+                logger.debug("TRACEBACK", exc_info=True)
+            finally:
+                self.__refreshing = False
+
+        Thread(target=run, daemon=True).start()
+
+    def get(self, base_currency: Currency, target_currency: Currency, max_age: float | None = None,
+            attempts: int = 3) -> float:
+        """
+        Возвращает курс обмена между двумя валютами.
+        Если снимок старше max_age секунд, возвращается курс из него, а снимок обновляется в отдельном потоке.
+        Запрос выполняется в текущем потоке, только если снимка еще нет.
+
+        :param base_currency: исходная валюта.
+        :param target_currency: целевая валюта.
+        :param max_age: максимальный возраст снимка (в секундах), по умолчанию - интервал обновления.
+        :param attempts: кол-во попыток получить снимок, если его еще нет.
+
+        :return: коэффициент обмена, где 1 единица base_currency = X единиц target_currency.
+        """
+        if base_currency == target_currency:
+            return 1
+        rate = self.__pairs.get((base_currency, target_currency))
+        if rate is not None:
+            if self.age > (self.interval if max_age is None else max_age):
+                self.refresh_async()
+            return rate
+
+        for i in range(attempts - 1, -1, -1):
+            try:
+                self.refresh()
+            except:
+                logger.warning(f"Не удалось получить курс обмена. Осталось попыток: {i}")
+                logger.debug("TRACEBACK", exc_info=True)
+            if (rate := self.__pairs.get((base_currency, target_currency))) is not None:
+                return rate
+            time.sleep(1)
+        raise Exception("Не удалось получить курс обмена: превышено количество попыток.")
+
+    def loop(self):
+        """
+        Запускает бесконечный цикл обновления снимка курсов.
+        """
+        while True:
+            delay = self.interval - self.age
+            if delay > 0:
+                time.sleep(delay)
+                continue
+            try:
+                self.refresh()
+            except:
+                logger.warning("Не удалось обновить курсы валют.")
+                logger.debug("TRACEBACK", exc_info=True)
+                time.sleep(min(60, self.interval))
+
+    def to_dict(self) -> dict:
+        """
+        :return: снимок курсов {"base": код базовой валюты, "rates": {код валюты: курс}, "time": время получения}.
+        """
+        return {"base": self.base.code if self.base else None,
+                "rates": {currency.code: rate for currency, rate in self.rates.items()},
+                "time": self.updated}
+
+    def load(self, data: dict | None) -> bool:
+        """
+        Загружает снимок курсов, сохраненный ранее (см. :meth:`to_dict`).
+
+        :param data: снимок курсов.
+
+        :return: True, если снимок загружен, False, если он пустой / поврежден.
+        """
+        try:
+            codes = {currency.code: currency for currency in CURRENCIES}
+            rates = {codes[code]: float(rate) for code, rate in data["rates"].items()}
+            base = codes[data["base"]]
+            if rates.get(base) != 1 or set(rates) != set(CURRENCIES):
+                return False
+            self.__set_snapshot(base, rates, float(data["time"]))
+            return True
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+            return False
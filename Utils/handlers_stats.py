@@ -0,0 +1,174 @@
+"""
+В данном модуле описан сборщик статистики выполнения хэндлеров (кол-во вызовов, время выполнения, ошибки).
+"""
+from __future__ import annotations
+from typing import Callable
+
+from collections import deque
+from threading import Lock, get_ident
+import time
+
+
+class HandlerStats:
+    """
+    Статистика одного хэндлера.
+    """
+
+    def __init__(self, plugin_uuid: str | None, name: str, samples_limit: int = 500):
+        """
+        :param plugin_uuid: UUID плагина (None для встроенных хэндлеров).
+        :param name: название хэндлера.
+        :param samples_limit: кол-во последних замеров, по которым считаются перцентили.
+        """
+        self.plugin_uuid = plugin_uuid
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.samples: deque[float] = deque(maxlen=samples_limit)
+        self.errors = 0
+        self.last_error: str | None = None
+        self.last_error_time: float | None = None
+        self.slow_calls = 0
+        self.slow_in_row = 0
+
+    def percentile(self, q: float) -> float:
+        """
+        :param q: перцентиль (от 0 до 1).
+
+        :return: время выполнения (в секундах), не превышаемое в q последних вызовов.
+        """
+        samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[round(q * (len(samples) - 1))]
+
+    def to_dict(self) -> dict:
+        return {
+            "plugin_uuid": self.plugin_uuid,
+            "name": self.name,
+            "calls": self.calls,
+            "total_time": round(self.total_time, 4),
+            "max_time": round(self.max_time, 4),
+            "p50": round(self.percentile(0.5), 4),
+            "p99": round(self.percentile(0.99), 4),
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+            "slow_calls": self.slow_calls
+        }
+
+
+class HandlersStats:
+    """
+    Статистика выполнения всех хэндлеров ({(UUID плагина, название хэндлера): статистика}).
+    """
+
+    def __init__(self):
+        self.handlers: dict[tuple[str | None, str], HandlerStats] = {}
+        # {ID потока: [выполняемый хэндлер, время начала выполнения, сообщено ли о зависании]}
+        self.running: dict[int, list] = {}
+        self.__lock = Lock()
+
+    def start(self, func: Callable) -> None:
+        """
+        Отмечает начало выполнения хэндлера в текущем потоке.
+
+        :param func: хэндлер.
+        """
+        with self.__lock:
+            self.running[get_ident()] = [func, time.time(), False]
+
+    def finish(self) -> None:
+        """
+        Отмечает завершение выполнения хэндлера в текущем потоке.
+        """
+        with self.__lock:
+            self.running.pop(get_ident(), None)
+
+    def get_hung(self, budget: float) -> list[tuple[Callable, float]]:
+        """
+        Возвращает хэндлеры, которые выполняются дольше budget секунд и о которых еще не сообщалось.
+        О каждом вызове хэндлера сообщается один раз.
+
+        :param budget: допустимое время выполнения (в секундах).
+
+        :return: [(хэндлер, время выполнения (в секундах))].
+        """
+        now = time.time()
+        result = []
+        with self.__lock:
+            for entry in self.running.values():
+                func, start_time, reported = entry
+                if not reported and now - start_time > budget:
+                    entry[2] = True
+                    result.append((func, now - start_time))
+        return result
+
+    def record(self, func: Callable, duration: float, error: Exception | None = None,
+               budget: float = 0) -> HandlerStats:
+        """
+        Сохраняет результат вызова хэндлера.
+
+        :param func: хэндлер.
+        :param duration: время выполнения (в секундах).
+        :param error: исключение, если хэндлер завершился с ошибкой.
+        :param budget: допустимое время выполнения (в секундах, 0 - без ограничения).
+
+        :return: статистика хэндлера.
+        """
+        plugin_uuid = getattr(func, "plugin_uuid", None)
+        name = getattr(func, "__qualname__", None) or repr(func)
+        key = (plugin_uuid, name)
+        with self.__lock:
+            if key not in self.handlers:
+                self.handlers[key] = HandlerStats(plugin_uuid, name)
+            stats = self.handlers[key]
+            stats.calls += 1
+            stats.total_time += duration
+            stats.max_time = max(stats.max_time, duration)
+            stats.samples.append(duration)
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = f"{type(error).__name__}: {error}"[:300]
+                stats.last_error_time = time.time()
+            if budget and duration > budget:
+                stats.slow_calls += 1
+                stats.slow_in_row += 1
+            else:
+                stats.slow_in_row = 0
+        return stats
+
+    def by_plugins(self) -> dict[str | None, dict]:
+        """
+        :return: статистика, сгруппированная по плагинам и отсортированная по суммарному времени выполнения
+            {UUID плагина: {"calls": ..., "total_time": ..., "p50": ..., "p99": ..., "errors": ...,
+            "last_error": ..., "handlers": [...]}}.
+        """
+        result = {}
+        samples = {}
+        # потоки-обработчики дописывают статистику во время сбора, поэтому она копируется под блокировкой
+        with self.__lock:
+            for stats in sorted(self.handlers.values(), key=lambda x: x.total_time, reverse=True):
+                plugin = result.setdefault(stats.plugin_uuid, {"calls": 0, "total_time": 0.0, "errors": 0,
+                                                               "last_error": None, "last_error_time": None,
+                                                               "handlers": []})
+                plugin["calls"] += stats.calls
+                plugin["total_time"] += stats.total_time
+                plugin["errors"] += stats.errors
+                if stats.last_error_time and (plugin["last_error_time"] or 0) < stats.last_error_time:
+                    plugin["last_error"], plugin["last_error_time"] = stats.last_error, stats.last_error_time
+                plugin["handlers"].append(stats.to_dict())
+                samples.setdefault(stats.plugin_uuid, []).extend(stats.samples)
+
+        for plugin_uuid, plugin in result.items():
+            plugin_samples = sorted(samples[plugin_uuid])
+            plugin["p50"] = plugin_samples[round(0.5 * (len(plugin_samples) - 1))] if plugin_samples else 0.0
+            plugin["p99"] = plugin_samples[round(0.99 * (len(plugin_samples) - 1))] if plugin_samples else 0.0
+        return dict(sorted(result.items(), key=lambda x: x[1]["total_time"], reverse=True))
+
+    def to_dict(self) -> dict:
+        with self.__lock:
+            return {"time": time.time(),
+                    "handlers": [i.to_dict() for i in sorted(self.handlers.values(),
+                                                             key=lambda x: x.total_time, reverse=True)]}
@@ -0,0 +1,110 @@
+"""
+В данном модуле описан планировщик поднятия лотов: очередь (куча) категорий по времени следующего поднятия.
+"""
+from __future__ import annotations
+
+from threading import Lock
+import heapq
+import time
+
+
+class RaiseScheduler:
+    """
+    Планировщик поднятия лотов.
+
+    Для каждой категории (игры) хранится время следующего поднятия, интервал между поднятиями
+    (определяется по ответам FunPay) и задержка фактического поднятия относительно запланированного времени.
+    """
+
+    def __init__(self):
+        self.heap: list[tuple[float, int]] = []
+        self.next_times: dict[int, float] = {}  # {ID категории: время следующего поднятия}
+        self.running: set[int] = set()  # ID категорий, которые поднимаются в данный момент
+        self.intervals: dict[int, float] = {}  # {ID категории: интервал между поднятиями (в секундах)}
+        self.stats: dict[int, dict] = {}  # {ID категории: {"raises": ..., "last_lag": ..., "max_lag": ...}}
+        self.__lock = Lock()
+
+    def schedule(self, category_id: int, next_time: float):
+        """
+        Планирует поднятие категории.
+
+        :param category_id: ID категории.
+        :param next_time: время поднятия.
+        """
+        with self.__lock:
+            self.running.discard(category_id)
+            self.next_times[category_id] = next_time
+            heapq.heappush(self.heap, (next_time, category_id))
+
+    def sync(self, categories_ids: list[int]):
+        """
+        Добавляет новые категории (с поднятием сейчас) и удаляет категории, в которых больше нет лотов.
+
+        :param categories_ids: ID категорий, лоты которых нужно поднимать.
+        """
+        now = time.time()
+        categories_ids = set(categories_ids)
+        for category_id in categories_ids - set(self.next_times) - self.running:
+            self.schedule(category_id, now)
+        with self.__lock:
+            for category_id in set(self.next_times) - categories_ids:
+                del self.next_times[category_id]
+
+    def pop_due(self) -> list[tuple[int, float]]:
+        """
+        Извлекает категории, время поднятия которых наступило.
+
+        :return: список (ID категории, запланированное время поднятия).
+        """
+        now = time.time()
+        result = []
+        with self.__lock:
+            while self.heap and self.heap[0][0] <= now:
+                next_time, category_id = heapq.heappop(self.heap)
+                # устаревшие записи (категория перепланирована или удалена) пропускаются
+                if self.next_times.get(category_id) != next_time:
+                    continue
+                del self.next_times[category_id]
+                self.running.add(category_id)
+                result.append((category_id, next_time))
+        return result
+
+    def next_time(self) -> float | None:
+        """
+        :return: ближайшее запланированное время поднятия или None, если поднимать нечего.
+        """
+        with self.__lock:
+            while self.heap and self.next_times.get(self.heap[0][1]) != self.heap[0][0]:
+                heapq.heappop(self.heap)
+            return self.heap[0][0] if self.heap else None
+
+    def record_raise(self, category_id: int, due_time: float, start_time: float):
+        """
+        Сохраняет задержку поднятия категории относительно запланированного времени.
+
+        :param category_id: ID категории.
+        :param due_time: запланированное время поднятия.
+        :param start_time: фактическое время начала поднятия.
+        """
+        lag = max(start_time - due_time, 0)
+        with self.__lock:
+            stats = self.stats.setdefault(category_id, {"raises": 0, "last_lag": 0.0, "max_lag": 0.0,
+                                                        "total_lag": 0.0})
+            stats["raises"] += 1
+            stats["last_lag"] = lag
+            stats["max_lag"] = max(stats["max_lag"], lag)
+            stats["total_lag"] += lag
+
+    def get_stats(self) -> dict[int, dict]:
+        """
+        :return: статистика категорий {ID категории: {"raises": ..., "last_lag": ..., "max_lag": ...,
+            "avg_lag": ..., "interval": ..., "next_time": ...}}.
+        """
+        with self.__lock:
+            return {category_id: {"raises": stats["raises"],
+                                  "last_lag": round(stats["last_lag"], 3),
+                                  "max_lag": round(stats["max_lag"], 3),
+                                  "avg_lag": round(stats["total_lag"] / stats["raises"], 3),
+                                  "interval": self.intervals.get(category_id),
+                                  "next_time": self.next_times.get(category_id)}
+                    for category_id, stats in self.stats.items()}
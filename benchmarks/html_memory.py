@@ -0,0 +1,86 @@
+"""
+Бенчмарк пикового потребления памяти при разборе сохраненных страниц FunPay.
+
+Сравниваются способы разбора:
+    decode - response.content.decode() + BeautifulSoup (прежний способ);
+    bytes  - BeautifulSoup по байтам ответа (без промежуточной строки);
+    lxml   - разбор lxml из байтов ответа (FunPayAPI.common.utils.parse_html).
+Каждый способ запускается в отдельном процессе, чтобы пиковый RSS не зависел от предыдущих замеров.
+
+Пример:
+    python benchmarks/html_memory.py pages/orders_trade.html pages/user.html
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ("decode", "bytes", "lxml")
+
+
+def parse(mode: str, content: bytes):
+    if mode == "decode":
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(content.decode(), "lxml")
+    elif mode == "bytes":
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(content, "lxml", from_encoding="utf-8")
+    else:
+        from FunPayAPI.common.utils import parse_html
+        return parse_html(content)
+
+
+def run_mode(mode: str, paths: list[str]):
+    """
+    Разбирает страницы одним способом и выводит результат (вызывается в отдельном процессе).
+    """
+    import bs4  # импорт библиотек не должен попадать в замер
+    import lxml.html
+    from FunPayAPI.common import utils
+
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    for content in pages:
+        tree = parse(mode, content)
+        del tree
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode} {duration:.4f} {peak} {(rss_after - rss_before) * 1024}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк потребления памяти при разборе страниц FunPay.")
+    parser.add_argument("paths", nargs="+", help="сохраненные HTML страницы")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.paths)
+        return
+
+    size = sum(os.path.getsize(i) for i in args.paths)
+    print(f"Страниц: {len(args.paths)}, общий размер: {size / 1024:.1f} КБ")
+    print(f"{'способ':<8}{'время, с.':>12}{'пик Python, КБ':>18}{'прирост RSS, КБ':>18}")
+    for mode in MODES:
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode, *args.paths],
+                                capture_output=True, text=True, check=True).stdout.split()
+        _, duration, peak, rss = output
+        print(f"{mode:<8}{float(duration):>12.4f}{int(peak) / 1024:>18.1f}{int(rss) / 1024:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
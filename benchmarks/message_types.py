@@ -0,0 +1,218 @@
+"""
+Проверка совпадения и бенчмарк определения типа сообщения (FunPayAPI.common.utils.MessageTypeClassifier).
+
+Сравниваются способы определения типа:
+    chain      - последовательная проверка регулярных выражений (прежний Message.get_message_type);
+    classifier - MessageTypeClassifier (выражение проверяется, только если в тексте есть его фраза).
+
+Корпус - размеченные сообщения на ru / en / uk: системные сообщения каждого типа, обычные сообщения, сообщения
+с ID заказа и "поддельные" системные сообщения. Украинские системные сообщения выражениями RegularExpressions
+не описаны, поэтому размечены как NON_SYSTEM (разметка отражает текущее поведение).
+Дополнительно можно передать свой корпус: JSON Lines с полями locale, type (имя MessageTypes) и text.
+
+Пример:
+    python benchmarks/message_types.py --corpus messages.jsonl --repeat 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FunPayAPI.common.enums import MessageTypes
+from FunPayAPI.common.utils import RegularExpressions, MessageTypeClassifier
+
+T = MessageTypes
+TEMPLATES = {
+    "ru": (
+        (T.ORDER_PURCHASED, "Покупатель {b} оплатил заказ #{o}. Dota 2, Аккаунты, 1 шт.\n{b}, не забудьте потом "
+                            "нажать кнопку «Подтвердить выполнение заказа»."),
+        (T.ORDER_PURCHASED, "Покупатель {b} оплатил заказ #{o}. WoW, Золото, 1 000 шт.\n{b}, не забудьте потом "
+                            "нажать кнопку «Подтвердить получение валюты»."),
+        (T.ORDER_CONFIRMED, "Покупатель {b} подтвердил успешное выполнение заказа #{o} и отправил деньги продавцу {s}."),
+        (T.NEW_FEEDBACK, "Покупатель {b} написал отзыв к заказу #{o}."),
+        (T.FEEDBACK_CHANGED, "Покупатель {b} изменил отзыв к заказу #{o}."),
+        (T.FEEDBACK_DELETED, "Покупатель {b} удалил отзыв к заказу #{o}."),
+        (T.NEW_FEEDBACK_ANSWER, "Продавец {s} ответил на отзыв к заказу #{o}."),
+        (T.FEEDBACK_ANSWER_CHANGED, "Продавец {s} изменил ответ на отзыв к заказу #{o}."),
+        (T.FEEDBACK_ANSWER_DELETED, "Продавец {s} удалил ответ на отзыв к заказу #{o}."),
+        (T.ORDER_REOPENED, "Заказ #{o} открыт повторно."),
+        (T.REFUND, "Продавец {s} вернул деньги покупателю {b} по заказу #{o}."),
+        (T.PARTIAL_REFUND, "Часть средств по заказу #{o} возвращена покупателю."),
+        (T.ORDER_CONFIRMED_BY_ADMIN, "Администратор {a} подтвердил успешное выполнение заказа #{o} и отправил деньги "
+                                     "продавцу {s}."),
+        (T.REFUND_BY_ADMIN, "Администратор {a} вернул деньги покупателю {b} по заказу #{o}."),
+        (T.DISCORD, "Вы можете перейти в Discord. Внимание: общение за пределами сервера FunPay считается нарушением "
+                    "правил."),
+        (T.DEAR_VENDORS, "Уважаемые продавцы, не доверяйте сообщениям в чате! Перед выполнением заказа всегда "
+                         "проверяйте наличие оплаты в разделе «Мои продажи»."),
+        # оплата без второй части и прочие сообщения с ID заказа
+        (T.NON_SYSTEM, "Покупатель {b} оплатил заказ #{o}."),
+        (T.NON_SYSTEM, "Здравствуйте! По заказу #{o} все получил, спасибо."),
+        (T.NON_SYSTEM, "Покупатель Вася написал отзыв к заказу #{o}."),
+        # "поддельные" сообщения совпадают с выражениями так же, как и настоящие
+        (T.NEW_FEEDBACK, "смотри: Покупатель {b} написал отзыв к заказу #{o}. это правда?"),
+        (T.ORDER_CONFIRMED, "Покупатель {b} удалил отзыв к заказу #{o}. Покупатель {b} подтвердил успешное "
+                            "выполнение заказа #{o} и отправил деньги продавцу {s}."),
+        (T.NON_SYSTEM, "Здравствуйте! Когда будет выполнен заказ?"),
+        (T.NON_SYSTEM, "Добрый день, товар еще в наличии? Могу оплатить прямо сейчас."),
+        (T.NON_SYSTEM, "ок"),
+    ),
+    "en": (
+        (T.ORDER_PURCHASED, "The buyer {b} has paid for order #{o}. Dota 2, Accounts, 1 pcs.\n{b}, do not forget to "
+                            "press the «Confirm order fulfilment» button once you finish."),
+        (T.ORDER_PURCHASED, "The buyer {b} has paid for order #{o}. WoW, Gold, 1000 pcs.\n{b}, do not forget to "
+                            "press the «Confirm currency receipt» button once you finish."),
+        (T.ORDER_CONFIRMED, "The buyer {b} has confirmed that order #{o} has been fulfilled successfully and that the "
+                            "seller {s} has been paid."),
+        (T.NEW_FEEDBACK, "The buyer {b} has given feedback to the order #{o}."),
+        (T.FEEDBACK_CHANGED, "The buyer {b} has edited their feedback to the order #{o}."),
+        (T.FEEDBACK_DELETED, "The buyer {b} has deleted their feedback to the order #{o}."),
+        (T.NEW_FEEDBACK_ANSWER, "The seller {s} has replied to their feedback to the order #{o}."),
+        (T.FEEDBACK_ANSWER_CHANGED, "The seller {s} has edited a reply to their feedback to the order #{o}."),
+        (T.FEEDBACK_ANSWER_DELETED, "The seller {s} has deleted a reply to their feedback to the order #{o}."),
+        (T.ORDER_REOPENED, "Order #{o} has been reopened."),
+        (T.REFUND, "The seller {s} has refunded the buyer {b} on order #{o}."),
+        (T.PARTIAL_REFUND, "A part of the funds pertaining to the order #{o} has been refunded."),
+        (T.ORDER_CONFIRMED_BY_ADMIN, "The administrator {a} has confirmed that order #{o} has been fulfilled "
+                                     "successfully and that the seller {s} has been paid."),
+        (T.REFUND_BY_ADMIN, "The administrator {a} has refunded the buyer {b} on order #{o}."),
+        (T.DISCORD, "You can switch to Discord. However, note that friending someone is considered a violation "
+                    "rules."),
+        (T.DEAR_VENDORS, "Dear vendors, do not rely on chat messages! Before you process an order, you should always "
+                         "check whether you've been paid in «My sales» section."),
+        (T.NON_SYSTEM, "Hi! Is order #{o} done?"),
+        (T.NON_SYSTEM, "Hello, how long will it take?"),
+        (T.NON_SYSTEM, "thx"),
+    ),
+    "uk": (
+        (T.NON_SYSTEM, "Покупець {b} оплатив замовлення #{o}. Dota 2, Акаунти, 1 шт.\n{b}, не забудьте потім "
+                       "натиснути кнопку «Підтвердити виконання замовлення»."),
+        (T.NON_SYSTEM, "Покупець {b} підтвердив успішне виконання замовлення #{o} і відправив гроші продавцю {s}."),
+        (T.NON_SYSTEM, "Покупець {b} написав відгук до замовлення #{o}."),
+        (T.NON_SYSTEM, "Продавець {s} відповів на відгук до замовлення #{o}."),
+        (T.NON_SYSTEM, "Замовлення #{o} відкрито повторно."),
+        (T.NON_SYSTEM, "Продавець {s} повернув гроші покупцеві {b} за замовленням #{o}."),
+        (T.NON_SYSTEM, "Вітаю! Коли буде виконано замовлення?"),
+        (T.NON_SYSTEM, "дякую"),
+    )
+}
+"""Шаблоны сообщений по языкам: (тип, шаблон)."""
+
+
+def legacy_message_type(text: str | None) -> MessageTypes:
+    """
+    Прежний Message.get_message_type (последовательная проверка выражений).
+    """
+    if not text:
+        return T.NON_SYSTEM
+    res = RegularExpressions()
+    if res.DISCORD.search(text):
+        return T.DISCORD
+    if res.DEAR_VENDORS.search(text):
+        return T.DEAR_VENDORS
+    if res.ORDER_PURCHASED.findall(text) and res.ORDER_PURCHASED2.findall(text):
+        return T.ORDER_PURCHASED
+    if res.ORDER_ID.search(text) is None:
+        return T.NON_SYSTEM
+    sys_msg_types = {
+        T.ORDER_CONFIRMED: res.ORDER_CONFIRMED,
+        T.NEW_FEEDBACK: res.NEW_FEEDBACK,
+        T.NEW_FEEDBACK_ANSWER: res.NEW_FEEDBACK_ANSWER,
+        T.FEEDBACK_CHANGED: res.FEEDBACK_CHANGED,
+        T.FEEDBACK_DELETED: res.FEEDBACK_DELETED,
+        T.REFUND: res.REFUND,
+        T.FEEDBACK_ANSWER_CHANGED: res.FEEDBACK_ANSWER_CHANGED,
+        T.FEEDBACK_ANSWER_DELETED: res.FEEDBACK_ANSWER_DELETED,
+        T.ORDER_CONFIRMED_BY_ADMIN: res.ORDER_CONFIRMED_BY_ADMIN,
+        T.PARTIAL_REFUND: res.PARTIAL_REFUND,
+        T.ORDER_REOPENED: res.ORDER_REOPENED,
+        T.REFUND_BY_ADMIN: res.REFUND_BY_ADMIN
+    }
+    for i in sys_msg_types:
+        if sys_msg_types[i].search(text):
+            return i
+    return T.NON_SYSTEM
+
+
+def build_corpus(per_template: int, seed: int) -> list[tuple[str, MessageTypes, str]]:
+    """
+    :return: размеченный корпус [(язык, тип, текст)].
+    """
+    rnd = random.Random(seed)
+    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ0123456789"
+    names = ["Buyer1", "seller22", "Vasya", "gamer007", "X"]
+    corpus = []
+    for locale, templates in TEMPLATES.items():
+        for message_type, template in templates:
+            for _ in range(per_template):
+                text = template.format(o="".join(rnd.choices(alphabet, k=8)), b=rnd.choice(names),
+                                       s=rnd.choice(names), a=rnd.choice(names))
+                corpus.append((locale, message_type, text))
+    return corpus
+
+
+def read_corpus(path: str) -> list[tuple[str, MessageTypes, str]]:
+    corpus = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                corpus.append((record["locale"], MessageTypes[record["type"]], record["text"]))
+    return corpus
+
+
+def measure(func, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка совпадения и бенчмарк определения типа сообщения.")
+    parser.add_argument("--corpus", nargs="*", default=[], help="доп. корпуса (JSON Lines: locale, type, text)")
+    parser.add_argument("--per-template", type=int, default=50, help="кол-во сообщений на шаблон")
+    parser.add_argument("--seed", type=int, default=0, help="seed генерации ID заказов и никнеймов")
+    parser.add_argument("--repeat", type=int, default=5, help="кол-во прогонов (берется лучший)")
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+
+    corpus = build_corpus(args.per_template, args.seed)
+    for path in args.corpus:
+        corpus.extend(read_corpus(path))
+    classifier = MessageTypeClassifier()
+
+    mismatches = 0
+    for locale, message_type, text in corpus:
+        legacy, result = legacy_message_type(text), classifier.classify(text)
+        if not legacy == result == message_type:
+            mismatches += 1
+            print(f"Расхождение ({locale}): разметка {message_type.name}, chain {legacy.name}, "
+                  f"classifier {result.name}: {text!r}")
+    print(f"Сообщений: {len(corpus)}, расхождений: {mismatches}")
+
+    print(f"{'сообщения':<14}{'кол-во':>8}{'chain, мкс':>14}{'classifier, мкс':>18}{'ускорение':>12}")
+    groups = {"все": [i[2] for i in corpus]}
+    for locale in TEMPLATES:
+        groups[locale] = [text for loc, _, text in corpus if loc == locale]
+    groups["системные"] = [text for _, message_type, text in corpus if message_type is not T.NON_SYSTEM]
+    groups["обычные"] = [text for _, message_type, text in corpus if message_type is T.NON_SYSTEM]
+    for name, texts in groups.items():
+        if not texts:
+            continue
+        chain = measure(legacy_message_type, texts, repeat) / len(texts) * 1e6
+        combined = measure(classifier.classify, texts, repeat) / len(texts) * 1e6
+        print(f"{name:<14}{len(texts):>8}{chain:>14.3f}{combined:>18.3f}{chain / combined if combined else 0:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Проверка совпадения и бенчмарк бэкендов разбора страниц FunPay (FunPayAPI.parsers) на сохраненных страницах.
+
+Для каждой страницы оба бэкенда (bs4 и lxml) должны вернуть одинаковые объекты FunPayAPI.types
+(HTML фрагменты сравниваются после нормализации: BeautifulSoup и lxml по-разному сериализуют атрибуты и теги).
+Затем замеряется время разбора каждым бэкендом (с --check - только проверка совпадения).
+Если есть расхождения, скрипт завершается с кодом 1.
+
+В benchmarks/pages лежат страницы, повторяющие разметку FunPay (аккаунт seller, ID 100); они проверяются,
+если пути не указаны.
+
+Тип страницы определяется по имени файла:
+    main*.html              - основная страница (категории);  должна быть сохранена для остальных страниц,
+                              т.к. из нее берутся подкатегории;
+    lots_<ID>*.html         - лоты подкатегории (https://funpay.com/lots/<ID>/);
+    chips_<ID>*.html        - лоты подкатегории валюты (https://funpay.com/chips/<ID>/);
+    trade_<ID>*.html        - свои лоты подкатегории (https://funpay.com/lots/<ID>/trade);
+    users_<ID>*.html        - профиль пользователя (https://funpay.com/users/<ID>/);
+    orders_<ID>*.html       - заказ (https://funpay.com/orders/<ID>/);
+    sales*.html             - продажи (https://funpay.com/orders/trade);
+    offerEdit_<ID>*.html    - редактирование лота (https://funpay.com/lots/offerEdit?offer=<ID>);
+    chats*.html             - HTML списка чатов (data.html объекта chat_bookmarks ответа runner/).
+
+Пример:
+    python benchmarks/page_parsers.py --check
+    python benchmarks/page_parsers.py pages/ --user-id 1234567 --username seller --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import enum
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import html as lxml_html
+
+from FunPayAPI.account import Account
+from FunPayAPI.common.enums import SubCategoryTypes
+from FunPayAPI.parsers import BACKENDS, ParserBackend
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+"""Сохраненные страницы, которые проверяются по умолчанию."""
+
+PAGES = (
+    ("categories", re.compile(r"main.*\.html$")),
+    ("public_lots", re.compile(r"(lots|chips)_(\d+).*\.html$")),
+    ("my_lots", re.compile(r"trade_(\d+).*\.html$")),
+    ("user_profile", re.compile(r"users_(\d+).*\.html$")),
+    ("order", re.compile(r"orders_(\w+?)(_.*)?\.html$")),
+    ("sales", re.compile(r"sales.*\.html$")),
+    ("lot_fields", re.compile(r"offerEdit_(\d+).*\.html$")),
+    ("chats", re.compile(r"chats.*\.html$"))
+)
+"""Типы страниц (метод бэкенда, шаблон имени файла)."""
+
+
+def page_args(method: str, match: re.Match, content: bytes) -> tuple:
+    """
+    :return: аргументы метода бэкенда (без аккаунта) для сохраненной страницы.
+    """
+    if method == "public_lots":
+        subcategory_type = SubCategoryTypes.COMMON if match.group(1) == "lots" else SubCategoryTypes.CURRENCY
+        return content, subcategory_type, int(match.group(2))
+    elif method == "my_lots":
+        return content, int(match.group(1))
+    elif method == "user_profile":
+        return content, int(match.group(1)), content.decode()
+    elif method == "order":
+        return content, match.group(1), content.decode()
+    elif method == "sales":
+        return content, True, None, None, [], True, True, True
+    elif method == "lot_fields":
+        return content, int(match.group(1))
+    elif method == "chats":
+        return content.decode(),
+    return content,
+
+
+def normalize_html(text: str) -> str:
+    """
+    Сериализует HTML фрагмент одним способом, чтобы сравнение не зависело от бэкенда
+    (BeautifulSoup, в отличие от lxml, сортирует атрибуты).
+    """
+    root = lxml_html.fragment_fromstring(text, create_parent="div")
+    for el in root.iter():
+        attrs = sorted(el.attrib.items())
+        el.attrib.clear()
+        el.attrib.update(attrs)
+    return lxml_html.tostring(root, encoding="unicode")
+
+
+def snapshot(obj, seen: set[int] | None = None):
+    """
+    :return: представление объекта для сравнения (атрибуты объектов FunPayAPI.types рекурсивно).
+    """
+    seen = set() if seen is None else seen
+    if obj is None or isinstance(obj, (bool, int, float, enum.Enum, datetime.datetime)):
+        return obj
+    elif isinstance(obj, str):
+        return normalize_html(obj) if obj.startswith("<") else obj
+    elif isinstance(obj, (list, tuple)):
+        return [snapshot(i, seen) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: snapshot(v, seen) for k, v in obj.items()}
+    elif id(obj) in seen:
+        # циклические ссылки (категория <-> подкатегория)
+        return type(obj).__name__, getattr(obj, "id", None)
+    seen.add(id(obj))
+    attrs = vars(obj) if hasattr(obj, "__dict__") else {i: getattr(obj, i) for i in obj.__slots__}
+    return type(obj).__name__, {k: snapshot(v, seen) for k, v in attrs.items()}
+
+
+def diff(a, b, path: str = "") -> str | None:
+    """
+    :return: путь к первому различию или None.
+    """
+    if type(a) is not type(b):
+        return path or "/"
+    if isinstance(a, dict):
+        if a.keys() != b.keys():
+            return f"{path}/{{{', '.join(map(str, a.keys() ^ b.keys()))}}}"
+        for k in a:
+            if (result := diff(a[k], b[k], f"{path}/{k}")) is not None:
+                return result
+        return None
+    if isinstance(a, (list, tuple)):
+        if len(a) != len(b):
+            return f"{path}/len"
+        for i, (x, y) in enumerate(zip(a, b)):
+            if (result := diff(x, y, f"{path}/{i}")) is not None:
+                return result
+        return None
+    return None if a == b else path or "/"
+
+
+def parse(backend: ParserBackend, account: Account, method: str, args: tuple):
+    page = getattr(backend, method)(account, *args)
+    return page.result, page.authorized, page.currency, page.error
+
+
+def measure(func, items: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(*item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка совпадения и бенчмарк бэкендов разбора страниц.")
+    parser.add_argument("paths", nargs="*", help="сохраненные HTML страницы или папки с ними "
+                                                 "(по умолчанию - benchmarks/pages)")
+    parser.add_argument("--user-id", type=int, default=None, help="ID аккаунта, с которого сохранены страницы")
+    parser.add_argument("--username", default=None, help="никнейм аккаунта, с которого сохранены страницы")
+    parser.add_argument("--repeat", type=int, default=3, help="кол-во прогонов (берется лучший)")
+    parser.add_argument("--check", action="store_true", help="только проверить совпадение (без замеров)")
+    args = parser.parse_args()
+    if not args.paths:
+        args.paths = [FIXTURES]
+        args.user_id = 100 if args.user_id is None else args.user_id
+        args.username = "seller" if args.username is None else args.username
+    repeat = max(args.repeat, 1)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, i) for i in sorted(os.listdir(path)))
+        else:
+            files.append(path)
+
+    pages: dict[str, list[tuple]] = {method: [] for method, _ in PAGES}
+    for path in files:
+        for method, pattern in PAGES:
+            if match := pattern.match(os.path.basename(path)):
+                with open(path, "rb") as f:
+                    pages[method].append((path, page_args(method, match, f.read())))
+                break
+
+    # HTML фрагментов тоже сравнивается
+    account = Account("", keep_html=True)
+    account.id, account.username = args.user_id or 0, args.username or ""
+    for _, (content,) in pages["categories"][:1]:
+        account._Account__setup_categories(content.decode())
+    backends = {name: backend() for name, backend in BACKENDS.items()}
+
+    mismatches = 0
+    parsed = {method: [] for method in pages}
+    for method, items in pages.items():
+        for path, method_args in items:
+            results = {}
+            for name, backend in backends.items():
+                try:
+                    results[name] = snapshot(parse(backend, account, method, method_args))
+                except Exception as e:
+                    results[name] = f"{type(e).__name__}: {e}"
+            if not any(isinstance(i, str) for i in results.values()):
+                parsed[method].append(method_args)
+            if (where := diff(*results.values())) is not None:
+                mismatches += 1
+                print(f"Расхождение: {path} ({method}): {where}")
+    print(f"Страниц: {sum(len(i) for i in pages.values())}, расхождений: {mismatches}")
+    if args.check:
+        sys.exit(1 if mismatches else 0)
+
+    print(f"{'страница':<14}{'файлов':>8}" + "".join(f"{name + ', мс':>12}" for name in backends) +
+          f"{'ускорение':>12}")
+    # замеряются только страницы, которые оба бэкенда разобрали без ошибок
+    for method, items in parsed.items():
+        if not items:
+            continue
+        times = [measure(lambda *a: backend_method(account, *a), items, repeat) * 1000
+                 for backend_method in (getattr(backend, method) for backend in backends.values())]
+        print(f"{method:<14}{len(items):>8}" + "".join(f"{i:>12.2f}" for i in times) +
+              f"{times[1] / times[0] if times[0] else 0:>11.1f}x")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Бенчмарк разбора HTML сообщений чатов на записанных ответах `runner/` (объекты chat_node).
+
+Сравниваются способы разбора:
+    bs4  - два дерева BeautifulSoup на сообщение (прежний Account.__parse_messages);
+    lxml - однопроходный разбор lxml + XPath (FunPayAPI.common.message_parser.parse_message_html).
+Дополнительно проверяется, что оба способа извлекают одинаковые данные, и замеряется Account.__parse_messages целиком.
+
+Лог записывается ботом при включенном параметре [Other] recordRunner (storage/cache/runner_*.jsonl.gz).
+
+Пример:
+    python benchmarks/parse_messages.py storage/cache/runner_1700000000.jsonl.gz --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from FunPayAPI.common.message_parser import MessageHTML, parse_message_html
+from FunPayAPI.updater.replay import ReplayAccount, read_records
+
+
+def parse_bs4(html: str) -> MessageHTML:
+    """
+    Извлекает из HTML сообщения те же данные, что и прежний Account.__parse_messages (два дерева BeautifulSoup).
+    """
+    result = MessageHTML()
+    parser = BeautifulSoup(html.replace("<br>", "\n"), "lxml")
+    if author_div := parser.find("div", {"class": "media-user-name"}):
+        result.author_block = True
+        badge = author_div.find("span", {"class": "chat-msg-author-label label label-success"})
+        result.badge = badge.text if badge else None
+        author = author_div.find("a")
+        result.author = author.text.strip() if author else None
+    if image_tag := parser.find("a", {"class": "chat-img-link"}):
+        result.image_block = True
+        image = image_tag.find("img")
+        result.image_name = image.get("alt") if image else None
+        result.image_link = image_tag.get("href")
+    if alert := parser.find("div", role="alert"):
+        result.alert = alert.text
+    if text := parser.find("div", {"class": "chat-msg-text"}):
+        result.text = text.text
+
+    parser = BeautifulSoup(html, "lxml")
+    default_label = parser.find("div", {"class": "media-user-name"})
+    default_label = default_label.find("span", {
+        "class": "chat-msg-author-label label label-default"}) if default_label else None
+    result.default_label = default_label.text if default_label else None
+    result.users = [(i.text, i["href"]) for i in parser.find_all('a', href=lambda href: href and '/users/' in href)]
+    return result
+
+
+def load_chat_nodes(paths: list[str]) -> list[dict]:
+    """
+    :return: данные объектов chat_node с сообщениями из логов.
+    """
+    nodes = []
+    for path in paths:
+        _, records = read_records(path)
+        for record in records:
+            for obj in record["response"].get("objects", []):
+                if obj.get("type") == "chat_node" and obj.get("data") and obj["data"].get("messages"):
+                    nodes.append(obj["data"])
+    return nodes
+
+
+def measure(func, items: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк разбора HTML сообщений чатов.")
+    parser.add_argument("paths", nargs="+", help="логи, записанные RunnerRecorder")
+    parser.add_argument("--repeat", type=int, default=3, help="кол-во прогонов (берется лучший)")
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+
+    nodes = load_chat_nodes(args.paths)
+    htmls = [m["html"] for node in nodes for m in node["messages"]]
+    if not htmls:
+        print("В логах нет сообщений (chat_node).")
+        return
+    print(f"Чатов: {len(nodes)}, сообщений: {len(htmls)}")
+
+    mismatches = 0
+    for html in htmls:
+        old, new = parse_bs4(html), parse_message_html(html)
+        if any(getattr(old, i) != getattr(new, i) for i in MessageHTML.__slots__):
+            mismatches += 1
+    print(f"Расхождений между bs4 и lxml: {mismatches}")
+
+    bs4_time = measure(parse_bs4, htmls, repeat)
+    lxml_time = measure(parse_message_html, htmls, repeat)
+    print(f"{'способ':<8}{'всего, с.':>12}{'на сообщение, мкс':>20}")
+    print(f"{'bs4':<8}{bs4_time:>12.4f}{bs4_time / len(htmls) * 1e6:>20.1f}")
+    print(f"{'lxml':<8}{lxml_time:>12.4f}{lxml_time / len(htmls) * 1e6:>20.1f}")
+    print(f"Ускорение: {bs4_time / lxml_time:.1f}x")
+
+    account = ReplayAccount(args.paths[0])
+    parse_messages = account._Account__parse_messages
+    total = measure(lambda node: parse_messages(node["messages"], node["node"]["id"],
+                                                is_private=not node["node"].get("silent")), nodes, repeat)
+    print(f"Account.__parse_messages: {total:.4f} с. ({total / len(htmls) * 1e6:.1f} мкс на сообщение)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Бенчмарк обработки событий Runner'а на записанных ответах `runner/`.
+
+Лог записывается ботом при включенном параметре [Other] recordRunner
+(storage/cache/runner_<session_key>_<timestamp>.jsonl.gz).
+
+Режимы:
+    по умолчанию  - только разбор обновлений Runner'ом (Runner.parse_updates);
+    --selectors   - сравнение выбора чатов для подкидываемых chat_node: индекс активности Runner'а и прежняя
+                    эвристика (случайный из ранее полученных chat_bookmarks против последнего) выбирают чаты
+                    на каждом записанном chat_bookmarks (время берется из лога). Выбор считается попаданием,
+                    если в следующем записанном chat_bookmarks у чата новое последнее сообщение (data-node-msg).
+    --handlers    - каждое событие дополнительно синхронно проходит через всю цепочку хэндлеров бота
+                    (встроенные хэндлеры handlers.py и, с --plugins, хэндлеры плагинов) с конфигами из --configs.
+                    Telegram отключается, запросы к FunPay не отправляются (ReplayAccount отклоняет их, ошибка
+                    хэндлера логируется и учитывается, как в боте). Запросы заказов (get_sales) отключены, поэтому
+                    события заказов в записанном логе приходят без объекта заказа.
+
+Выделения памяти считаются отдельным прогоном через tracemalloc: разница снимков до и после прогона
+(память, оставшаяся занятой после обработки событий) и пиковый объем памяти за прогон.
+
+Пример:
+    python benchmarks/runner_replay.py storage/cache/runner_abc_1700000000.jsonl.gz --handlers --repeat 5
+    python benchmarks/runner_replay.py storage/cache/runner_abc_1700000000.jsonl.gz --selectors --slots 8
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FunPayAPI.updater import runner as runner_module
+from FunPayAPI.updater.replay import ReplayAccount, replay
+from FunPayAPI.updater.runner import Runner
+
+
+class ReplayClock:
+    """
+    Замена модуля time для Runner'а: time.time() возвращает время текущей записи лога.
+    """
+
+    def __init__(self):
+        self.now: float = 0
+
+    def time(self) -> float:
+        return self.now
+
+    def __getattr__(self, item):
+        return getattr(time, item)
+
+
+def chat_message_ids(html: str) -> dict[int, int]:
+    """
+    :return: ID последних сообщений чатов из HTML chat_bookmarks {ID чата: ID сообщения}.
+    """
+    from lxml import html as lxml_html
+
+    root = lxml_html.fragment_fromstring(html, create_parent=True)
+    return {int(i.get("data-id")): int(i.get("data-node-msg"))
+            for i in root.xpath('.//a[contains(concat(" ", @class, " "), " contact-item ")]')
+            if i.get("data-id") and i.get("data-node-msg")}
+
+
+def legacy_select(history: list[list[int]], amount: int, rng: random.Random) -> list[int]:
+    """
+    Прежний выбор чатов (Runner.__detect_chats_with_activity до индекса активности).
+
+    :param history: порядки чатов из chat_bookmarks, полученных с последнего цикла listen (последний - новый).
+    :param amount: кол-во чатов.
+    :param rng: генератор случайных чисел.
+    """
+    if len(history) < 2:
+        return []
+    new_list = history[-1]
+    old_list = rng.choice(history[:-1])
+    old_positions = {chat_id: i for i, chat_id in enumerate(old_list)}
+    last = float('inf')
+    split_index = len(new_list)
+    for i in range(len(new_list) - 1, -1, -1):
+        idx = old_positions.get(new_list[i])
+        if idx is None or i < idx or last < idx:
+            split_index = i
+            break
+        else:
+            last = idx
+    result = new_list[:split_index + 1]
+    if len(result) >= amount:
+        return rng.sample(result, amount)
+    i = 0
+    result = set(result)
+    while len(result) < amount and i < len(new_list):
+        result.add(new_list[i])
+        i += 1
+    return list(result)
+
+
+def compare_selectors(path: str, slots: int, window: int, seed: int) -> tuple[int, float, dict[str, list[int]]]:
+    """
+    Прогоняет записанные chat_bookmarks через оба способа выбора чатов.
+
+    :param path: путь до лога.
+    :param slots: кол-во подкидываемых chat_node в одном запросе.
+    :param window: кол-во chat_bookmarks, из которых выбирает прежняя эвристика.
+    :param seed: seed для случайного выбора прежней эвристики.
+
+    :return: кол-во опросов, среднее кол-во изменившихся чатов за опрос,
+        {способ: [кол-во запрошенных chat_node, кол-во chat_node с новыми сообщениями]}.
+    """
+    account = ReplayAccount(path)
+    polls = []
+    for record in account.records:
+        for obj in record["response"].get("objects", []):
+            if obj.get("type") == "chat_bookmarks" and (data := obj.get("data")) and data.get("order"):
+                polls.append((record.get("t", 0), [int(i) for i in data["order"]], chat_message_ids(data["html"])))
+
+    clock = ReplayClock()
+    real_time, runner_module.time = runner_module.time, clock
+    try:
+        runner = Runner(account, disabled_order_requests=True, order_prefetch_workers=0)
+        rng = random.Random(seed)
+        history = []
+        stats = {"индекс активности": [0, 0], "прежняя эвристика": [0, 0]}
+        changed_total = 0
+        for (t, order, ids), (_, _, next_ids) in zip(polls, polls[1:]):
+            clock.now = t
+            runner._Runner__update_chat_activity(order)
+            history = (history + [order])[-window:]
+            changed = {chat_id for chat_id, msg_id in next_ids.items() if msg_id > ids.get(chat_id, msg_id)}
+            changed_total += len(changed)
+            for name, selected in (("индекс активности", runner._Runner__detect_chats_with_activity(slots)),
+                                   ("прежняя эвристика", legacy_select(history, slots, rng))):
+                stats[name][0] += len(selected)
+                stats[name][1] += len(changed.intersection(selected))
+    finally:
+        runner_module.time = real_time
+    count = max(len(polls) - 1, 0)
+    return count, changed_total / count if count else 0.0, stats
+
+
+def build_bot(configs: str, plugins: bool):
+    """
+    Создает бота с конфигами из папки configs, без Telegram и без запросов к FunPay.
+
+    :param configs: путь до папки с конфигами.
+    :param plugins: загружать ли плагины.
+
+    :return: экземпляр :class:`fpsupport.funpayautobot`.
+    """
+    import Utils.config_loader as cfg_loader
+    from locales.localizer import Localizer
+
+    main_cfg = cfg_loader.load_main_config(os.path.join(configs, "_main.cfg"))
+    Localizer(main_cfg["Other"]["language"])
+    ar_cfg = cfg_loader.load_auto_response_config(os.path.join(configs, "auto_response.cfg"))
+    raw_ar_cfg = cfg_loader.load_raw_auto_response_config(os.path.join(configs, "auto_response.cfg"))
+    ad_cfg = cfg_loader.load_auto_delivery_config(os.path.join(configs, "auto_delivery.cfg"))
+    main_cfg["Telegram"]["enabled"] = "0"
+    main_cfg["Proxy"]["enable"] = "0"
+
+    import fpsupport
+    import handlers
+
+    bot = fpsupport.funpayautobot(main_cfg, ad_cfg, ar_cfg, raw_ar_cfg)
+    bot.add_handlers_from_plugin(handlers)
+    if plugins:
+        bot.load_plugins()
+        bot.add_handlers()
+    return bot
+
+
+def run_once(path: str, bot=None, trace: bool = False) -> tuple[int, float, dict]:
+    """
+    Прогоняет лог через новый Runner (и, если передан бот, через его хэндлеры).
+
+    :param path: путь до лога.
+    :param bot: бот, хэндлеры которого вызываются для каждого события, или None.
+    :param trace: считать ли выделения памяти.
+
+    :return: кол-во событий, время (в секундах), статистика памяти (при trace=True).
+    """
+    account = ReplayAccount(path)
+    runner = Runner(account, disabled_order_requests=True, order_prefetch_workers=0)
+    events_handlers = None
+    if bot is not None:
+        from FunPayAPI.types import UserProfile
+
+        bot.account = account
+        bot.runner = runner
+        bot.profile = bot.curr_profile = bot.tg_profile = UserProfile(account.id, account.username, "", True,
+                                                                      False, None)
+        bot.lots_ids = []
+        events_handlers = bot.get_events_handlers()
+
+    gc.collect()
+    memory = {}
+    if trace:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    events = 0
+    for event in replay(runner):
+        events += 1
+        if events_handlers is not None:
+            bot.run_handlers(events_handlers[event.type], (bot, event))
+    duration = time.perf_counter() - start
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        stats = after.compare_to(before.filter_traces(filters), "lineno")
+        tracemalloc.stop()
+        memory = {"blocks": sum(i.count_diff for i in stats),
+                  "size": sum(i.size_diff for i in stats),
+                  "peak": peak,
+                  "top": sorted(stats, key=lambda i: i.size_diff, reverse=True)[:10]}
+    return events, duration, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк обработки событий Runner'а на записанных ответах.")
+    parser.add_argument("path", help="путь до лога, записанного RunnerRecorder")
+    parser.add_argument("--repeat", type=int, default=3, help="кол-во прогонов для замера скорости")
+    parser.add_argument("--handlers", action="store_true", help="прогонять события через хэндлеры бота")
+    parser.add_argument("--configs", default="configs", help="папка с конфигами бота (для --handlers)")
+    parser.add_argument("--plugins", action="store_true", help="загружать плагины (для --handlers)")
+    parser.add_argument("--selectors", action="store_true",
+                        help="сравнить выбор чатов для chat_node: индекс активности и прежнюю эвристику")
+    parser.add_argument("--slots", type=int, default=8, help="кол-во подкидываемых chat_node (для --selectors)")
+    parser.add_argument("--window", type=int, default=3,
+                        help="кол-во chat_bookmarks, из которых выбирает прежняя эвристика (для --selectors)")
+    parser.add_argument("--seed", type=int, default=0, help="seed прежней эвристики (для --selectors)")
+    args = parser.parse_args()
+
+    if args.selectors:
+        polls, changed, stats = compare_selectors(args.path, args.slots, args.window, args.seed)
+        print(f"Опросов: {polls}, изменившихся чатов за опрос: {changed:.2f}, слотов chat_node: {args.slots}")
+        for name, (requested, hits) in stats.items():
+            print(f"    {name:<20}запрошено: {requested:>7}, с новыми сообщениями: {hits:>7} "
+                  f"(hit rate {hits / requested if requested else 0:.3f})")
+        return
+
+    bot = None
+    if args.handlers:
+        bot = build_bot(args.configs, args.plugins)
+        # логи хэндлеров (в т.ч. ошибки отклоненных запросов) не должны влиять на замер
+        logging.disable(logging.CRITICAL)
+
+    results = [run_once(args.path, bot) for _ in range(max(args.repeat, 1))]
+    events = results[0][0]
+    best = min(i[1] for i in results)
+    # выделения памяти считаются отдельным прогоном: tracemalloc сильно замедляет выполнение
+    _, _, memory = run_once(args.path, bot, trace=True)
+
+    print(f"Событий за прогон: {events}{' (с хэндлерами)' if bot else ''}")
+    print(f"Лучшее время: {best:.4f} с. ({events / best if best else 0:.1f} событий/с.)")
+    if events:
+        print(f"Оставшихся блоков памяти на событие: {memory['blocks'] / events:.2f} "
+              f"({memory['size'] / events:.0f} байт)")
+        print(f"Пиковая память на событие: {memory['peak'] / events:.0f} байт")
+        print("Строки с наибольшим приростом памяти:")
+        for stat in memory["top"]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            print(f"    {frame.filename}:{frame.lineno}: {stat.size_diff:+} байт, {stat.count_diff:+} блоков")
+
+
+if __name__ == "__main__":
+    main()
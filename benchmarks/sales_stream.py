@@ -0,0 +1,98 @@
+"""
+Проверка совпадения и бенчмарк потокового разбора страницы продаж (https://funpay.com/orders/trade).
+
+Runner.parse_order_updates() запрашивает список продаж с условием stop_at, поэтому ему нужны только
+несколько новых строк. Для каждой глубины N (кол-во строк до срабатывания stop_at) проверяется, что
+lxml бэкенд (потоковый разбор с остановкой) возвращает те же заказы, что и bs4 бэкенд (полный разбор),
+как без подкатегорий, так и с ранее полученными подкатегориями (в т.ч. неполными).
+Затем замеряется время одного опроса:
+    bs4            - полный разбор bs4 бэкендом (подкатегории строятся заново);
+    lxml           - полный разбор lxml бэкендом (подкатегории строятся заново);
+    lxml N, кэш    - разбор lxml бэкендом до N-й строки с ранее полученными подкатегориями.
+
+Если пути не указаны, проверяются страницы из benchmarks/pages. Если есть расхождения, скрипт завершается с кодом 1.
+
+Пример:
+    python benchmarks/sales_stream.py pages/sales.html --main pages/main.html --depth 1 5 50 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_parsers import FIXTURES, snapshot, diff, measure
+
+from FunPayAPI.account import Account
+from FunPayAPI.parsers import BS4Backend, LxmlBackend
+
+
+def sales(backend, account: Account, content: bytes, subcategories: dict | None, stop_id: str | None):
+    stop_at = (lambda order_id, status: order_id == stop_id) if stop_id else None
+    page = backend.sales(account, content, True, subcategories, stop_at, [], True, True, True)
+    next_order_id, orders, subcategories = page.result
+    return page.authorized, orders, subcategories
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка совпадения и бенчмарк потокового разбора продаж.")
+    parser.add_argument("paths", nargs="*", help="сохраненные страницы продаж (по умолчанию - benchmarks/pages)")
+    parser.add_argument("--main", help="сохраненная основная страница FunPay (для подкатегорий)")
+    parser.add_argument("--user-id", type=int, default=0, help="ID аккаунта, с которого сохранены страницы")
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 5, 50],
+                        help="кол-во новых строк до срабатывания stop_at")
+    parser.add_argument("--repeat", type=int, default=10, help="кол-во прогонов (берется лучший)")
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+    if not args.paths:
+        args.paths = [os.path.join(FIXTURES, i) for i in sorted(os.listdir(FIXTURES)) if i.startswith("sales")]
+        args.main = args.main or os.path.join(FIXTURES, "main.html")
+
+    account = Account("", keep_html=True)
+    account.id = args.user_id
+    if args.main:
+        with open(args.main, "rb") as f:
+            account._Account__setup_categories(f.read().decode())
+    bs4, lxml = BS4Backend(), LxmlBackend()
+
+    mismatches = 0
+    for path in args.paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        _, orders, subcategories = sales(bs4, account, content, None, None)
+        # неполные подкатегории: подкатегории первого заказа нет (список игр должен быть перечитан)
+        partial = dict(subcategories or {})
+        if orders:
+            partial.pop(orders[0].subcategory_name, None)
+
+        stops = {f"{depth}": orders[depth].id if depth < len(orders) else None for depth in args.depth}
+        stops["все"] = None
+        for depth, stop_id in stops.items():
+            for cache_name, cache in (("без кэша", None), ("кэш", subcategories), ("неполный кэш", partial)):
+                expected = snapshot(sales(bs4, account, content, cache, stop_id))
+                result = snapshot(sales(lxml, account, content, cache, stop_id))
+                if (where := diff(expected, result)) is not None:
+                    mismatches += 1
+                    print(f"Расхождение: {path} (глубина {depth}, {cache_name}): {where}")
+        print(f"{path}: заказов: {len(orders)}, подкатегорий: {len(subcategories or {})}")
+
+        account.keep_html = False
+        times = {
+            "bs4": measure(lambda: sales(bs4, account, content, None, None), [()], repeat),
+            "lxml": measure(lambda: sales(lxml, account, content, None, None), [()], repeat)
+        }
+        for depth, stop_id in stops.items():
+            if stop_id is not None:
+                times[f"lxml {depth}, кэш"] = measure(lambda: sales(lxml, account, content, subcategories, stop_id),
+                                                     [()], repeat)
+        account.keep_html = True
+        for name, value in times.items():
+            print(f"    {name:<16}{value * 1000:>10.2f} мс{times['bs4'] / value if value else 0:>10.1f}x")
+    print(f"Расхождений: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -81,12 +81,26 @@ default_config = {
         "port": "",
         "login": "",
         "password": "",
-        "check": "0"
+        "check": "0",
+        "pool": "0",
+        "poolPolicy": "sticky"
     },
 
     "Other": {
         "watermark": "👨‍💻💎 FPSupport",
         "requestsDelay": "4",
+        "requestsDelayMin": "4",
+        "requestsDelayMax": "4",
+        "requestsDelayDecay": "1.5",
+        "handlersConcurrency": "1",
+        "handlersTimeout": "60",
+        "handlerTimeBudget": "10",
+        "autoDisableSlowPlugins": "0",
+        "recordRunner": "0",
+        "fastStart": "0",
+        "exchangeRatesInterval": "600",
+        "parserBackend": "bs4",
+        "keepHTML": "0",
         "language": "ru"
     }
 }
@@ -15,6 +15,7 @@ from uuid import UUID
 import importlib.util
 import configparser
 import itertools
+import math
 import requests
 import datetime
 import logging
@@ -28,10 +29,17 @@ import handlers
 import announcements
 from locales.localizer import Localizer
 from FunPayAPI import utils as fp_utils
+from FunPayAPI.updater.replay import RunnerRecorder
+from FunPayAPI.common.proxy_pool import ProxyPool
 from Utils import FPManager
+from Utils.event_bus import EventBus
+from Utils.handlers_stats import HandlersStats
+from Utils.raise_scheduler import RaiseScheduler
+from Utils.exchange_rates import ExchangeRates
 import tg_bot.bot
 
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger("FunPayAutobot")
 localizer = Localizer()
@@ -103,6 +111,7 @@ class funpayautobot(object):
         self.RAW_AR_CFG = raw_auto_response_config
         # Прокси
         self.proxy = {}
+        self.proxy_pool: ProxyPool | None = None
         self.proxy_dict = FPManager.load_proxy_dict()  # прокси {0: "login:password@ip:port", 1: "ip:port"...}
         if self.MAIN_CFG["Proxy"].getboolean("enable"):
             if self.MAIN_CFG["Proxy"]["ip"] and self.MAIN_CFG["Proxy"]["port"].isnumeric():
@@ -124,11 +133,21 @@ class funpayautobot(object):
                 if self.MAIN_CFG["Proxy"].getboolean("check") and not FPManager.check_proxy(self.proxy):
                     sys.exit()
 
+                if self.MAIN_CFG["Proxy"].getboolean("pool") and len(self.proxy_dict) > 1:
+                    # прокси из конфига используется первым, остальные сохраненные прокси - запасные
+                    self.proxy_pool = ProxyPool(list(self.proxy_dict.values()),
+                                                self.MAIN_CFG["Proxy"]["poolPolicy"], current=proxy_str)
+                    logger.info(_("crd_proxy_pool", len(self.proxy_pool)))
+
         self.account = FunPayAPI.Account(self.MAIN_CFG["FunPay"]["golden_key"],
                                          self.MAIN_CFG["FunPay"]["user_agent"],
-                                         proxy=self.proxy)
+                                         proxy=self.proxy, proxy_pool=self.proxy_pool,
+                                         parser_backend=self.MAIN_CFG["Other"]["parserBackend"],
+                                         keep_html=self.MAIN_CFG["Other"].getboolean("keepHTML"))
+        self.async_account = FunPayAPI.AsyncAccount(self.account)  # Асинхронная обертка с общим пулом запросов
         self.runner: FunPayAPI.Runner | None = None
         self.telegram: tg_bot.bot.TGBot | None = None
+        self.event_bus: EventBus | None = None
 
         self.running = False
         self.run_id = 0
@@ -137,8 +156,14 @@ class funpayautobot(object):
         self.balance: FunPayAPI.types.Balance | None = None
         self.raise_time = {}  # Временные метки поднятия категорий {id игры: след. время поднятия}
         self.raised_time = {}  # Время последнего поднятия категории {id игры: время последнего поднятия}
-        self.__exchange_rates = {}  # Курс валют {(валюта1, валюта2): (курс, время обновления)}
+        self.raise_scheduler = RaiseScheduler()  # Очередь категорий по времени следующего поднятия
+        # Снимок курсов валют (обновляется в фоне, сохраняется в кэш)
+        self.exchange_rates = ExchangeRates(self.account.get_exchange_rate,
+                                            int(self.MAIN_CFG["Other"]["exchangeRatesInterval"]),
+                                            on_update=FPManager.cache_exchange_rates)
+        self.exchange_rates.load(FPManager.load_exchange_rates())
         self.profile: FunPayAPI.types.UserProfile | None = None  # FunPay профиль для всего кардинала (+ хэндлеров)
+        self.__snapshot_profile: FunPayAPI.types.UserProfile | None = None  # Профиль из снимка сессии
         self.tg_profile: FunPayAPI.types.UserProfile | None = None  # FunPay профиль (для Telegram-ПУ)
         self.last_tg_profile_update = datetime.datetime.now()  # Последнее время обновления профиля для TG-ПУ
         self.curr_profile: FunPayAPI.types.UserProfile | None = None  # Текущий профиль (для восст. / деакт. лотов.)
@@ -204,6 +229,8 @@ class funpayautobot(object):
         }
 
         self.plugins: dict[str, PluginData] = {}
+        self.handlers_stats = HandlersStats()  # Статистика выполнения хэндлеров.
+        self.__handlers_stats_dump_time = 0  # Время последнего сохранения статистики хэндлеров в кэш.
         self.disabled_plugins = FPManager.load_disabled_plugins()
         self.pinned_plugins = FPManager.load_pinned_plugins()
 
@@ -211,6 +238,8 @@ class funpayautobot(object):
         """
         Инициализирует класс аккаунта (self.account)
         """
+        if self.MAIN_CFG["Other"].getboolean("fastStart") and self.__load_session_snapshot():
+            return
         while True:
             try:
                 self.account.get()
@@ -231,6 +260,91 @@ class funpayautobot(object):
             logger.warning(_("crd_try_again_in_n_secs", 2))
             time.sleep(2)
 
+    def __load_session_snapshot(self) -> bool:
+        """
+        Восстанавливает данные аккаунта, профиль и баланс из снимка сессии (обновляются после инициализации
+        в отдельном потоке, см. funpayautobot.__refresh_session_snapshot).
+
+        :return: True, если данные восстановлены, False, если снимок не найден или устарел.
+        """
+        snapshot = FPManager.load_session_snapshot(self.account.session_key)
+        if not snapshot or not snapshot.get("balance") or not snapshot.get("profile") or \
+                not self.account.load_session(snapshot["account"]):
+            return False
+        try:
+            self.balance = FunPayAPI.types.Balance(**snapshot["balance"])
+            # объекты подкатегорий берутся из аккаунта, чтобы лоты профиля находились по подкатегориям заказов
+            self.__snapshot_profile = self.__load_profile(snapshot["profile"])
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+            return False
+        logger.info(_("crd_session_snapshot_loaded", int(time.time() - self.account.last_update)))
+        greeting_text = FPManager.create_greeting_text(self)
+        FPManager.set_console_title("FunPay Support - bot")
+        for line in greeting_text.split("\n"):
+            logger.info(line)
+        return True
+
+    def __refresh_session_snapshot(self):
+        """
+        Последовательно обновляет данные аккаунта, баланс и профиль, восстановленные из снимка сессии,
+        и сохраняет новый снимок.
+        """
+        if self.update_session():
+            try:
+                self.balance = self.get_balance()
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+        if self.__update_profile():
+            self.save_session_snapshot()
+
+    @staticmethod
+    def __dump_profile(profile: FunPayAPI.types.UserProfile) -> dict:
+        """
+        :return: данные профиля для снимка сессии (лоты - без HTML, подкатегории - по типу и ID).
+        """
+        return {
+            "id": profile.id,
+            "username": profile.username,
+            "profile_photo": profile.profile_photo,
+            "online": profile.online,
+            "banned": profile.banned,
+            "lots": [[i.id, i.server, i.side, i.description, i.amount, i.price, i.currency.name,
+                      i.subcategory.type.name, i.subcategory.id, i.auto] for i in profile.get_lots()]
+        }
+
+    def __load_profile(self, data: dict) -> FunPayAPI.types.UserProfile:
+        """
+        Восстанавливает профиль из снимка сессии. Подкатегории лотов берутся из аккаунта.
+        """
+        profile = FunPayAPI.types.UserProfile(data["id"], data["username"], data["profile_photo"], data["online"],
+                                              data["banned"], None)
+        for id_, server, side, description, amount, price, currency, subcategory_type, subcategory_id, auto \
+                in data["lots"]:
+            subcategory = self.account.get_subcategory(SubCategoryTypes[subcategory_type], subcategory_id)
+            if subcategory is None:
+                continue
+            profile.add_lot(FunPayAPI.types.LotShortcut(id_, server, side, description, amount, price,
+                                                        FunPayAPI.types.Currency[currency], subcategory, None, auto,
+                                                        None, None, None))
+        return profile
+
+    def save_session_snapshot(self):
+        """
+        Сохраняет снимок сессии (данные аккаунта, профиль, баланс) для быстрого старта.
+        """
+        if not self.account.is_initiated or not self.profile:
+            return
+        try:
+            FPManager.cache_session_snapshot(self.account.session_key, {
+                "account": self.account.dump_session(),
+                "profile": self.__dump_profile(self.profile),
+                "balance": vars(self.balance) if self.balance else None
+            })
+        except:
+            logger.warning(_("crd_session_snapshot_err"))
+            logger.debug("TRACEBACK", exc_info=True)
+
     def __update_profile(self, infinite_polling: bool = True, attempts: int = 0, update_telegram_profile: bool = True,
                          update_main_profile: bool = True) -> bool:
         """
@@ -289,7 +403,9 @@ class funpayautobot(object):
         while not lots and attempts:
             attempts -= 1
             subcat_id = random.choice(list(subcategories.keys()))
-            lots = self.account.get_subcategory_public_lots(FunPayAPI.enums.SubCategoryTypes.COMMON, subcat_id)
+            # для проверки баланса подходит любой чужой лот, поэтому список лотов можно взять из кэша
+            lots = self.account.get_subcategory_public_lots(FunPayAPI.enums.SubCategoryTypes.COMMON, subcat_id,
+                                                            use_cache=True)
             break
         else:
             raise Exception(...)
@@ -299,103 +415,113 @@ class funpayautobot(object):
     # Прочее
     def raise_lots(self) -> int:
         """
-        Пытается поднять лоты.
+        Поднимает лоты категорий, время поднятия которых наступило (параллельно, в пределах ограничения частоты
+        запросов).
 
         :return: предположительное время, когда нужно снова запустить данную функцию.
         """
-        # Время следующего вызова функции (по умолчанию - бесконечность).
-        next_call = float("inf")
+        categories = {subcat.category.id: subcat.category for subcat in self.profile.get_sorted_lots(2).keys()
+                      if subcat.type is not SubCategoryTypes.CURRENCY}
+        self.raise_scheduler.sync(list(categories.keys()))
 
-        for subcat in sorted(list(self.profile.get_sorted_lots(2).keys()), key=lambda x: x.category.position):
-            if subcat.type is SubCategoryTypes.CURRENCY:
-                continue
-            # Если id категории текущей подкатегории уже находится в self.game_ids, но время поднятия подкатегорий
-            # данной категории еще не настало - пропускам эту подкатегорию.
-            if (saved_time := self.raise_time.get(subcat.category.id)) and saved_time > int(time.time()):
-                # Если записанное в self.game_ids время больше текущего времени
-                # обновляем время next_call'а на записанное время.
-                next_call = saved_time if saved_time < next_call else next_call
-                continue
+        due = [(categories[category_id], due_time) for category_id, due_time in self.raise_scheduler.pop_due()
+               if category_id in categories]
+        if due:
+            with ThreadPoolExecutor(max_workers=min(len(due), 4)) as executor:
+                for category, due_time in sorted(due, key=lambda x: x[0].position):
+                    executor.submit(self.__raise_category, category, due_time)
 
-            # В любом другом случае пытаемся поднять лоты всех категорий, относящихся к игре
-            raise_ok = False
-            error_text = ""
-            time_delta = ""
-            try:
-                time.sleep(1)
-                self.account.raise_lots(subcat.category.id)
-                logger.info(_("crd_lots_raised", subcat.category.name))
-                raise_ok = True
-                last_time = self.raised_time.get(subcat.category.id)
-                self.raised_time[subcat.category.id] = new_time = int(time.time())  # locale
-                time_delta = "" if not last_time else f" Последнее поднятие: {FPManager.time_to_str(new_time - last_time)} назад."
-                time.sleep(1)
-                self.account.raise_lots(subcat.category.id)
-            except FunPayAPI.exceptions.RaiseError as e:
-                if e.error_message is not None:
-                    error_text = e.error_message
-                if e.wait_time is not None:
-                    logger.warning(_("crd_raise_time_err", subcat.category.name, error_text,
-                                     FPManager.time_to_str(e.wait_time)))
-                    next_time = int(time.time()) + e.wait_time
-                else:
-                    logger.error(_("crd_raise_unexpected_err", subcat.category.name))
-                    time.sleep(10)
-                    next_time = int(time.time()) + 1
-                self.raise_time[subcat.category.id] = next_time
-                next_call = next_time if next_time < next_call else next_call
-                if not raise_ok:
-                    continue
-            except Exception as e:
-                t = 10
-                if isinstance(e, FunPayAPI.exceptions.RequestFailedError) and e.status_code in (503, 403, 429):
-                    logger.warning(_("crd_raise_status_code_err", e.status_code, subcat.category.name))
-                    t = 60
-                else:
-                    logger.error(_("crd_raise_unexpected_err", subcat.category.name))
-                logger.debug("TRACEBACK", exc_info=True)
-                time.sleep(t)
-                next_time = int(time.time()) + 1
-                next_call = next_time if next_time < next_call else next_call
-                if not raise_ok:
-                    continue
-            self.run_handlers(self.post_lots_raise_handlers, (self, subcat.category, error_text + time_delta))
-        return next_call if next_call < float("inf") else 10
+        next_time = self.raise_scheduler.next_time()
+        return math.ceil(next_time) if next_time is not None else int(time.time()) + 10
+
+    def __raise_category(self, category: types.Category, due_time: float):
+        """
+        Поднимает лоты категории и планирует следующее поднятие.
+
+        :param category: категория (игра).
+        :param due_time: запланированное время поднятия.
+        """
+        start_time = time.time()
+        self.raise_scheduler.record_raise(category.id, due_time, start_time)
+        raise_ok = False
+        error_text = ""
+        time_delta = ""
+        next_time = None
+        try:
+            self.account.raise_lots(category.id)
+            logger.info(_("crd_lots_raised", category.name))
+            raise_ok = True
+            last_time = self.raised_time.get(category.id)
+            self.raised_time[category.id] = new_time = int(time.time())  # locale
+            time_delta = "" if not last_time else f" Последнее поднятие: {FPManager.time_to_str(new_time - last_time)} назад."
+            if interval := self.raise_scheduler.intervals.get(category.id):
+                next_time = new_time + interval
+            else:
+                # интервал поднятия категории еще не известен - повторный запрос вернет точное время ожидания
+                self.account.raise_lots(category.id)
+        except FunPayAPI.exceptions.RaiseError as e:
+            if e.error_message is not None:
+                error_text = e.error_message
+            if e.wait_time is not None:
+                logger.warning(_("crd_raise_time_err", category.name, error_text, FPManager.time_to_str(e.wait_time)))
+                next_time = int(time.time()) + e.wait_time
+                if raised_time := self.raised_time.get(category.id):
+                    self.raise_scheduler.intervals[category.id] = next_time - raised_time
+            else:
+                logger.error(_("crd_raise_unexpected_err", category.name))
+                next_time = int(time.time()) + 10
+        except Exception as e:
+            t = 10
+            if isinstance(e, FunPayAPI.exceptions.RequestFailedError) and e.status_code in (503, 403, 429):
+                logger.warning(_("crd_raise_status_code_err", e.status_code, category.name))
+                t = 60
+            else:
+                logger.error(_("crd_raise_unexpected_err", category.name))
+            logger.debug("TRACEBACK", exc_info=True)
+            next_time = int(time.time()) + t
+        if next_time is None:
+            next_time = int(time.time()) + 10
+        logger.debug(f"Категория {category.name}: задержка поднятия {start_time - due_time:.2f} сек., "
+                     f"следующее поднятие через {FPManager.time_to_str(int(next_time - time.time()))}.")  # locale
+        self.raise_time[category.id] = next_time
+        self.raise_scheduler.schedule(category.id, next_time)
+        if raise_ok:
+            self.run_handlers(self.post_lots_raise_handlers, (self, category, error_text + time_delta))
 
     def get_order_from_object(self, obj: types.OrderShortcut | types.Message | types.ChatShortcut,
                               order_id: str | None = None) -> None | types.Order:
         if obj._order_attempt_error:
             return
-        if obj._order_attempt_made:
-            while obj._order is None and not obj._order_attempt_error:
-                time.sleep(0.1)
-            return obj._order
-        obj._order_attempt_made = True
         if type(obj) not in (types.Message, types.ChatShortcut, types.OrderShortcut):
             obj._order_attempt_error = True
             raise Exception("Неправильный тип объекта")
-        if not order_id:
-            if isinstance(obj, types.OrderShortcut):
-                order_id = obj.id
-                if order_id == "ADTEST":
-                    obj._order_attempt_error = True
-                    return
-            elif isinstance(obj, types.Message) or isinstance(obj, types.ChatShortcut):
-                order_id = fp_utils.RegularExpressions().ORDER_ID.findall(str(obj))
-                if not order_id:
-                    obj._order_attempt_error = True
-                    return
-                order_id = order_id[0][1:]
-        for i in range(2, -1, -1):
-            try:
-                obj._order = self.account.get_order(order_id)
-                logger.info(f"Получил информацию о заказе {obj._order}")  # locale
-                return obj._order
-            except:
-                logger.warning(f"Произошла ошибка при получении заказа #{order_id}. Осталось {i} попыток.")  # locale
-                logger.debug("TRACEBACK", exc_info=True)
-                time.sleep(1)
-        obj._order_attempt_error = True
+        if not obj._start_order_attempt():
+            return obj._order_future.result()
+        order = None
+        try:
+            if not order_id:
+                if isinstance(obj, types.OrderShortcut):
+                    order_id = obj.id
+                    if order_id == "ADTEST":
+                        return
+                elif isinstance(obj, types.Message) or isinstance(obj, types.ChatShortcut):
+                    order_id = fp_utils.RegularExpressions().ORDER_ID.findall(str(obj))
+                    if not order_id:
+                        return
+                    order_id = order_id[0][1:]
+            for i in range(2, -1, -1):
+                try:
+                    # заказ, предзагруженный Runner'ом, не запрашивается повторно
+                    order = self.account.get_order(order_id)
+                    logger.info(f"Получил информацию о заказе {order}")  # locale
+                    return order
+                except:
+                    logger.warning(f"Произошла ошибка при получении заказа #{order_id}. Осталось {i} попыток.")  # locale
+                    logger.debug("TRACEBACK", exc_info=True)
+                    time.sleep(1)
+        finally:
+            # ожидающие результата потоки не должны зависнуть, даже если получение прервано исключением
+            obj._finish_order_attempt(order)
 
     @staticmethod
     def split_text(text: str) -> list[str]:
@@ -504,8 +630,10 @@ class funpayautobot(object):
 
     def get_exchange_rate(self, base_currency: types.Currency, target_currency: types.Currency, min_interval: int = 60):
         """
-        Получает курс обмена между двумя указанными валютами.
-        Если с последней проверки прошло меньше `min_interval` секунд, используется сохранённое значение.
+        Получает курс обмена между двумя указанными валютами из снимка курсов (см. self.exchange_rates).
+        Если снимок старше `min_interval` секунд (но не чаще интервала обновления снимка), используется сохранённое
+        значение, а снимок обновляется в фоне.
+        Запрос к FunPay в текущем потоке выполняется, только если снимка ещё нет.
 
         :param base_currency: Исходная валюта, из которой производится обмен.
         :type base_currency: :obj:`types.Currency`
@@ -513,43 +641,14 @@ class funpayautobot(object):
         :param target_currency: Целевая валюта, в которую производится обмен.
         :type target_currency: :obj:`types.Currency`
 
-        :param min_interval: Минимальное время в секундах между проверками курса обмена.
+        :param min_interval: Максимальный возраст снимка курсов в секундах, после которого он обновляется в фоне.
         :type min_interval: :obj:`int`
 
         :return: Коэффициент обмена, где 1 единица `base_currency` = X единиц `target_currency`.
         :rtype: :obj:`float`
         """
         assert base_currency != types.Currency.UNKNOWN and target_currency != types.Currency.UNKNOWN
-        if base_currency == target_currency:
-            return 1
-        rate, t = self.__exchange_rates.get((base_currency, target_currency), (None, 0))
-        if t and time.time() < t + min_interval:
-            return rate
-        for i in range(2, -1, -1):
-            try:
-                exchange_rate1, currency1 = self.account.get_exchange_rate(base_currency)
-                self.__exchange_rates[(currency1, base_currency)] = (exchange_rate1, time.time())
-                self.__exchange_rates[(base_currency, currency1)] = (1 / exchange_rate1, time.time())
-
-                time.sleep(1)
-
-                exchange_rate2, currency2 = self.account.get_exchange_rate(target_currency)
-                self.__exchange_rates[(currency2, target_currency)] = (exchange_rate2, time.time())
-                self.__exchange_rates[(target_currency, currency2)] = (1 / exchange_rate2, time.time())
-
-                assert currency1 == currency2
-
-                result = exchange_rate2 / exchange_rate1
-                self.__exchange_rates[(base_currency, target_currency)] = (result, time.time())
-                self.__exchange_rates[(target_currency, base_currency)] = (1 / result, time.time())
-
-                return result
-            except:
-                logger.warning("Не удалось получить курс обмена. Осталось попыток: {i}")
-                logger.debug("TRACEBACK", exc_info=True)
-                time.sleep(1)
-
-        raise Exception("Не удалось получить курс обмена: превышено количество попыток.")
+        return self.exchange_rates.get(base_currency, target_currency, max(min_interval, self.exchange_rates.interval))
 
     def update_session(self, attempts: int = 3) -> bool:
         """
@@ -563,6 +662,7 @@ class funpayautobot(object):
             try:
                 self.account.get(update_phpsessid=True)
                 logger.info(_("crd_session_updated"))
+                self.save_session_snapshot()
                 return True
             except TimeoutError:
                 logger.warning(_("crd_session_timeout_err"))
@@ -579,13 +679,13 @@ class funpayautobot(object):
             logger.error(_("crd_session_no_more_attempts_err"))
             return False
 
-    # Бесконечные циклы
-    def process_events(self):
+    def get_events_handlers(self) -> dict[FunPayAPI.events.EventTypes, list[Callable]]:
         """
-        Запускает хэндлеры, привязанные к тому или иному событию.
+        Возвращает списки хэндлеров для каждого типа событий Runner'а.
+
+        :return: словарь {тип события: список хэндлеров}.
         """
-        instance_id = self.run_id
-        events_handlers = {
+        return {
             FunPayAPI.events.EventTypes.INITIAL_CHAT: self.init_message_handlers,
             FunPayAPI.events.EventTypes.CHATS_LIST_CHANGED: self.messages_list_changed_handlers,
             FunPayAPI.events.EventTypes.LAST_CHAT_MESSAGE_CHANGED: self.last_chat_message_changed_handlers,
@@ -597,10 +697,25 @@ class funpayautobot(object):
             FunPayAPI.events.EventTypes.ORDER_STATUS_CHANGED: self.order_status_changed_handlers,
         }
 
-        for event in self.runner.listen(requests_delay=int(self.MAIN_CFG["Other"]["requestsDelay"])):
+    # Бесконечные циклы
+    def process_events(self):
+        """
+        Запускает хэндлеры, привязанные к тому или иному событию.
+        """
+        instance_id = self.run_id
+        events_handlers = self.get_events_handlers()
+
+        if self.event_bus is None:
+            self.event_bus = EventBus(self, int(self.MAIN_CFG["Other"]["handlersConcurrency"]),
+                                      int(self.MAIN_CFG["Other"]["handlersTimeout"]))
+
+        for event in self.runner.listen(requests_delay=int(self.MAIN_CFG["Other"]["requestsDelay"]),
+                                        min_delay=int(self.MAIN_CFG["Other"]["requestsDelayMin"]),
+                                        max_delay=int(self.MAIN_CFG["Other"]["requestsDelayMax"]),
+                                        decay=float(self.MAIN_CFG["Other"]["requestsDelayDecay"])):
             if instance_id != self.run_id:
                 break
-            self.run_handlers(events_handlers[event.type], (self, event))
+            self.event_bus.publish(events_handlers[event.type], (self, event))
 
     def lots_raise_loop(self):
         """
@@ -620,7 +735,33 @@ class funpayautobot(object):
                 delay = next_time - int(time.time())
                 if delay <= 0:
                     continue
-                time.sleep(delay)
+                # просыпаемся не реже раза в минуту, чтобы новые категории поднимались без задержки
+                time.sleep(min(delay, 60))
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+
+    def get_request_metrics(self) -> dict:
+        """
+        Собирает снимок метрик запросов к FunPay: метрики эндпоинтов, ограничителя частоты запросов,
+        кэша ответов и пула прокси.
+
+        :return: снимок метрик.
+        """
+        return {"time": int(time.time()),
+                "summary": self.account.request_metrics.get_stats(),
+                "endpoints": self.account.request_metrics.to_dict(),
+                "rate_limiter": self.account.rate_limiter.get_stats(),
+                "response_cache": self.account.response_cache.get_stats(),
+                "proxy_pool": self.proxy_pool.get_stats() if self.proxy_pool else None}
+
+    def request_metrics_loop(self):
+        """
+        Запускает бесконечный цикл сохранения снимка метрик запросов в кэш (раз в минуту).
+        """
+        while True:
+            time.sleep(60)
+            try:
+                FPManager.cache_request_metrics(self.get_request_metrics())
             except:
                 logger.debug("TRACEBACK", exc_info=True)
 
@@ -674,8 +815,20 @@ class funpayautobot(object):
             Thread(target=self.telegram.run, daemon=True).start()
 
         self.__init_account()
-        self.runner = FunPayAPI.Runner(self.account, self.old_mode_enabled)
-        self.__update_profile()
+        if self.MAIN_CFG["Other"].getboolean("recordRunner"):
+            self.account.runner_recorder = RunnerRecorder(self.account,
+                                                          f"storage/cache/runner_{self.account.session_key}_"
+                                                          f"{int(time.time())}.jsonl.gz")
+        self.runner = FunPayAPI.Runner(self.account, self.old_mode_enabled,
+                                       chat_states_spill_path=f"storage/cache/chat_states_{self.account.session_key}")
+        if self.__snapshot_profile is not None:
+            # профиль из снимка используется сразу, актуальные данные загружаются в одном фоновом потоке
+            self.profile = self.curr_profile = self.tg_profile = self.__snapshot_profile
+            self.lots_ids = [i.id for i in self.profile.get_lots()]
+            self.__snapshot_profile = None
+            Thread(target=self.__refresh_session_snapshot, daemon=True).start()
+        elif self.__update_profile():
+            self.save_session_snapshot()
         self.run_handlers(self.post_init_handlers, (self,))
         return self
 
@@ -691,6 +844,8 @@ class funpayautobot(object):
 
         Thread(target=self.lots_raise_loop, daemon=True).start()
         Thread(target=self.update_session_loop, daemon=True).start()
+        Thread(target=self.exchange_rates.loop, daemon=True).start()
+        Thread(target=self.request_metrics_loop, daemon=True).start()
         self.process_events()
 
     def start(self):
@@ -864,11 +1019,17 @@ class funpayautobot(object):
         :param args: аргументы для хэндлеров.
         """
         for func in handlers_list:
+            start_time = time.time()
+            error = None
             try:
                 plugin_uuid = getattr(func, "plugin_uuid")
-                if plugin_uuid is None or (plugin_uuid in self.plugins and self.plugins[plugin_uuid].enabled):
-                    func(*args)
+                if plugin_uuid is not None and (plugin_uuid not in self.plugins or
+                                                not self.plugins[plugin_uuid].enabled):
+                    continue
+                self.handlers_stats.start(func)
+                func(*args)
             except Exception as ex:
+                error = ex
                 text = _("crd_handler_err")
                 try:
                     text += f" {ex.short_str()}"
@@ -876,7 +1037,49 @@ class funpayautobot(object):
                     pass
                 logger.error(text)
                 logger.debug("TRACEBACK", exc_info=True)
-                continue
+            self.handlers_stats.finish()
+            self.record_handler_stats(func, time.time() - start_time, error)
+
+    def record_handler_stats(self, func: Callable, duration: float, error: Exception | None = None) -> None:
+        """
+        Сохраняет статистику вызова хэндлера, предупреждает о медленных хэндлерах и (если включено)
+        отключает плагин, хэндлер которого 3 раза подряд превысил допустимое время выполнения.
+
+        :param func: хэндлер.
+        :param duration: время выполнения хэндлера (в секундах).
+        :param error: исключение, если хэндлер завершился с ошибкой.
+        """
+        budget = int(self.MAIN_CFG["Other"]["handlerTimeBudget"])
+        stats = self.handlers_stats.record(func, duration, error, budget)
+        if budget and duration > budget:
+            plugin_uuid = stats.plugin_uuid
+            plugin_name = self.plugins[plugin_uuid].name if plugin_uuid in self.plugins else "builtin"
+            logger.warning(_("crd_slow_handler", stats.name, plugin_name, round(duration, 2), budget))
+            if plugin_uuid in self.plugins and self.plugins[plugin_uuid].enabled and stats.slow_in_row >= 3 and \
+                    self.MAIN_CFG["Other"].getboolean("autoDisableSlowPlugins"):
+                self.toggle_plugin(plugin_uuid)
+                logger.warning(_("crd_slow_plugin_disabled", plugin_name))
+
+        if time.time() - self.__handlers_stats_dump_time > 60:
+            self.__handlers_stats_dump_time = time.time()
+            try:
+                FPManager.cache_handlers_stats(self.handlers_stats.to_dict())
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+
+    def check_hung_handlers(self) -> None:
+        """
+        Предупреждает о хэндлерах, которые все еще выполняются дольше допустимого времени
+        (о завершившихся хэндлерах предупреждает record_handler_stats).
+        """
+        budget = int(self.MAIN_CFG["Other"]["handlerTimeBudget"])
+        if not budget:
+            return
+        for func, duration in self.handlers_stats.get_hung(budget):
+            plugin_uuid = getattr(func, "plugin_uuid", None)
+            plugin_name = self.plugins[plugin_uuid].name if plugin_uuid in self.plugins else "builtin"
+            name = getattr(func, "__qualname__", None) or repr(func)
+            logger.warning(_("crd_hung_handler", name, plugin_name, int(duration), budget))
 
     def add_telegram_commands(self, uuid: str, commands: list[tuple[str, str, bool]]):
         """
@@ -694,7 +694,7 @@ def update_profile_lots(c: FPSupport, e: NewOrderEvent):
     for lot_id, lot in lots.items():
         c.profile.update_lot(lot)
 
-def update_lot_state(funpayautobot: FPSupport, lot: types.LotShortcut, task: int) -> bool:
+def update_lot_state(funpayautobot: FPSupport, lot: types.LotShortcut, task: int) -> bool | None:
     """
     Обновляет состояние лота
 
@@ -702,7 +702,8 @@ def update_lot_state(funpayautobot: FPSupport, lot: types.LotShortcut, task: int
     :param lot: объект лота.
     :param task: -1 - деактивировать лот. 1 - активировать лот.
 
-    :return: результат выполнения.
+    :return: True - состояние лота изменено, None - лот уже был в нужном состоянии, False - лот не изменен
+        (автовыдача FunPay / ошибка).
     """
     attempts = 3
     while attempts:
@@ -713,7 +714,7 @@ def update_lot_state(funpayautobot: FPSupport, lot: types.LotShortcut, task: int
                 return False
             elif task == (1 if lot_fields.active else -1):
                 #если лот и так в нужном состоянии
-                return True
+                return None
             elif task == 1:
                 lot_fields.active = True
                 funpayautobot.account.save_lot(lot_fields)
@@ -748,6 +749,7 @@ def update_lots_states(funpayautobot: FPSupport, event: NewOrderEvent):
 
     deactivated = []
     restored = []
+    tasks: dict[int, list[types.LotShortcut]] = {1: [], -1: []}
     for lot in funpayautobot.profile.get_sorted_lots(3)[SubCategoryTypes.COMMON].values():
         if not lot.description:
             continue
@@ -788,13 +790,31 @@ def update_lots_states(funpayautobot: FPSupport, event: NewOrderEvent):
                     current_task = -1
 
         if current_task:
-            result = update_lot_state(funpayautobot, lot, current_task)
+            tasks[current_task].append(lot)
+
+    for current_task, task_lots in tasks.items():
+        if not task_lots:
+            continue
+        results = funpayautobot.account.set_lots_active([i.id for i in task_lots], current_task == 1)
+        for lot in task_lots:
+            # None - лот уже был в нужном состоянии (не изменялся)
+            result = results.get(lot.id)
+            if isinstance(result, exceptions.LotParsingError):
+                logger.error(f"Произошла ошибка при изменении состояния лота $YELLOW{lot.description}$RESET:"  # locale
+                             "лот не найден.")
+                continue
+            elif isinstance(result, Exception):
+                # повторяем по одному лоту с несколькими попытками
+                logger.debug("TRACEBACK", exc_info=result)
+                result = update_lot_state(funpayautobot, lot, current_task)
+            elif result:
+                logger.info(f"{'Восстановил' if current_task == 1 else 'Деактивировал'} лот "  # locale
+                            f"$YELLOW{lot.id} - {lot.description}$RESET.")
             if result:
                 if current_task == -1:
                     deactivated.append(lot.description)
                 elif current_task == 1:
                     restored.append(lot.description)
-            time.sleep(0.5)
 
     if deactivated:
         lots = "\n".join(deactivated)  # locale
@@ -912,6 +932,13 @@ BIND_TO_NEW_ORDER = [log_new_order_handler, setup_event_attributes_handler,
 
 BIND_TO_ORDER_STATUS_CHANGED = [send_thank_u_message_handler, send_order_confirmed_notification_handler]
 
+# Уведомления в Telegram не влияют на остальные встроенные хэндлеры, поэтому шина событий выполняет их
+# в отдельной очереди, не задерживая ответы и автовыдачу (см. Utils.event_bus.EventBus).
+for _handler in (old_send_new_msg_notification_handler, send_new_msg_notification_handler,
+                 send_command_notification_handler, send_new_order_notification_handler,
+                 send_order_confirmed_notification_handler):
+    _handler.notification = True
+
 BIND_TO_POST_DELIVERY = [send_delivery_notification_handler]
 
 BIND_TO_POST_START = [send_bot_started_notification_handler]
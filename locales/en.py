@@ -266,6 +266,30 @@ sys_info = """<b><u>Data summary</u></b>
     Uptime:  <code>{}</code>
     Chat ID:  <code>{}</code>"""
 
+handlers_stats = "<b><u>Handlers statistics</u></b>"
+handlers_stats_item = """<b>{}</b>
+    Calls:  <code>{}</code>
+    Total:  <code>{} sec.</code>
+    p50 / p99:  <code>{} / {} ms</code>
+    Errors:  <code>{}</code>
+    Last error:  <code>{}</code>"""
+handlers_stats_builtin = "Built-in handlers"
+handlers_stats_empty = "No handlers have been called yet."
+
+request_metrics = """<b><u>FunPay requests</u></b>
+    Requests:  <code>{}</code> (errors: <code>{}</code>)
+    Sent / received:  <code>{} / {} KB</code>
+    Redirects / 429 / retries:  <code>{} / {} / {}</code>
+    Connection reuse:  <code>{}%</code>"""
+request_metrics_item = """<b>{}</b>
+    Requests:  <code>{}</code> (errors: <code>{}</code>)
+    Average / p99:  <code>{} / {} ms</code>
+    TTFB / connect / TLS:  <code>{} / {} / {} ms</code>
+    Redirects / 429 / retries:  <code>{} / {} / {}</code> (<code>{} s.</code>)
+    Connection reuse:  <code>{}%</code>
+    Sent / received:  <code>{} / {} KB</code>"""
+request_metrics_empty = "No requests have been sent to FunPay yet."
+
 act_blacklist = """Enter the username you want to add to the blacklist."""
 already_blacklisted = "❌ <code>{}</code> is already on the blacklist."
 user_blacklisted = "✅ <code>{}</code> is blacklisted."
@@ -497,6 +521,8 @@ cmd_about = "about current version"
 cmd_check_updates = "check for updates"
 cmd_update = "upgrade to the next version"
 cmd_sys = "system load information"
+cmd_handlers = "handlers execution statistics"
+cmd_requests = "FunPay requests metrics"
 cmd_create_backup = "create backup"
 cmd_get_backup = "get backup"
 cmd_upload_backup = "upload backup"
@@ -612,6 +638,9 @@ crd_proxy_detected = "Proxy detected."
 crd_checking_proxy = "Running proxy checks..."
 crd_proxy_err = "Failed to connect to the proxy. Make sure that the data is entered correctly."
 crd_proxy_success = "Proxy verified successfully! IP address: $YELLOW{}$RESET."
+crd_proxy_pool = "Proxy pool enabled: $YELLOW{}$RESET proxies, failover on connection errors."
+crd_session_snapshot_loaded = "Account data restored from the session snapshot ($YELLOW{}$RESET s. old), refreshing in the background..."
+crd_session_snapshot_err = "Failed to save the session snapshot."
 crd_acc_get_timeout_err = "Failed to load account data: Timeout exceeded."
 crd_acc_get_unexpected_err = "An unexpected error occurred while retrieving account information."
 crd_try_again_in_n_secs = "The next attempt is in {} seconds(-s)..."
@@ -644,6 +673,12 @@ crd_invalid_uuid = "Failed to load plugin {}: invalid UUID."
 crd_uuid_already_registered = "UUID {} ({}) is already registered."
 crd_handlers_registered = "The handlers from $YELLOW{}.py$RESET are registered."
 crd_handler_err = "An error occurred in the handler's execution."
+crd_slow_handler = "The handler $YELLOW{}$RESET ($YELLOW{}$RESET) took {} sec. (allowed: {} sec.)."
+crd_hung_handler = "The handler $YELLOW{}$RESET ($YELLOW{}$RESET) has been running for {} sec. and has not finished yet (allowed: {} sec.)."
+crd_slow_plugin_disabled = "The plugin $YELLOW{}$RESET has been disabled: its handlers take too long."
+crd_handlers_timeout = "The $YELLOW{}$RESET handlers have been running for {} sec. Starting an extra thread for their queue."
+crd_handlers_slow = "The $YELLOW{}$RESET handlers have been running for {} sec. The next events are waiting for them to finish."
+crd_handlers_queue_full = "The $YELLOW{}$RESET handlers queue is full ({} chains). Events dropped: {}."
 crd_tg_au_err = "Failed to update the message with user information: {}. I will try without a link."
 
 # Multi-accounts
@@ -267,6 +267,30 @@ sys_info = """<b><u>Сводка данных</u></b>
     Аптайм:  <code>{}</code>
     ID чата:  <code>{}</code>"""
 
+handlers_stats = "<b><u>Статистика хэндлеров</u></b>"
+handlers_stats_item = """<b>{}</b>
+    Вызовов:  <code>{}</code>
+    Всего:  <code>{} сек.</code>
+    p50 / p99:  <code>{} / {} мс</code>
+    Ошибок:  <code>{}</code>
+    Последняя ошибка:  <code>{}</code>"""
+handlers_stats_builtin = "Встроенные хэндлеры"
+handlers_stats_empty = "Хэндлеры еще не вызывались."
+
+request_metrics = """<b><u>Запросы к FunPay</u></b>
+    Запросов:  <code>{}</code> (ошибок: <code>{}</code>)
+    Отправлено / получено:  <code>{} / {} КБ</code>
+    Редиректов / 429 / повторов:  <code>{} / {} / {}</code>
+    Переиспользование соединений:  <code>{}%</code>"""
+request_metrics_item = """<b>{}</b>
+    Запросов:  <code>{}</code> (ошибок: <code>{}</code>)
+    Среднее / p99:  <code>{} / {} мс</code>
+    TTFB / соединение / TLS:  <code>{} / {} / {} мс</code>
+    Редиректов / 429 / повторов:  <code>{} / {} / {}</code> (<code>{} сек.</code>)
+    Переиспользование соединений:  <code>{}%</code>
+    Отправлено / получено:  <code>{} / {} КБ</code>"""
+request_metrics_empty = "Запросы к FunPay еще не отправлялись."
+
 act_blacklist = """Введи имя пользователя, которого хочешь добавить в ЧС."""
 already_blacklisted = "❌ <code>{}</code> уже находится в ЧС."
 user_blacklisted = "✅ <code>{}</code> добавлен в ЧС."
@@ -499,6 +523,8 @@ cmd_about = "об текущей версии"
 cmd_check_updates = "проверить на наличие обновлений"
 cmd_update = "обновиться до след. версии"
 cmd_sys = "информация о нагрузке на систему"
+cmd_handlers = "статистика выполнения хэндлеров"
+cmd_requests = "метрики запросов к FunPay"
 cmd_create_backup = "создать бэкап"
 cmd_get_backup = "получить бэкап"
 cmd_upload_backup = "выгрузить бэкап"
@@ -615,6 +641,9 @@ crd_proxy_detected = "Обнаружен прокси."
 crd_checking_proxy = "Выполняю проверку прокси..."
 crd_proxy_err = "Не удалось подключиться к прокси. Убедитесь, что данные введены верно."
 crd_proxy_success = "Прокси успешно проверен! IP-адрес: $YELLOW{}$RESET."
+crd_proxy_pool = "Включен пул прокси: $YELLOW{}$RESET шт., при ошибках соединения запросы повторяются через другой прокси."
+crd_session_snapshot_loaded = "Данные аккаунта восстановлены из снимка сессии (возраст $YELLOW{}$RESET сек.), обновляю в фоне..."
+crd_session_snapshot_err = "Не удалось сохранить снимок сессии."
 crd_acc_get_timeout_err = "Не удалось загрузить данные об аккаунте: превышен тайм-аут ожидания."
 crd_acc_get_unexpected_err = "Произошла непредвиденная ошибка при получении данных аккаунта."
 crd_try_again_in_n_secs = "Повторю попытку через {} секунд(-у/-ы)..."
@@ -647,6 +676,12 @@ crd_invalid_uuid = "Не удалось загрузить плагин {}: не
 crd_uuid_already_registered = "UUID {} ({}) уже зарегистрирован."
 crd_handlers_registered = "Хэндлеры из $YELLOW{}.py$RESET зарегистрированы."
 crd_handler_err = "Произошла ошибка при выполнении хэндлера."
+crd_slow_handler = "Хэндлер $YELLOW{}$RESET ($YELLOW{}$RESET) выполнялся {} сек. (допустимо: {} сек.)."
+crd_hung_handler = "Хэндлер $YELLOW{}$RESET ($YELLOW{}$RESET) выполняется уже {} сек. и еще не завершился (допустимо: {} сек.)."
+crd_slow_plugin_disabled = "Плагин $YELLOW{}$RESET отключен: его хэндлеры слишком долго выполняются."
+crd_handlers_timeout = "Хэндлеры $YELLOW{}$RESET выполняются уже {} сек. Запускаю дополнительный поток для их очереди."
+crd_handlers_slow = "Хэндлеры $YELLOW{}$RESET выполняются уже {} сек. Следующие события ждут их завершения."
+crd_handlers_queue_full = "Очередь хэндлеров $YELLOW{}$RESET заполнена ({} цепочек). Отброшено событий: {}."
 crd_tg_au_err = "Не удалось изменить сообщение с информацией о пользователе: {}. Попробую без ссылки."
 
 # Мультиаккаунты
@@ -85,6 +85,8 @@ class TGBot:
             "logs": "cmd_logs",
             "about": "cmd_about",
             "sys": "cmd_sys",
+            "handlers": "cmd_handlers",
+            "requests": "cmd_requests",
             "get_backup": "cmd_get_backup",
             "create_backup": "cmd_create_backup",
             "upload_backup": "cmd_upload_backup",
@@ -648,6 +650,58 @@ class TGBot:
                                            psutil.Process().memory_info().rss // 1048576,
                                            FPManager.time_to_str(uptime), m.chat.id))
 
+    def send_handlers_stats(self, m: Message):
+        """
+        Отправляет статистику выполнения хэндлеров (самые медленные плагины сверху).
+        """
+        stats = self.funpayautobot.handlers_stats.by_plugins()
+        if not stats:
+            self.bot.send_message(m.chat.id, _("handlers_stats_empty"))
+            return
+        try:
+            FPManager.cache_handlers_stats(self.funpayautobot.handlers_stats.to_dict())
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+
+        parts = [_("handlers_stats")]
+        for plugin_uuid, plugin_stats in list(stats.items())[:15]:
+            plugin = self.funpayautobot.plugins.get(plugin_uuid)
+            name = plugin.name if plugin else _("handlers_stats_builtin")
+            parts.append("\n\n" + _("handlers_stats_item", utils.escape(name), plugin_stats["calls"],
+                                        round(plugin_stats["total_time"], 2), round(plugin_stats["p50"] * 1000),
+                                        round(plugin_stats["p99"] * 1000), plugin_stats["errors"],
+                                        utils.escape(plugin_stats["last_error"] or "-")))
+        for text in utils.split_by_limit(parts):
+            self.bot.send_message(m.chat.id, text)
+            time.sleep(0.5)
+
+    def send_request_metrics(self, m: Message):
+        """
+        Отправляет метрики запросов к FunPay (эндпоинты с наибольшим суммарным временем сверху).
+        """
+        metrics = self.funpayautobot.get_request_metrics()
+        if not metrics["endpoints"]:
+            self.bot.send_message(m.chat.id, _("request_metrics_empty"))
+            return
+        try:
+            FPManager.cache_request_metrics(metrics)
+        except:
+            logger.debug("TRACEBACK", exc_info=True)
+
+        summary = metrics["summary"]
+        text = _("request_metrics", summary["requests"], summary["errors"], summary["bytes_out"] // 1024,
+                 summary["bytes_in"] // 1024, summary["redirects"], summary["throttled"], summary["retries"],
+                 round(summary["reuse_ratio"] * 100))
+        for endpoint, stats in list(metrics["endpoints"].items())[:10]:
+            avg = stats["avg"]
+            text += "\n\n" + _("request_metrics_item", utils.escape(endpoint), stats["requests"], stats["errors"],
+                                 round(avg["total"] * 1000), round(stats["p99"] * 1000), round(avg["ttfb"] * 1000),
+                                 round(avg["connect"] * 1000), round(avg["tls"] * 1000),
+                                 stats["redirects"], stats["throttled"], stats["retries"],
+                                 round(stats["retry_time"], 2), round(stats["reuse_ratio"] * 100),
+                                 stats["bytes_out"] // 1024, stats["bytes_in"] // 1024)
+        self.bot.send_message(m.chat.id, text)
+
     def restart_funpayautobot(self, m: Message):
         """
         Перезапускает кардинал.
@@ -1161,6 +1215,8 @@ class TGBot:
         self.msg_handler(self.get_backup, commands=["get_backup"])
         self.msg_handler(self.create_backup, commands=["create_backup"])
         self.msg_handler(self.send_system_info, commands=["sys"])
+        self.msg_handler(self.send_handlers_stats, commands=["handlers"])
+        self.msg_handler(self.send_request_metrics, commands=["requests"])
         self.msg_handler(self.restart_funpayautobot, commands=["restart"])
         self.msg_handler(self.ask_power_off, commands=["power_off"])
         self.msg_handler(self.send_announcements_kb, commands=["announcements"])